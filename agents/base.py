@@ -2,21 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Callable, Generic, Optional, TypeVar
+from typing import Any, Callable, Dict, Generic, Optional, Type, TypeVar
 
 from pydantic import BaseModel
 
+from context.cancellation import CancelToken
+from context.tracing import span
+from llm.telemetry import LLMCallStats
+
 InputModel = TypeVar("InputModel", bound=BaseModel)
 OutputModel = TypeVar("OutputModel", bound=BaseModel)
 StreamCallback = Callable[[str, str], None]
+FieldCallback = Callable[[str, str, Any], None]
+TelemetryCallback = Callable[[str, LLMCallStats], None]
 
 
 class Agent(ABC, Generic[InputModel, OutputModel]):
     name: str
     model_name: str
     llm_client: Optional[object]
+    async_llm_client: Optional[object]
     stream_callback: Optional[StreamCallback]
+    field_callback: Optional[FieldCallback]
+    telemetry_callback: Optional[TelemetryCallback]
+    cancel_token: Optional[CancelToken]
+    use_cache: bool
+    # Shape of the JSON answer: sent as structured-output schema, and its
+    # top-level fields are the only keys accepted while streaming.
+    output_model: Optional[Type[BaseModel]] = None
 
     def __init__(
         self,
@@ -28,11 +43,82 @@ class Agent(ABC, Generic[InputModel, OutputModel]):
         self.name = name
         self.model_name = model_name
         self.llm_client = llm_client
+        # awaitable ``generate_json`` used by ``run_async`` (e.g. AsyncOllamaClient)
+        self.async_llm_client: Optional[object] = None
         self.stream_callback = stream_callback
+        self.field_callback: Optional[FieldCallback] = None
+        self.telemetry_callback: Optional[TelemetryCallback] = None
+        # token of the current run; cancellation propagates as RunCancelled
+        self.cancel_token: Optional[CancelToken] = None
+        self.use_cache = True
 
-    @abstractmethod
     def run(self, data: InputModel) -> OutputModel:
         """Execute agent logic deterministically and return validated JSON."""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+        prompt = self._prompt(data) if self.llm_client else None
+        response = None
+        if prompt is not None:
+            try:
+                response = self._generate_json(prompt)
+            except Exception:
+                response = None
+        return self._respond(data, response)
+
+    async def run_async(self, data: InputModel) -> OutputModel:
+        """Awaitable ``run``; cancelling it cancels the LLM request."""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+        prompt = self._prompt(data) if self.llm_client or self.async_llm_client else None
+        response = None
+        if prompt is not None:
+            try:
+                response = await self._generate_json_async(prompt)
+            except Exception:
+                response = None
+        return self._respond(data, response)
+
+    def _prompt(self, data: InputModel) -> Optional[str]:
+        """Prompt for the model, or None when the agent needs no LLM call."""
+        return None
+
+    @abstractmethod
+    def _result(self, data: InputModel, response: Optional[Dict[str, Any]]) -> OutputModel:
+        """Build the output from the model's JSON answer, or the fallback if ``response`` is None."""
+
+    def _respond(self, data: InputModel, response: Optional[Dict[str, Any]]) -> OutputModel:
+        if response is not None:
+            try:
+                return self._result(data, response)
+            except Exception:
+                pass
+        return self._result(data, None)
+
+    def _generate_json(self, prompt: str) -> Dict[str, Any]:
+        """Call the LLM client with this agent's model, callbacks, cache flag and output schema."""
+        with span(f"llm {self.name}", "llm", model=self.model_name):
+            return self.llm_client.generate_json(self.model_name, prompt, **self._generate_options())
+
+    async def _generate_json_async(self, prompt: str) -> Dict[str, Any]:
+        if self.async_llm_client is None:
+            # synchronous client only: keep the event loop free
+            return await asyncio.to_thread(self._generate_json, prompt)
+        with span(f"llm {self.name}", "llm", model=self.model_name):
+            return await self.async_llm_client.generate_json(
+                self.model_name, prompt, **self._generate_options()
+            )
+
+    def _generate_options(self) -> Dict[str, Any]:
+        options = {
+            "chunk_callback": self._stream_chunk,
+            "use_cache": self.use_cache,
+            "schema": self.output_model,
+            "field_callback": self._stream_field,
+            "stats_callback": self._record_stats,
+        }
+        if self.cancel_token is not None:
+            options["cancel_token"] = self.cancel_token
+        return options
 
     def _stream_chunk(self, chunk: str) -> None:
         if self.stream_callback:
@@ -40,3 +126,17 @@ class Agent(ABC, Generic[InputModel, OutputModel]):
                 self.stream_callback(self.name, chunk)
             except Exception:
                 pass
+
+    def _stream_field(self, key: str, value: Any) -> None:
+        if self.field_callback:
+            try:
+                self.field_callback(self.name, key, value)
+            except Exception:
+                pass
+
+    def _record_stats(self, stats: LLMCallStats) -> None:
+        if self.telemetry_callback:
+            try:
+                self.telemetry_callback(self.name, stats)
+            except Exception:
+                pass
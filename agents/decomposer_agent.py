@@ -15,7 +15,7 @@ class DecomposerAgent(Agent[DecomposerInput, StepContext]):
     def __init__(self, model_name: str, llm_client=None, stream_callback=None) -> None:
         super().__init__("DecomposerAgent", model_name, llm_client=llm_client, stream_callback=stream_callback)
 
-    def run(self, data: DecomposerInput) -> StepContext:
+    def _result(self, data: DecomposerInput, response=None) -> StepContext:
         if data.step_index >= len(data.plan.steps):
             raise IndexError("Step index out of range.")
 
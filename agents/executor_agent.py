@@ -2,28 +2,106 @@ from __future__ import annotations
 
 from pathlib import Path
 import os
+from typing import Optional
 from pydantic import BaseModel
 
 from agents.base import Agent
-from context.models import ExecutionRequest, PromptContext, ResearchFinding, StepContext
+from context.models import (
+    ExecutionRequest,
+    FixInstruction,
+    PromptContext,
+    ResearchFinding,
+    StepContext,
+)
 from prompts import build_prompt
+from runner.static_gate import side_effects
 
 
 class ExecutorInput(BaseModel):
     step: StepContext
     prompt: PromptContext
     findings: list[ResearchFinding] = []
+    # fix round: the failed request, the fix to apply and the failing test output
+    previous: Optional[ExecutionRequest] = None
+    fix: Optional[FixInstruction] = None
+    failure: str = ""
+
+
+class ExecutorResponse(BaseModel):
+    code: str
+    tests: str
+    expected_output: str
 
 
 class ExecutorAgent(Agent[ExecutorInput, ExecutionRequest]):
+    output_model = ExecutorResponse
+
     def __init__(self, model_name: str, llm_client=None, stream_callback=None) -> None:
         super().__init__("ExecutorAgent", model_name, llm_client=llm_client, stream_callback=stream_callback)
 
-    def run(self, data: ExecutorInput) -> ExecutionRequest:
+    def _prompt(self, data: ExecutorInput) -> str:
+        if data.fix is not None and data.previous is not None:
+            return self._fix_prompt(data)
+        extra = [
+            ("Aktueller Planschritt", data.step.summary),
+            ("Prompt vom Prompter", data.prompt.prompt),
+            ("Funde Research", "; ".join(f.content for f in data.findings)),
+        ]
+        return build_prompt(
+            "executor",
+            (
+                "Erzeuge Python-Code und pytest-Tests als JSON für diesen Schritt.\n"
+                f"Aufgabe:\n{data.prompt.prompt}\n"
+                f"Funde: {[f.content for f in data.findings]}\n"
+                "Nur kompakten, deterministischen Code, keine Kommentare."
+            ),
+            language=data.prompt.language,
+            history=[
+                ("Planner", "siehe Plan oben"),
+                ("Decomposer", data.step.summary),
+                ("Research", "; ".join(f.content for f in data.findings)),
+                ("Prompter", data.prompt.prompt),
+            ],
+            infos=[f"{k}: {v}" for k, v in extra],
+        )
+
+    def _fix_prompt(self, data: ExecutorInput) -> str:
+        return build_prompt(
+            "executor",
+            (
+                "Korrigiere Python-Code und pytest-Tests gemäß den Fix-Schritten; gib beide vollständig als JSON zurück.\n"
+                f"Aufgabe:\n{data.prompt.prompt}\n"
+                f"Fix-Schritte: {data.fix.change_summary}\n"
+                f"Fehlgeschlagene Tests:\n{data.failure}\n"
+                f"Bisheriger Code:\n{data.previous.code}\n"
+                f"Bisherige Tests:\n{data.previous.tests}\n"
+                "Nur zielgerichtete Änderungen, keine Kommentare."
+            ),
+            language=data.prompt.language,
+        )
+
+    def _result(self, data: ExecutorInput, resp: Optional[dict]) -> ExecutionRequest:
         """
         Generate code/tests via LLM if available; fallback is deterministic placeholder.
         The code should address the prompt, e.g., writing files or running tasks.
+        In a fix round the fallback is the previous request, unchanged.
+        Code or tests with side effects (files, processes, network, clock) are
+        marked ``cacheable=False``: a cached result would skip the effect.
         """
+        if data.previous is not None:
+            previous = data.previous
+            if resp is None:
+                return previous.model_copy()
+            code = resp.get("code", previous.code)
+            tests = resp.get("tests", previous.tests)
+            return previous.model_copy(
+                update={
+                    "code": code,
+                    "tests": tests,
+                    "expected_output": resp.get("expected_output", previous.expected_output),
+                    "cacheable": not side_effects(code, tests),
+                }
+            )
         code = (
             "from pathlib import Path\n"
             "import os\n"
@@ -47,46 +125,14 @@ class ExecutorAgent(Agent[ExecutorInput, ExecutionRequest]):
         )
         expected_output = "output.txt"
 
-        if self.llm_client:
-            schema_hint = (
-                '{ "code": "python code", "tests": "pytest code", "expected_output": "string" }'
-            )
-            extra = [
-                ("Aktueller Planschritt", data.step.summary),
-                ("Prompt vom Prompter", data.prompt.prompt),
-                ("Funde Research", "; ".join(f.content for f in data.findings)),
-            ]
-            try:
-                resp = self.llm_client.generate_json(
-                    self.model_name,
-                    build_prompt(
-                        "executor",
-                        (
-                            "Erzeuge Python-Code und pytest-Tests als JSON für diesen Schritt.\n"
-                            f"Aufgabe:\n{data.prompt.prompt}\n"
-                            f"Funde: {[f.content for f in data.findings]}\n"
-                            f"Schema: {schema_hint}\n"
-                            "Nur kompakten, deterministischen Code, keine Kommentare."
-                        ),
-                        language=data.prompt.language,
-                        history=[
-                            ("Planner", "siehe Plan oben"),
-                            ("Decomposer", data.step.summary),
-                            ("Research", "; ".join(f.content for f in data.findings)),
-                            ("Prompter", data.prompt.prompt),
-                        ],
-                        infos=[f"{k}: {v}" for k, v in [("Schema", schema_hint)] + [(a, b) for a, b in extra]],
-                    ),
-                    chunk_callback=self._stream_chunk,
-                )
-                code = resp.get("code", code)
-                tests = resp.get("tests", tests)
-                expected_output = resp.get("expected_output", expected_output)
-            except Exception:
-                pass
+        if resp is not None:
+            code = resp.get("code", code)
+            tests = resp.get("tests", tests)
+            expected_output = resp.get("expected_output", expected_output)
         return ExecutionRequest(
             code=code,
             tests=tests,
             expected_output=expected_output,
             working_dir=Path.cwd(),
+            cacheable=not side_effects(code, tests),
         )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 from agents.base import Agent
@@ -11,42 +13,56 @@ class PlannerInput(BaseModel):
     task: TaskContext
 
 
+class PlannedStep(BaseModel):
+    title: str
+    summary: str
+    depends_on: list[int]
+
+
+class PlannerResponse(BaseModel):
+    version: str = "0.1.0"
+    steps: list[PlannedStep]
+
+
 class PlannerAgent(Agent[PlannerInput, PlanContext]):
+    output_model = PlannerResponse
+
     def __init__(self, model_name: str, llm_client=None, stream_callback=None) -> None:
         super().__init__("PlannerAgent", model_name, llm_client=llm_client, stream_callback=stream_callback)
 
-    def run(self, data: PlannerInput) -> PlanContext:
+    def _prompt(self, data: PlannerInput) -> str:
+        user_prompt = (
+            "Erstelle einen Plan als JSON für die Aufgabe:\n"
+            f"\"{data.task.description}\"\n"
+            "depends_on: Nummern (ab 1) der früheren Schritte, deren Ergebnis der Schritt braucht; "
+            "[] wenn unabhängig.\n"
+        )
+        return build_prompt("planner", user_prompt, language=data.task.language)
+
+    def _result(self, data: PlannerInput, resp: Optional[dict]) -> PlanContext:
         steps = [
             PlanStep(title="Analyse Aufgabe", summary="Verstehe Ziel und Randbedingungen."),
             PlanStep(title="Implementierung", summary="Erzeuge Code, Tools und Tests."),
             PlanStep(title="Validierung", summary="Führe pytest aus und verifiziere Ergebnisse."),
             PlanStep(title="Review & Abschluss", summary="Review, Fixes und Zusammenfassung."),
         ]
+        for previous, step in zip(steps, steps[1:]):
+            step.dependencies = [previous.step_id]
         version = "0.1.0"
-        if self.llm_client:
-            user_prompt = (
-                "Erstelle einen Plan als JSON für die Aufgabe:\n"
-                f"\"{data.task.description}\"\n"
-                "Antwortformat:\n"
-                '{ "version": "0.1.0", "steps": [ { "title": "", "summary": "" } ] }\n'
-            )
-            try:
-                resp = self.llm_client.generate_json(
-                    self.model_name,
-                    build_prompt(
-                        "planner",
-                        user_prompt,
-                        language=data.task.language,
-                    ),
-                    chunk_callback=self._stream_chunk,
+        if resp is not None:
+            raw_steps = resp.get("steps", [])
+            # only earlier steps can be referenced, so the plan is always a DAG
+            by_number: dict[int, PlanStep] = {}
+            for number, s in enumerate(raw_steps, start=1):
+                if not s.get("title"):
+                    continue
+                by_number[number] = PlanStep(
+                    title=s.get("title", ""),
+                    summary=s.get("summary", ""),
+                    dependencies=[
+                        by_number[n].step_id for n in s.get("depends_on", []) if n in by_number
+                    ],
                 )
-                raw_steps = resp.get("steps", [])
-                steps = [
-                    PlanStep(title=s.get("title", ""), summary=s.get("summary", ""))
-                    for s in raw_steps
-                    if s.get("title")
-                ] or steps
-                version = resp.get("version", version)
-            except Exception:
-                pass
+            steps = list(by_number.values()) or steps
+            version = resp.get("version", version)
         return PlanContext(task_id=data.task.task_id, steps=steps, version=version)
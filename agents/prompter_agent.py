@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 from agents.base import Agent
@@ -14,47 +16,48 @@ class PrompterInput(BaseModel):
     findings: list[ResearchFinding] = []
 
 
+class PrompterResponse(BaseModel):
+    prompt: str
+    tool_hints: list[str] = []
+
+
 class PrompterAgent(Agent[PrompterInput, PromptContext]):
+    output_model = PrompterResponse
+
     def __init__(self, model_name: str, llm_client=None, stream_callback=None) -> None:
         super().__init__("PrompterAgent", model_name, llm_client=llm_client, stream_callback=stream_callback)
 
-    def run(self, data: PrompterInput) -> PromptContext:
-        prompt = (
+    @staticmethod
+    def _default_prompt(data: PrompterInput) -> str:
+        return (
             f"Step: {data.step.summary}\n"
             f"Plan: {[s.title for s in data.plan.steps]}\n"
             "Generate deterministic code and pytest to fulfill this step."
         )
-        if self.llm_client:
-            schema_hint = (
-                '{ "prompt": "string", "tool_hints": ["python"] }\n'
+
+    def _prompt(self, data: PrompterInput) -> str:
+        return build_prompt(
+            "prompter",
+            (
+                f"Erzeuge JSON mit Prompt und optional tool_hints für diesen Schritt:\n{self._default_prompt(data)}\n"
+                f"Plan: {[s.title for s in data.plan.steps]}\n"
+                f"Funde: {[f.content for f in data.findings]}\n"
                 "Achte auf kurze, präzise Prompts."
-            )
-            try:
-                resp = self.llm_client.generate_json(
-                    self.model_name,
-                    build_prompt(
-                        "prompter",
-                        (
-                            f"Erzeuge JSON mit Prompt und optional tool_hints für diesen Schritt:\n{prompt}\n"
-                            f"Plan: {[s.title for s in data.plan.steps]}\n"
-                            f"Funde: {[f.content for f in data.findings]}\n"
-                            f"Schema: {schema_hint}"
-                        ),
-                        language=data.task.language,
-                        history=[
-                            ("Planner", ", ".join(s.title for s in data.plan.steps)),
-                            ("Decomposer", data.step.summary),
-                            ("Research", "; ".join(f.content for f in data.findings)),
-                        ],
-                    ),
-                    chunk_callback=self._stream_chunk,
-                )
-                prompt = resp.get("prompt", prompt)
-                tool_hints = resp.get("tool_hints", ["python"])
-            except Exception:
-                tool_hints = ["python"]
-        else:
-            tool_hints = ["python"]
+            ),
+            language=data.task.language,
+            history=[
+                ("Planner", ", ".join(s.title for s in data.plan.steps)),
+                ("Decomposer", data.step.summary),
+                ("Research", "; ".join(f.content for f in data.findings)),
+            ],
+        )
+
+    def _result(self, data: PrompterInput, resp: Optional[dict]) -> PromptContext:
+        prompt = self._default_prompt(data)
+        tool_hints = ["python"]
+        if resp is not None:
+            prompt = resp.get("prompt", prompt)
+            tool_hints = resp.get("tool_hints", tool_hints)
         return PromptContext(
             step_id=data.step.step_id,
             plan_id=data.step.plan_id,
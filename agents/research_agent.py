@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 from agents.base import Agent
@@ -20,32 +22,28 @@ class ResearchOutput(BaseModel):
 
 
 class ResearchAgent(Agent[ResearchInput, ResearchOutput]):
+    output_model = ResearchOutput
+
     def __init__(self, model_name: str, llm_client=None, stream_callback=None) -> None:
         super().__init__("ResearchAgent", model_name, llm_client=llm_client, stream_callback=stream_callback)
 
-    def run(self, data: ResearchInput) -> ResearchOutput:
-        findings: list[ResearchFinding] = list(data.prior_findings)
-        if self.llm_client:
-            user_prompt = (
-                "Sammle fehlende Informationen für den aktuellen Schritt.\n"
-                f"Aufgabe: {data.task_description}\n"
-                f"Aktueller Schritt: {data.step_summary}\n"
-                f"Plan-Titel: {data.plan_titles}\n"
-                "Gib JSON zurück im Schema: {\"findings\": [{\"source\": \"string\", \"content\": \"string\"}]}\n"
-                "Wenn keine neuen Infos: gib leere Liste."
-            )
-            try:
-                resp = self.llm_client.generate_json(
-                    self.model_name,
-                    build_prompt("research", user_prompt, language=data.language),
-                    chunk_callback=self._stream_chunk,
-                )
-                raw_findings = resp.get("findings", [])
-                findings = [
-                    ResearchFinding(source=f.get("source", "unknown"), content=f.get("content", ""))
-                    for f in raw_findings
-                    if f.get("content")
-                ]
-            except Exception:
-                pass
+    def _prompt(self, data: ResearchInput) -> str:
+        user_prompt = (
+            "Sammle fehlende Informationen für den aktuellen Schritt.\n"
+            f"Aufgabe: {data.task_description}\n"
+            f"Aktueller Schritt: {data.step_summary}\n"
+            f"Plan-Titel: {data.plan_titles}\n"
+            "Wenn keine neuen Infos: gib leere Liste."
+        )
+        return build_prompt("research", user_prompt, language=data.language)
+
+    def _result(self, data: ResearchInput, resp: Optional[dict]) -> ResearchOutput:
+        if resp is None:
+            return ResearchOutput(findings=list(data.prior_findings))
+        raw_findings = resp.get("findings", [])
+        findings = [
+            ResearchFinding(source=f.get("source", "unknown"), content=f.get("content", ""))
+            for f in raw_findings
+            if f.get("content")
+        ]
         return ResearchOutput(findings=findings)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 from agents.base import Agent
@@ -11,17 +13,40 @@ from context.models import (
     ReviewDecision,
 )
 from prompts import build_prompt
+from runner.report import compact_report
 
 
 class ReviewerInput(BaseModel):
     execution: ExecutionContext
 
 
+class ReviewerResponse(BaseModel):
+    recommendations: list[str]
+
+
 class ReviewerAgent(Agent[ReviewerInput, ReviewContext]):
+    output_model = ReviewerResponse
+
     def __init__(self, model_name: str, llm_client=None, stream_callback=None) -> None:
         super().__init__("ReviewerAgent", model_name, llm_client=llm_client, stream_callback=stream_callback)
 
-    def run(self, data: ReviewerInput) -> ReviewContext:
+    def _prompt(self, data: ReviewerInput) -> str:
+        execution = data.execution
+        report = compact_report(execution.result)
+        extra = [
+            ("Testergebnisse", report),
+        ]
+        return build_prompt(
+            "reviewer",
+            (
+                "Analysiere Testergebnisse und gib Empfehlungen als JSON.\n"
+                f"Testergebnisse:\n{report}"
+            ),
+            language=execution.prompt.language,
+            infos=[f"{a}: {b}" for a, b in extra],
+        )
+
+    def _result(self, data: ReviewerInput, resp: Optional[dict]) -> ReviewContext:
         execution = data.execution
         issues: list[Issue] = []
         decision = ReviewDecision.APPROVED
@@ -31,36 +56,12 @@ class ReviewerAgent(Agent[ReviewerInput, ReviewContext]):
             issues.append(
                 Issue(
                     title="Tests failed",
-                    detail=execution.result.stderr or execution.result.stdout,
+                    detail=compact_report(execution.result),
                     severity="critical",
                 )
             )
 
-        recommendations: list[str] = []
-        if self.llm_client:
-            extra = [
-                ("Testergebnisse stdout", execution.result.stdout),
-                ("Testergebnisse stderr", execution.result.stderr),
-            ]
-            try:
-                resp = self.llm_client.generate_json(
-                    self.model_name,
-                    build_prompt(
-                        "reviewer",
-                        (
-                            "Analysiere Testergebnisse und gib Empfehlungen als JSON.\n"
-                            f"stdout:\n{execution.result.stdout}\n"
-                            f"stderr:\n{execution.result.stderr}\n"
-                            'Schema: { "recommendations": ["string"] }'
-                        ),
-                        language=execution.prompt.language,
-                        infos=[f"{a}: {b}" for a, b in extra],
-                    ),
-                    chunk_callback=self._stream_chunk,
-                )
-                recommendations = resp.get("recommendations", [])
-            except Exception:
-                recommendations = []
+        recommendations: list[str] = resp.get("recommendations", []) if resp is not None else []
 
         return ReviewContext(
             step_id=execution.step_id,
@@ -69,5 +70,10 @@ class ReviewerAgent(Agent[ReviewerInput, ReviewContext]):
             decision=decision,
             issues=issues,
             recommendations=recommendations,
-            evidence={"stdout": execution.result.stdout, "stderr": execution.result.stderr},
+            evidence={
+                "report": compact_report(execution.result),
+                "durations": ", ".join(
+                    f"{node}={case.duration:.3f}s" for node, case in execution.result.test_report.items()
+                ),
+            },
         )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 from agents.base import Agent
@@ -19,39 +21,39 @@ class SummaryOutput(BaseModel):
     memory: ProjectMemory
 
 
+class SummarizerResponse(BaseModel):
+    summary: str
+
+
 class SummarizerAgent(Agent[SummarizerInput, SummaryOutput]):
+    output_model = SummarizerResponse
+
     def __init__(self, model_name: str, llm_client=None, stream_callback=None) -> None:
         super().__init__("SummarizerAgent", model_name, llm_client=llm_client, stream_callback=stream_callback)
 
-    def run(self, data: SummarizerInput) -> SummaryOutput:
+    def _prompt(self, data: SummarizerInput) -> str:
+        issues = [r.issues for r in data.reviews]
+        return build_prompt(
+            "summarizer",
+            (
+                "Fasse den Run als JSON zusammen.\n"
+                f"Task: {data.task.description}\n"
+                f"Plan: {[s.title for s in data.plan.steps]}\n"
+                f"Issues: {issues}\n"
+            ),
+            language=data.task.language,
+        )
+
+    def _result(self, data: SummarizerInput, resp: Optional[dict]) -> SummaryOutput:
         issues = [r.issues for r in data.reviews]
         summary_lines = [
             f"Task: {data.task.description}",
             f"Plan steps: {[s.title for s in data.plan.steps]}",
             f"Issues: {issues}",
         ]
-        if self.llm_client:
-            try:
-                resp = self.llm_client.generate_json(
-                    self.model_name,
-                    build_prompt(
-                        "summarizer",
-                        (
-                            "Fasse den Run als JSON zusammen. Schema: "
-                            '{ "summary": "string" }.\n'
-                            f"Task: {data.task.description}\n"
-                            f"Plan: {[s.title for s in data.plan.steps]}\n"
-                            f"Issues: {issues}\n"
-                        ),
-                        language=data.task.language,
-                    ),
-                    chunk_callback=self._stream_chunk,
-                )
-                summary_text = resp.get("summary", "; ".join(summary_lines))
-            except Exception:
-                summary_text = "; ".join(summary_lines)
-        else:
-            summary_text = "; ".join(summary_lines)
+        summary_text = "; ".join(summary_lines)
+        if resp is not None:
+            summary_text = resp.get("summary", summary_text)
 
         memory = ProjectMemory(
             task_summaries=data.memory.task_summaries
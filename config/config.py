@@ -9,7 +9,7 @@ passed to agents without leaking secrets. Environment variables live in a
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -54,11 +54,62 @@ class AppConfig(BaseSettings):
     user_files_dir: Path = Field(default=Path("User") / "dateien")
     ollama_host: str = Field(default="http://localhost:11434")
     ollama_timeout: int = Field(default=60)
+    # Several hosts: requests are balanced across them instead of ollama_host.
+    ollama_hosts: List[str] = Field(default_factory=list)
+    ollama_eject_seconds: float = Field(default=30.0)
+    ollama_hedge_percentile: Optional[float] = Field(default=None)
+    llm_cache_enabled: bool = Field(default=False)
+    llm_cache_max_bytes: int = Field(default=256 * 1024 * 1024)
+    llm_cache_max_age_seconds: int = Field(default=7 * 24 * 3600)
+    llm_cache_bypass: List[str] = Field(default_factory=list)
+    # "inline": whole prompt as user text; "system": stable prefix sent as system prompt
+    prompt_layout: Literal["inline", "system"] = Field(default="inline")
+    llm_reuse_context: bool = Field(default=False)
+    # reused KV contexts: longer ones start over, at most this many chains are kept
+    llm_max_context_tokens: int = Field(default=8192)
+    llm_max_contexts: int = Field(default=32)
+    preload_models: bool = Field(default=False)
+    # Only one model fits into memory: preload the first one, warm the others on demand.
+    single_model_memory: bool = Field(default=False)
+    model_keep_alive: Dict[str, str] = Field(default_factory=dict)
+    default_keep_alive: Optional[str] = Field(default=None)
     allowed_tool_permissions: List[str] = Field(
         default_factory=lambda: ["python", "shell"]
     )
     project_name: str = Field(default="Local Multi-Agent Orchestrator")
     pytest_timeout_seconds: int = Field(default=120)
+    # warm pre-forked pytest workers (POSIX); 0 starts a fresh pytest subprocess per run
+    pytest_workers: int = Field(default=0)
+    # compile/AST-check code and tests in-process before pytest starts
+    static_gate_enabled: bool = Field(default=True)
+    # dotted names of calls the gate rejects (None: runner.static_gate.DEFAULT_FORBIDDEN)
+    static_gate_forbidden_calls: Optional[List[str]] = Field(default=None)
+    # new run_<id> directories go here instead of tool_dir, e.g. a tmpfs like /dev/shm/local_ai_runs
+    run_staging_dir: Optional[Path] = Field(default=None)
+    # retention of run directories: the newest N always, older failing ones while under the size cap
+    run_keep_last: int = Field(default=20)
+    run_keep_failing: bool = Field(default=True)
+    run_max_bytes: Optional[int] = Field(default=256 * 1024 * 1024)
+    # seconds between collector passes; 0 disables pruning
+    run_gc_interval_seconds: float = Field(default=300.0)
+    # reuse results of identical pytest runs (code, tests, node ids, interpreter, USER_DATA_DIR)
+    execution_cache_enabled: bool = Field(default=False)
+    execution_cache_max_bytes: int = Field(default=64 * 1024 * 1024)
+    execution_cache_max_age_seconds: int = Field(default=7 * 24 * 3600)
+    # also key on the files in USER_DATA_DIR (path, size, mtime); for tests reading user files
+    execution_cache_fingerprint_data_dir: bool = Field(default=False)
+    # wall-clock budget per run; the run is cancelled when it runs out (None: unlimited)
+    run_timeout_seconds: Optional[float] = Field(default=None)
+    # write the run's stage/LLM/IO spans as Chrome trace JSON (trace.json in the context-log run dir)
+    trace_runs: bool = Field(default=True)
+    # >1 runs independent plan steps (PlanStep.dependencies) concurrently
+    max_parallel_steps: int = Field(default=1)
+    # sequential mode: prepare step N+1 while step N runs pytest and review
+    pipeline_steps: bool = Field(default=False)
+    # TaskScheduler: worker count and global caps shared by all workers
+    scheduler_workers: int = Field(default=2)
+    llm_calls_per_model: int = Field(default=2)
+    max_pytest_processes: int = Field(default=4)
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -109,4 +160,12 @@ def resolve_paths(cfg: AppConfig) -> AppConfig:
     cfg.user_infos_dir = user_infos
     cfg.user_files_dir = user_files
     cfg.tool_dir = tool_dir
+    if cfg.run_staging_dir is not None:
+        try:
+            staging = cfg.run_staging_dir.resolve()
+            staging.mkdir(parents=True, exist_ok=True)
+            cfg.run_staging_dir = staging
+        except OSError:
+            # no such RAM disk here: runs stay under tool_dir
+            cfg.run_staging_dir = None
     return cfg
@@ -0,0 +1,88 @@
+"""
+Cooperative cancellation of a run.
+
+One ``CancelToken`` is shared by everything working for a run: the orchestrator
+checks it between stages, LLM clients close their HTTP stream when it fires and
+the pytest runner kills its process group. A deadline fires the token on its own.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+class RunCancelled(BaseException):
+    """
+    Raised when a run is cancelled or its deadline has passed. Derives from
+    ``BaseException`` (like ``asyncio.CancelledError``) so the agents' fallback
+    ``except Exception`` handlers do not swallow it.
+    """
+
+
+class CancelToken:
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        """``timeout`` seconds from now the token cancels itself ("deadline exceeded")."""
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        if timeout is not None:
+            self._timer = threading.Timer(max(0.0, timeout), self.cancel, args=("deadline exceeded",))
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise RunCancelled(self.reason)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Call ``callback`` once the token fires (right away if it already has);
+        return a function that unregisters it.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+    def close(self) -> None:
+        """Stop the deadline timer once the run is over."""
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-from __future__ import annotations
-
+import logging
+import queue
+import threading
+from contextvars import copy_context
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
+
+from context.tracing import span
+from llm.interceptors import LLMExchange, LLMInterceptor
+
+_write_lock = threading.Lock()
+logger = logging.getLogger(__name__)
 
 
 def _next_run_dir(base_dir: Path) -> Path:
     base_dir.mkdir(parents=True, exist_ok=True)
     existing = sorted([p for p in base_dir.glob("run_*") if p.is_dir()])
     next_idx = len(existing) + 1
-    run_dir = base_dir / f"run_{next_idx:03d}"
-    run_dir.mkdir(parents=True, exist_ok=True)
-    return run_dir
+    while True:
+        run_dir = base_dir / f"run_{next_idx:03d}"
+        try:
+            # concurrent runs must not share a directory
+            run_dir.mkdir(parents=True)
+            return run_dir
+        except FileExistsError:
+            next_idx += 1
 
 
 def _next_context_index(run_dir: Path) -> int:
@@ -28,7 +41,75 @@ def write_raw_context(run_dir: Path, stage: str, raw: str) -> Path:
     """
     Write raw context exactly as passed to the model, preceded by a single header line.
     """
-    idx = _next_context_index(run_dir)
-    path = run_dir / f"context_{idx:03d}.txt"
-    path.write_text(f"{stage}\n{raw}", encoding="utf-8")
+    with span("context_log", "io", stage=stage), _write_lock:
+        idx = _next_context_index(run_dir)
+        path = run_dir / f"context_{idx:03d}.txt"
+        path.write_text(f"{stage}\n{raw}", encoding="utf-8")
     return path
+
+
+def write_exchange(run_dir: Path, exchange: LLMExchange) -> None:
+    """
+    Log one LLM call: prompt and raw output as context files, and the whole
+    exchange (options, result, stats, timings) as a line of ``exchanges.jsonl``.
+    """
+    write_raw_context(run_dir, stage=f"prompt für Modell {exchange.caller}:", raw=exchange.prompt)
+    if exchange.error and not exchange.response_text:
+        write_raw_context(run_dir, stage=f"fehler von Modell {exchange.caller}:", raw=exchange.error)
+    else:
+        write_raw_context(run_dir, stage=f"output von Modell {exchange.caller}:", raw=exchange.response_text)
+    with _write_lock, (run_dir / "exchanges.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write(exchange.model_dump_json(exclude={"labels"}) + "\n")
+
+
+class ContextLogSink:
+    """
+    Writes exchanges on a background thread, in the order they were submitted.
+    Each write runs in a copy of the submitter's context, so its spans land in
+    the submitting run's trace. Exchanges that cannot be written are logged and
+    dropped.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, run_dir: Path, exchange: LLMExchange) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain, name="context-log", daemon=True)
+                self._thread.start()
+        self._queue.put((copy_context(), run_dir, exchange))
+
+    def flush(self) -> None:
+        """Block until everything submitted so far is written."""
+        self._queue.join()
+
+    def _drain(self) -> None:
+        while True:
+            context, run_dir, exchange = self._queue.get()
+            try:
+                context.run(write_exchange, run_dir, exchange)
+            except Exception:
+                # one unwritable exchange (disk error, unencodable text) must not
+                # end the thread: ``flush`` would then wait forever
+                logger.warning("context log: exchange of %s not written", exchange.caller, exc_info=True)
+            finally:
+                self._queue.task_done()
+
+
+class ContextLogInterceptor(LLMInterceptor):
+    """Sends every completed exchange to ``sink`` for the run directory current at request time."""
+
+    def __init__(self, sink: ContextLogSink, run_dir: Callable[[], Optional[Path]]) -> None:
+        self.sink = sink
+        self.run_dir = run_dir
+
+    def on_request(self, exchange: LLMExchange) -> None:
+        exchange.labels["run_dir"] = self.run_dir()
+
+    def on_response(self, exchange: LLMExchange) -> None:
+        run_dir = exchange.labels.get("run_dir")
+        if run_dir is not None:
+            self.sink.submit(run_dir, exchange)
@@ -92,6 +92,18 @@ class ExecutionRequest(BaseModel):
     tests: str
     expected_output: Optional[str] = None
     working_dir: Path = Field(default_factory=Path.cwd)
+    # False for tests with side effects (files, network, time): never served from the execution cache
+    cacheable: bool = Field(default=True)
+
+    model_config = {"extra": "forbid"}
+
+
+class CaseReport(BaseModel):
+    # PASSED/FAILED/ERROR/SKIPPED/XFAIL/XPASS
+    outcome: str
+    duration: float = Field(default=0.0)  # seconds, setup and teardown included
+    # truncated failure/error/skip message
+    message: Optional[str] = None
 
     model_config = {"extra": "forbid"}
 
@@ -102,7 +114,9 @@ class ExecutionResult(BaseModel):
     stderr: str = Field(default="")
     traceback: Optional[str] = None
     exit_code: Optional[int] = None
-    test_report: Dict[str, str] = Field(default_factory=dict)
+    # pytest node id -> outcome, duration and failure message
+    test_report: Dict[str, CaseReport] = Field(default_factory=dict)
+    run_dir: Optional[Path] = None
 
     model_config = {"extra": "forbid"}
 
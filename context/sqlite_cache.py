@@ -0,0 +1,133 @@
+"""
+SQLite-backed, content-addressed key/value store shared by the caches.
+
+Values are text, keyed by a hash of whatever determines them. Entries are
+evicted by age and by total size (least recently used first); hits and misses
+are counted per instance. Subclasses name their table and value column and may
+store extra text columns with every entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def hash_key(parts: Dict[str, Any]) -> str:
+    """Stable SHA-256 of JSON-encodable key parts (other values via ``str``)."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    table = "entries"
+    value_column = "value"
+    # additional NOT NULL text columns, filled by ``_put`` keyword arguments
+    extra_columns: Tuple[str, ...] = ()
+
+    def __init__(self, db_path: Path, max_bytes: int, max_age_seconds: int) -> None:
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        extra = "".join(f"{column} TEXT NOT NULL,\n" for column in self.extra_columns)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    {extra}{self.value_column} TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                """
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_last_access ON {self.table} (last_access);"
+            )
+            conn.commit()
+
+    def _fetch(self, key: str) -> Optional[str]:
+        """The stored value (expired entries are deleted), without counting a hit or miss."""
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                f"SELECT {self.value_column}, created_at FROM {self.table} WHERE key = ?;", (key,)
+            ).fetchone()
+            if row and now - row[1] > self.max_age_seconds:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?;", (key,))
+                row = None
+            elif row:
+                conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?;", (now, key))
+            conn.commit()
+        return row[0] if row else None
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _get(self, key: str) -> Optional[str]:
+        value = self._fetch(key)
+        self._count(value is not None)
+        return value
+
+    def _put(self, key: str, value: str, **extra: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        columns = ["key", *self.extra_columns, self.value_column, "size", "created_at", "last_access"]
+        values = [key, *(extra[column] for column in self.extra_columns), value, size, now, now]
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)});",
+                values,
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?;", (now - self.max_age_seconds,))
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table};").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(f"SELECT key, size FROM {self.table} ORDER BY last_access ASC;").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany(f"DELETE FROM {self.table} WHERE key = ?;", stale)
+
+    def invalidate(self, key: str) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?;", (key,))
+            conn.commit()
+
+    def clear(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(f"DELETE FROM {self.table};")
+            conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with sqlite3.connect(self.db_path) as conn:
+            entries, total = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table};"
+            ).fetchone()
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total}
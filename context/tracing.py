@@ -0,0 +1,157 @@
+"""
+Per-run tracing spans, exportable as Chrome trace-event JSON.
+
+A ``Tracer`` is activated for the duration of a run (``tracing``); ``span``
+then records a timed, nested span wherever it is called: orchestrator stages,
+LLM calls, snapshot and context-log writes, pytest subprocesses. Without an
+active tracer ``span`` does nothing. Spans nest through a context variable, so
+asyncio tasks and threads started with a copied context keep their parent.
+The export loads in ``chrome://tracing`` or Perfetto as a flame-graph timeline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span(BaseModel):
+    span_id: int
+    parent_id: Optional[int] = None
+    name: str
+    category: str
+    # microseconds since the tracer was created
+    start_us: float
+    duration_us: float = Field(default=0.0)
+    thread_id: int
+    thread_name: str
+    args: Dict[str, Any] = Field(default_factory=dict)
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def start(self, name: str, category: str, parent: Optional[Span], args: Dict[str, Any]) -> Span:
+        thread = threading.current_thread()
+        return Span(
+            span_id=next(self._ids),
+            parent_id=parent.span_id if parent is not None else None,
+            name=name,
+            category=category,
+            start_us=self._now_us(),
+            thread_id=thread.ident or 0,
+            thread_name=thread.name,
+            args=args,
+        )
+
+    def finish(self, span: Span) -> None:
+        span.duration_us = self._now_us() - span.start_us
+        with self._lock:
+            self.spans.append(span)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Complete ("X") events plus thread names, in Chrome trace-event format."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_us)
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        threads: Dict[int, str] = {}
+        for s in spans:
+            threads.setdefault(s.thread_id, s.thread_name)
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": s.category,
+                    "ph": "X",
+                    "ts": round(s.start_us, 1),
+                    "dur": round(s.duration_us, 1),
+                    "pid": pid,
+                    "tid": s.thread_id,
+                    "args": {**s.args, "span_id": s.span_id, "parent_id": s.parent_id},
+                }
+            )
+        for tid, name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> Path:
+        path.write_text(json.dumps(self.chrome_trace(), ensure_ascii=False, default=str), encoding="utf-8")
+        return path
+
+
+_TRACER: ContextVar[Optional[Tracer]] = ContextVar("run_tracer", default=None)
+_SPAN: ContextVar[Optional[Span]] = ContextVar("run_span", default=None)
+
+
+@contextmanager
+def tracing(tracer: Tracer) -> Iterator[Tracer]:
+    """Record spans into ``tracer`` within this block (and contexts copied from it)."""
+    tracer_token = _TRACER.set(tracer)
+    span_token = _SPAN.set(None)
+    try:
+        yield tracer
+    finally:
+        _SPAN.reset(span_token)
+        _TRACER.reset(tracer_token)
+
+
+@contextmanager
+def span(name: str, category: str = "stage", **args: Any) -> Iterator[Optional[Span]]:
+    """Time the block as a child of the current span; yields None when not tracing."""
+    tracer = _TRACER.get()
+    if tracer is None:
+        yield None
+        return
+    current = tracer.start(name, category, _SPAN.get(), args)
+    token = _SPAN.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.args["error"] = type(exc).__name__
+        raise
+    finally:
+        _SPAN.reset(token)
+        tracer.finish(current)
+
+
+def traced(name: str, category: str = "stage") -> Callable[[F], F]:
+    """Decorator form of ``span`` for plain and ``async`` functions."""
+
+    def decorate(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name, category):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, category):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
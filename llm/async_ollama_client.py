@@ -0,0 +1,137 @@
+"""
+Asyncio variant of ``OllamaClient`` for issuing independent generations concurrently.
+
+One instance holds one pooled HTTP connection set and a semaphore sized to the
+server's ``OLLAMA_NUM_PARALLEL``, so callers can fire requests freely without
+queueing more work on the server than it will run in parallel.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Dict, Iterable, Literal, Optional
+
+from context.cancellation import CancelToken
+from llm.cache import ResponseCache
+from llm.json_stream import FieldCallback, StreamValidationError
+from llm.ollama_client import OllamaClientBase
+from llm.schemas import SchemaLike
+from llm.telemetry import StatsCallback
+
+try:
+    import httpx
+    import ollama
+except ImportError as exc:  # pragma: no cover - optional dependency
+    raise RuntimeError("ollama package is required for LLM integration.") from exc
+
+
+def default_parallelism() -> int:
+    try:
+        return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", "4")))
+    except ValueError:
+        return 4
+
+
+class AsyncOllamaClient(OllamaClientBase):
+    def __init__(
+        self,
+        host: str = "http://localhost:11434",
+        timeout: int = 60,
+        max_parallel: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+        prompt_layout: Literal["inline", "system"] = "inline",
+        reuse_context: bool = False,
+        keep_alive: Optional[Dict[str, str]] = None,
+        default_keep_alive: Optional[str] = None,
+        max_context_tokens: int = 8192,
+        max_contexts: int = 32,
+    ) -> None:
+        super().__init__(
+            cache=cache,
+            prompt_layout=prompt_layout,
+            reuse_context=reuse_context,
+            keep_alive=keep_alive,
+            default_keep_alive=default_keep_alive,
+            max_context_tokens=max_context_tokens,
+            max_contexts=max_contexts,
+        )
+        self.host = host
+        self.max_parallel = max_parallel or default_parallelism()
+        self.client = ollama.AsyncClient(
+            host=host,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_parallel,
+                max_keepalive_connections=self.max_parallel,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_parallel)
+
+    async def preload(self, model: str) -> None:
+        """Load the model into memory without generating (empty prompt)."""
+        async with self._semaphore:
+            await self.client.generate(**self._preload_request(model))
+
+    async def _model_digest(self, model: str) -> str:
+        if model not in self._digests:
+            try:
+                self._digests[model] = self._digest_from_listing(await self.client.list(), model)
+            except Exception:
+                self._digests[model] = model
+        return self._digests[model]
+
+    async def generate_json(
+        self,
+        model: str,
+        prompt: str,
+        chunk_callback: Optional[callable] = None,
+        use_cache: bool = True,
+        expected_keys: Optional[Iterable[str]] = None,
+        field_callback: Optional[FieldCallback] = None,
+        schema: Optional[SchemaLike] = None,
+        stats_callback: Optional[StatsCallback] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Dict[str, Any]:
+        """
+        Same contract as ``OllamaClient.generate_json``, bounded by ``max_parallel``.
+        Cancelling the awaiting task closes the stream just like ``cancel_token``.
+        """
+        call = self._begin(
+            model, prompt, chunk_callback, expected_keys, field_callback, schema, stats_callback
+        )
+        if self.cache is not None and use_cache:
+            cached = self._lookup(call, await self._model_digest(model))
+            if cached is not None:
+                return cached
+
+        async with self._semaphore:
+            self._prepare_send(call)
+            try:
+                if call.streaming:
+                    stream = await self.client.generate(**call.request, stream=True)
+                    try:
+                        async for part in stream:
+                            if cancel_token is not None and cancel_token.cancelled:
+                                call.stats.aborted = True
+                                cancel_token.raise_if_cancelled()
+                            if call.feed(part):
+                                break
+                    finally:
+                        aclose = getattr(stream, "aclose", None)
+                        if aclose:
+                            await aclose()
+                else:
+                    call.feed(await self.client.generate(**call.request))
+            except StreamValidationError:
+                call.stats.aborted = True
+                raise
+            finally:
+                call.report()
+        return self._complete(call)
+
+    async def list_models(self) -> Dict[str, Any]:
+        return await self.client.list()
+
+    async def aclose(self) -> None:
+        await self.client.close()
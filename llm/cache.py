@@ -0,0 +1,39 @@
+"""
+Cache for LLM responses.
+
+Generation runs with ``temperature: 0``, so a request is fully determined by
+the model digest, the prompt and the options; the response is stored under a
+hash of those parts (see ``SQLiteCache`` for storage and eviction).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Optional
+
+from context.sqlite_cache import SQLiteCache, hash_key
+
+
+class ResponseCache(SQLiteCache):
+    table = "responses"
+    value_column = "response"
+    extra_columns = ("model",)
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age_seconds: int = 7 * 24 * 3600,
+    ) -> None:
+        super().__init__(db_path, max_bytes=max_bytes, max_age_seconds=max_age_seconds)
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Hash the request parts (digest, prompt, options, ...) into a stable key."""
+        return hash_key(parts)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._get(key)
+
+    def put(self, key: str, model: str, response: str) -> None:
+        self._put(key, response, model=model)
@@ -0,0 +1,277 @@
+"""
+Routing of Ollama requests across several hosts.
+
+Each request goes to the healthy host with the fewest in-flight requests,
+preferring hosts that already have the model loaded. Hosts failing with a
+transport error (timeout, refused connection) are ejected for a while and the
+request fails over to the next host. Optionally a request whose first response
+has not arrived after the observed latency percentile is hedged to a second
+host; the first host to answer wins and the other request is closed. A
+cancelled ``CancelToken`` stops waiting for the first response; the request is
+closed as soon as it answers. With a single host and no token to watch, the
+request runs directly on the calling thread. Which models each host has loaded
+is refreshed in the background (``start_refresh``).
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
+
+from context.cancellation import CancelToken, RunCancelled
+
+try:
+    import httpx
+    import ollama
+except ImportError as exc:  # pragma: no cover - optional dependency
+    raise RuntimeError("ollama package is required for LLM integration.") from exc
+
+
+def is_host_failure(exc: BaseException) -> bool:
+    return isinstance(exc, (httpx.TransportError, ConnectionError))
+
+
+class PooledHost:
+    def __init__(self, url: str, timeout: int) -> None:
+        self.url = url
+        self.client = ollama.Client(host=url, timeout=timeout)
+        self.in_flight = 0
+        self.loaded: set[str] = set()
+        self.ejected_until = 0.0
+
+
+class HostPool:
+    def __init__(
+        self,
+        hosts: Sequence[str],
+        timeout: int = 60,
+        eject_seconds: float = 30.0,
+        hedge_percentile: Optional[float] = None,
+        min_samples: int = 20,
+        refresh_seconds: float = 60.0,
+    ) -> None:
+        if not hosts:
+            raise ValueError("HostPool needs at least one host.")
+        self.hosts = [PooledHost(url, timeout) for url in hosts]
+        self.eject_seconds = eject_seconds
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.refresh_seconds = refresh_seconds
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    def refresh_loaded(self) -> None:
+        """Ask every host which models are currently in memory (best effort)."""
+        for host in self.hosts:
+            try:
+                running = host.client.ps().get("models", [])
+            except Exception:
+                continue
+            with self._lock:
+                host.loaded = {m.get("model") or m.get("name") for m in running}
+
+    def start_refresh(self) -> None:
+        """Refresh the loaded models now and every ``refresh_seconds`` on a daemon thread."""
+        if self._refresher is not None or self.refresh_seconds <= 0:
+            return
+        self._refresher = threading.Thread(target=self._refresh_loop, name="host-pool-refresh", daemon=True)
+        self._refresher.start()
+
+    def stop_refresh(self) -> None:
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            self.refresh_loaded()
+            self._stop.wait(self.refresh_seconds)
+
+    def acquire(self, model: str, exclude: Sequence[PooledHost] = ()) -> Optional[PooledHost]:
+        with self._lock:
+            now = time.monotonic()
+            candidates = [h for h in self.hosts if h not in exclude]
+            healthy = [h for h in candidates if h.ejected_until <= now]
+            # all ejected: still try the remaining ones instead of failing outright
+            candidates = healthy or candidates
+            if not candidates:
+                return None
+            host = min(candidates, key=lambda h: (model not in h.loaded, h.in_flight))
+            host.in_flight += 1
+            return host
+
+    def release(self, host: PooledHost, model: str, error: Optional[BaseException] = None) -> None:
+        """
+        End a request on ``host``. Only a response marks the model as loaded there;
+        a transport error ejects the host, any other error (e.g. model not found)
+        just shows the host is reachable.
+        """
+        with self._lock:
+            host.in_flight -= 1
+            if error is None:
+                host.loaded.add(model)
+                host.ejected_until = 0.0
+            elif is_host_failure(error):
+                host.loaded.discard(model)
+                host.ejected_until = time.monotonic() + self.eject_seconds
+            else:
+                host.ejected_until = 0.0
+
+    def record_latency(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(model, deque(maxlen=200)).append(seconds)
+
+    def hedge_after(self, model: str) -> Optional[float]:
+        """Seconds after which a request is hedged, or None when hedging is off."""
+        if self.hedge_percentile is None or len(self.hosts) < 2:
+            return None
+        with self._lock:
+            samples = sorted(self._latencies.get(model, ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100))
+        return samples[index]
+
+    def generate(
+        self,
+        request: Dict[str, Any],
+        stream: bool = False,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Any:
+        """
+        Run ``client.generate`` on the best host. With ``stream=True`` an iterator
+        of parts is returned; the host stays in flight until it is exhausted or closed.
+        Raises ``RunCancelled`` when ``cancel_token`` fires before the first response.
+        """
+        model = request["model"]
+        if len(self.hosts) == 1 and cancel_token is None:
+            # nothing to fail over, hedge or watch: no thread needed
+            return self._call(self.acquire(model), request, stream)
+        threshold = self.hedge_after(model)
+        results: queue.Queue = queue.Queue()
+        tried: List[PooledHost] = []
+        pending = 0
+        hedged = False
+        error: Optional[BaseException] = None
+
+        def launch() -> bool:
+            host = self.acquire(model, exclude=tried)
+            if host is None:
+                return False
+            tried.append(host)
+            threading.Thread(
+                target=self._attempt, args=(host, request, stream, results), daemon=True
+            ).start()
+            return True
+
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        if not launch():
+            raise RuntimeError("No Ollama host available.")
+        pending = 1
+        # None in the queue wakes the wait below when the token fires
+        unregister = cancel_token.on_cancel(lambda: results.put(None)) if cancel_token else None
+        try:
+            while pending:
+                wait = threshold if threshold is not None and not hedged else None
+                try:
+                    item = results.get(timeout=wait)
+                except queue.Empty:
+                    hedged = True
+                    if launch():
+                        pending += 1
+                    continue
+                if item is None:
+                    self._discard_later(results, pending, model, stream)
+                    raise RunCancelled(cancel_token.reason)
+                host, payload, exc = item
+                pending -= 1
+                if exc is None:
+                    if pending:
+                        self._discard_later(results, pending, model, stream)
+                    if not stream:
+                        return payload
+                    return self._parts(host, model, *payload)
+                error = exc
+                if is_host_failure(exc) and not pending and launch():
+                    pending = 1
+            raise error
+        finally:
+            if unregister is not None:
+                unregister()
+
+    def _first_response(self, host: PooledHost, request: Dict[str, Any], stream: bool) -> Any:
+        """
+        The response, or ``(parts, first part)`` when streaming (the host then stays
+        in flight). Failures release the host and are raised.
+        """
+        model = request["model"]
+        started = time.monotonic()
+        try:
+            if stream:
+                parts = host.client.generate(**request, stream=True)
+                payload: Any = (parts, next(parts, None))
+            else:
+                payload = host.client.generate(**request)
+        except Exception as exc:
+            self.release(host, model, exc)
+            raise
+        self.record_latency(model, time.monotonic() - started)
+        if not stream:
+            self.release(host, model)
+        return payload
+
+    def _call(self, host: PooledHost, request: Dict[str, Any], stream: bool) -> Any:
+        payload = self._first_response(host, request, stream)
+        return self._parts(host, request["model"], *payload) if stream else payload
+
+    def _attempt(
+        self, host: PooledHost, request: Dict[str, Any], stream: bool, results: queue.Queue
+    ) -> None:
+        try:
+            payload = self._first_response(host, request, stream)
+        except Exception as exc:
+            results.put((host, None, exc))
+            return
+        results.put((host, payload, None))
+
+    def _discard_later(self, results: queue.Queue, pending: int, model: str, stream: bool) -> None:
+        threading.Thread(
+            target=self._discard, args=(results, pending, model, stream), daemon=True
+        ).start()
+
+    def _discard(self, results: queue.Queue, pending: int, model: str, stream: bool) -> None:
+        """Close the requests that lost a hedge race (or were cancelled) once they answer."""
+        while pending:
+            item = results.get()
+            if item is None:
+                continue
+            pending -= 1
+            host, payload, exc = item
+            if exc is None and stream:
+                parts, _first = payload
+                close = getattr(parts, "close", None)
+                if close:
+                    close()
+                self.release(host, model)
+
+    def _parts(self, host: PooledHost, model: str, parts: Iterator[Any], first: Any) -> Iterator[Any]:
+        error: Optional[BaseException] = None
+        try:
+            if first is not None:
+                yield first
+            yield from parts
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            close = getattr(parts, "close", None)
+            if close:
+                close()
+            self.release(host, model, error)
@@ -0,0 +1,147 @@
+"""
+Interceptor chain around ``generate_json``.
+
+``InterceptedLLMClient`` (and its async twin) wraps an LLM client for one
+caller (agent). Every call becomes an ``LLMExchange``: the exact prompt and
+options as passed to the client, the raw streamed response, the parsed result
+or error, call stats and wall time. Interceptors see the exchange before the
+call and once it is complete, e.g. to hand it to a logging sink.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from llm.telemetry import LLMCallStats
+
+
+class LLMExchange(BaseModel):
+    caller: str
+    model: str
+    prompt: str
+    # keyword options of the call; callbacks and objects are reduced to names
+    options: Dict[str, Any] = Field(default_factory=dict)
+    # everything streamed to the chunk callback, thinking included (else the result as JSON)
+    response_text: str = Field(default="")
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    stats: Optional[LLMCallStats] = None
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    started: float = Field(default_factory=time.perf_counter, exclude=True)
+    wall_ms: float = Field(default=0.0)
+    # interceptor-specific data, e.g. the context-log directory of the run
+    labels: Dict[str, Any] = Field(default_factory=dict)
+
+
+class LLMInterceptor:
+    """Hooks of the chain; both default to no-ops."""
+
+    def on_request(self, exchange: LLMExchange) -> None:
+        pass
+
+    def on_response(self, exchange: LLMExchange) -> None:
+        pass
+
+
+def _option_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_option_value(v) for v in value]
+    return getattr(value, "__name__", type(value).__name__)
+
+
+class InterceptedLLMClient:
+    def __init__(self, client: Any, interceptors: Sequence[LLMInterceptor], caller: str) -> None:
+        self.client = client
+        self.interceptors: List[LLMInterceptor] = list(interceptors)
+        self.caller = caller
+
+    def generate_json(self, model: str, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        exchange, chunks, kwargs = self._begin(model, prompt, kwargs)
+        try:
+            result = self.client.generate_json(model, prompt, **kwargs)
+        except BaseException as exc:
+            self._end(exchange, chunks, error=exc)
+            raise
+        self._end(exchange, chunks, result=result)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        # preload, reset_contexts, ... are not intercepted
+        return getattr(self.client, name)
+
+    def _begin(
+        self, model: str, prompt: str, kwargs: Dict[str, Any]
+    ) -> Tuple[LLMExchange, Optional[List[str]], Dict[str, Any]]:
+        """Create the exchange and wrap the callbacks that fill it in."""
+        exchange = LLMExchange(
+            caller=self.caller,
+            model=model,
+            prompt=str(prompt),
+            options={
+                key: _option_value(value)
+                for key, value in kwargs.items()
+                if not key.endswith("_callback") and key != "cancel_token"
+            },
+        )
+        stats_callback = kwargs.get("stats_callback")
+
+        def capture_stats(stats: LLMCallStats) -> None:
+            exchange.stats = stats
+            if stats_callback:
+                stats_callback(stats)
+
+        kwargs = {**kwargs, "stats_callback": capture_stats}
+        # without a chunk callback the call does not stream; don't make it
+        chunks: Optional[List[str]] = None
+        chunk_callback = kwargs.get("chunk_callback")
+        if chunk_callback is not None:
+            chunks = []
+
+            def capture_chunk(chunk: str) -> None:
+                chunks.append(chunk)
+                chunk_callback(chunk)
+
+            kwargs["chunk_callback"] = capture_chunk
+        for interceptor in self.interceptors:
+            interceptor.on_request(exchange)
+        return exchange, chunks, kwargs
+
+    def _end(
+        self,
+        exchange: LLMExchange,
+        chunks: Optional[List[str]],
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        exchange.wall_ms = (time.perf_counter() - exchange.started) * 1000
+        exchange.result = result
+        if chunks:
+            exchange.response_text = "".join(chunks)
+        elif result is not None:
+            exchange.response_text = json.dumps(result, ensure_ascii=False)
+        if error is not None:
+            exchange.error = f"{type(error).__name__}: {error}"
+        for interceptor in self.interceptors:
+            try:
+                interceptor.on_response(exchange)
+            except Exception:
+                pass
+
+
+class AsyncInterceptedLLMClient(InterceptedLLMClient):
+    async def generate_json(self, model: str, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        exchange, chunks, kwargs = self._begin(model, prompt, kwargs)
+        try:
+            result = await self.client.generate_json(model, prompt, **kwargs)
+        except BaseException as exc:
+            self._end(exchange, chunks, error=exc)
+            raise
+        self._end(exchange, chunks, result=result)
+        return result
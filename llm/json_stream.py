@@ -0,0 +1,148 @@
+"""
+Incremental JSON validation for streamed LLM answers.
+
+The validator tracks just enough lexical state (nesting depth, strings,
+top-level keys) to reject an answer as soon as it can no longer become the
+expected JSON object, so the request can be aborted instead of paying for the
+rest of the generation.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+FieldCallback = Callable[[str, Any], None]
+
+_STRING_STOP = re.compile(r'["\\]')
+
+
+class StreamValidationError(ValueError):
+    """Raised while streaming once the answer is provably not the expected JSON object."""
+
+
+class StreamingJSONValidator:
+    """
+    Validate a JSON object chunk by chunk.
+
+    * the first non-whitespace character must be ``{``
+    * with ``expected_keys`` set, every top-level key must be one of them
+    * every completed top-level value must be valid JSON; it is stored in
+      ``fields`` and passed to ``field_callback``
+
+    ``complete`` turns true when the top-level object is closed; ``text`` then
+    holds the object without any trailing output.
+    """
+
+    def __init__(
+        self,
+        expected_keys: Optional[Iterable[str]] = None,
+        field_callback: Optional[FieldCallback] = None,
+    ) -> None:
+        self.expected_keys = set(expected_keys) if expected_keys else None
+        self.field_callback = field_callback
+        self.fields: Dict[str, Any] = {}
+        self.started = False
+        self.complete = False
+        self._chunks: List[str] = []
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._value_start = 0
+        self._end = 0
+
+    @property
+    def text(self) -> str:
+        return self._slice(0, self._end)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk of answer text; return True once the object is complete."""
+        if self.complete or not chunk:
+            return self.complete
+        base = self._offset
+        self._chunks.append(chunk)
+        self._offset += len(chunk)
+        i = 0
+        size = len(chunk)
+        while i < size:
+            if self._in_string:
+                i = self._scan_string(chunk, i, base)
+                continue
+            char = chunk[i]
+            pos = base + i
+            i += 1
+            if char in " \t\r\n":
+                continue
+            if not self.started:
+                if char != "{":
+                    raise StreamValidationError(
+                        f"Expected JSON object, answer starts with {chunk[i - 1:i + 20]!r}"
+                    )
+                self.started = True
+                self._depth = 1
+                self._expect_key = True
+            elif char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_value(pos)
+                    self._end = pos + 1
+                    self.complete = True
+                    return True
+            elif self._depth == 1 and char == ":":
+                self._value_start = pos + 1
+            elif self._depth == 1 and char == ",":
+                self._finish_value(pos)
+                self._expect_key = True
+        return False
+
+    def _scan_string(self, chunk: str, i: int, base: int) -> int:
+        if self._escape:
+            self._escape = False
+            return i + 1
+        match = _STRING_STOP.search(chunk, i)
+        if not match:
+            return len(chunk)
+        if match.group() == "\\":
+            self._escape = True
+            return match.end()
+        self._in_string = False
+        if self._depth == 1 and self._expect_key:
+            self._accept_key(self._slice(self._string_start, base + match.end()))
+        return match.end()
+
+    def _accept_key(self, raw: str) -> None:
+        key = json.loads(raw)
+        if self.expected_keys is not None and key not in self.expected_keys:
+            raise StreamValidationError(
+                f"Unexpected top-level key {key!r}, expected one of {sorted(self.expected_keys)}"
+            )
+        self._key = key
+        self._expect_key = False
+
+    def _finish_value(self, end: int) -> None:
+        if self._key is None:
+            return
+        raw = self._slice(self._value_start, end).strip()
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise StreamValidationError(f"Invalid value for {self._key!r}: {exc}") from exc
+        self.fields[self._key] = value
+        if self.field_callback:
+            self.field_callback(self._key, value)
+        self._key = None
+
+    def _slice(self, start: int, end: int) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0][start:end] if self._chunks else ""
@@ -5,8 +5,21 @@ Lightweight Ollama client wrapper to enforce JSON responses.
 """
 
 import json
-import re
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union
+
+from context.cancellation import CancelToken
+from llm.cache import ResponseCache
+from llm.host_pool import HostPool
+from llm.json_stream import FieldCallback, StreamingJSONValidator, StreamValidationError
+from llm.schemas import SchemaLike, resolve_schema, top_level_keys
+from llm.streaming import ThinkTagSplitter
+from llm.telemetry import LLMCallStats, StatsCallback
+from prompts import LayeredPrompt
 
 try:
     import ollama
@@ -14,79 +27,339 @@ except ImportError as exc:  # pragma: no cover - optional dependency
     raise RuntimeError("ollama package is required for LLM integration.") from exc
 
 
-class OllamaClient:
-    def __init__(self, host: str = "http://localhost:11434", timeout: int = 60) -> None:
-        self.client = ollama.Client(host=host, timeout=timeout)
+# chain of reused KV contexts a call belongs to (e.g. a plan step); default: the thread
+_CONTEXT_SCOPE: ContextVar[Optional[str]] = ContextVar("llm_context_scope", default=None)
+
+
+@contextmanager
+def context_scope(scope: str) -> Iterator[None]:
+    """Calls in this block continue only each other's context (``reuse_context``)."""
+    token = _CONTEXT_SCOPE.set(scope)
+    try:
+        yield
+    finally:
+        _CONTEXT_SCOPE.reset(token)
+
+
+def _context_key(model: str) -> Tuple[str, str]:
+    scope = _CONTEXT_SCOPE.get()
+    return model, scope if scope is not None else f"thread-{threading.get_ident()}"
+
 
-    def _emit_chunks(self, text: str, chunk_callback: Optional[callable]) -> str:
+class JSONCall:
+    """
+    State of a single ``generate_json`` call: the Ollama request, the think-tag
+    splitter, the incremental JSON validator and the call stats. Transport-free,
+    so the sync and async clients share it.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        request: Dict[str, Any],
+        chunk_callback: Optional[callable],
+        expected_keys: Optional[Iterable[str]],
+        field_callback: Optional[FieldCallback],
+        stats_callback: Optional[StatsCallback],
+    ) -> None:
+        self.model = model
+        self.request = request
+        self.chunk_callback = chunk_callback
+        self.stats_callback = stats_callback
+        self.streaming = bool(chunk_callback) or expected_keys is not None
+        self.stats = LLMCallStats(model=model)
+        self.validator = StreamingJSONValidator(expected_keys, field_callback=field_callback)
+        self.splitter = ThinkTagSplitter(chunk_callback, answer_callback=self.validator.feed)
+        self.cache_key: Optional[str] = None
+        self.final: Optional[Any] = None
+        self.started = time.perf_counter()
+
+    def feed(self, part: Any) -> bool:
         """
-        Split thinking blocks (<think>...</think>) from normal text and emit via callback.
-        Returns the cleaned text (without thinking tags).
+        Consume one response part; return True when the stream should be closed.
+        Once the JSON object is complete only the final (done) part is awaited for
+        its counters; further output stops the stream.
         """
-        if not chunk_callback or not text:
-            return text
-
-        cleaned_parts = []
-        pattern = re.compile(r"<think>(.*?)</think>", re.DOTALL)
-        last_end = 0
-        for match in pattern.finditer(text):
-            # preceding normal text
-            if match.start() > last_end:
-                normal = text[last_end:match.start()]
-                if normal.strip():
-                    chunk_callback(normal)
-                    cleaned_parts.append(normal)
-            thinking = match.group(1)
-            if thinking.strip():
-                chunk_callback(f"[thinking] {thinking}")
-            last_end = match.end()
-        # tail
-        if last_end < len(text):
-            tail = text[last_end:]
-            if tail.strip():
-                chunk_callback(tail)
-                cleaned_parts.append(tail)
-        return "".join(cleaned_parts)
+        if part.get("done"):
+            self.final = part
+            self.stats.absorb(part)
+        thinking = part.get("thinking", "") or ""
+        chunk = part.get("response", "") or ""
+        if self.stats.time_to_first_token_ms is None and (thinking or chunk):
+            self.stats.time_to_first_token_ms = (time.perf_counter() - self.started) * 1000
+        if self.validator.complete:
+            return bool(chunk.strip())
+        self.splitter.feed_thinking(thinking)
+        self.splitter.feed(chunk)
+        return False
 
-    def generate_json(
-        self, model: str, prompt: str, chunk_callback: Optional[callable] = None
-    ) -> Dict[str, Any]:
+    def report(self) -> None:
+        self.stats.wall_ms = (time.perf_counter() - self.started) * 1000
+        if self.stats_callback:
+            self.stats_callback(self.stats)
+
+    @property
+    def text(self) -> str:
+        return self.validator.text if self.validator.complete else self.splitter.finish()
+
+
+class OllamaClientBase:
+    """Request building, caching and result handling shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        prompt_layout: Literal["inline", "system"] = "inline",
+        reuse_context: bool = False,
+        keep_alive: Optional[Dict[str, str]] = None,
+        default_keep_alive: Optional[str] = None,
+        max_context_tokens: int = 8192,
+        max_contexts: int = 32,
+    ) -> None:
         """
-        Request a JSON response. If parsing fails, raise a ValueError so callers can fallback.
+        ``prompt_layout="system"`` sends the stable prefix of a ``LayeredPrompt`` as
+        Ollama ``system`` and only the variable suffix as ``prompt``. With
+        ``reuse_context`` the ``context`` returned by the previous call to the same
+        model in the same ``context_scope`` (else thread) is passed on, until
+        ``reset_contexts`` is called (e.g. per run). A context longer than
+        ``max_context_tokens`` is dropped and the chain starts over; at most
+        ``max_contexts`` chains are kept (least recently used go first).
+        ``keep_alive`` maps model names to Ollama keep-alive durations (e.g. "30m");
+        other models use ``default_keep_alive`` or the server default.
         """
-        text = ""
+        self.cache = cache
+        self.prompt_layout = prompt_layout
+        self.reuse_context = reuse_context
+        self.keep_alive = dict(keep_alive or {})
+        self.default_keep_alive = default_keep_alive
+        self.max_context_tokens = max_context_tokens
+        self.max_contexts = max_contexts
+        self._digests: Dict[str, str] = {}
+        self._contexts: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+        self._contexts_lock = threading.Lock()
+
+    def reset_contexts(self) -> None:
+        with self._contexts_lock:
+            self._contexts.clear()
+
+    def _reused_context(self, model: str) -> Optional[list]:
+        key = _context_key(model)
+        with self._contexts_lock:
+            context = self._contexts.get(key)
+            if context is not None:
+                self._contexts.move_to_end(key)
+            return context
+
+    def _store_context(self, model: str, context: list) -> None:
+        key = _context_key(model)
+        with self._contexts_lock:
+            if len(context) > self.max_context_tokens:
+                self._contexts.pop(key, None)
+                return
+            self._contexts[key] = list(context)
+            self._contexts.move_to_end(key)
+            while len(self._contexts) > self.max_contexts:
+                self._contexts.popitem(last=False)
+
+    def _keep_alive_for(self, model: str) -> Optional[str]:
+        return self.keep_alive.get(model, self.default_keep_alive)
+
+    def _preload_request(self, model: str) -> Dict[str, Any]:
+        request: Dict[str, Any] = {"model": model, "prompt": ""}
+        keep_alive = self._keep_alive_for(model)
+        if keep_alive is not None:
+            request["keep_alive"] = keep_alive
+        return request
+
+    @staticmethod
+    def _digest_from_listing(listing: Any, model: str) -> str:
+        for entry in listing.get("models", []):
+            name = entry.get("model") or entry.get("name")
+            if name in (model, f"{model}:latest"):
+                return entry.get("digest") or model
+        return model
+
+    def _begin(
+        self,
+        model: str,
+        prompt: str,
+        chunk_callback: Optional[callable],
+        expected_keys: Optional[Iterable[str]],
+        field_callback: Optional[FieldCallback],
+        schema: Optional[SchemaLike],
+        stats_callback: Optional[StatsCallback],
+    ) -> JSONCall:
         options = {"temperature": 0}
         if "think" in model.lower():
             options["thinking"] = True
+        request: Dict[str, Any] = {"model": model, "prompt": str(prompt), "options": options}
+        if self.prompt_layout == "system" and isinstance(prompt, LayeredPrompt):
+            request["system"] = prompt.prefix
+            request["prompt"] = prompt.suffix
+        if self.reuse_context:
+            context = self._reused_context(model)
+            if context is not None:
+                request["context"] = context
+        fmt = resolve_schema(schema)
+        if fmt is not None:
+            request["format"] = fmt
+            if expected_keys is None:
+                expected_keys = top_level_keys(fmt)
+        return JSONCall(model, request, chunk_callback, expected_keys, field_callback, stats_callback)
+
+    def _lookup(self, call: JSONCall, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for the call, or None and remember the cache key."""
+        # a reused KV context is part of the request: the same prompt after another
+        # history may be answered differently
+        call.cache_key = ResponseCache.make_key(
+            digest=digest, **{key: value for key, value in call.request.items() if key != "model"}
+        )
+        cached = self.cache.get(call.cache_key)
+        if cached is None:
+            return None
+        if call.chunk_callback and cached:
+            call.chunk_callback(cached)
+        if call.stats_callback:
+            call.stats_callback(LLMCallStats(model=call.model, cached=True))
+        return self._parse_json(cached)
+
+    def _prepare_send(self, call: JSONCall) -> None:
+        keep_alive = self._keep_alive_for(call.model)
+        if keep_alive is not None:
+            call.request["keep_alive"] = keep_alive
+        call.started = time.perf_counter()
 
-        if chunk_callback:
-            stream = self.client.generate(
-                model=model,
-                prompt=prompt,
-                options=options,
-                stream=True,
-            )
-            for part in stream:
-                chunk = part.get("response", "") or ""
-                cleaned = self._emit_chunks(chunk, chunk_callback) if chunk else ""
-                text += cleaned
-                if chunk_callback and chunk and cleaned == chunk:
-                    # no think tags; emit raw chunk
-                    chunk_callback(chunk)
-        else:
-            response = self.client.generate(
-                model=model,
-                prompt=prompt,
-                options=options,
-            )
-            raw = response.get("response", "") or ""
-            text = self._emit_chunks(raw, chunk_callback) if chunk_callback else raw
-            if chunk_callback and text == raw and raw:
-                chunk_callback(raw)
+    def _complete(self, call: JSONCall) -> Dict[str, Any]:
+        if self.reuse_context and call.final is not None and call.final.get("context"):
+            self._store_context(call.model, call.final["context"])
+        text = call.text
+        result = self._parse_json(text)
+        if call.cache_key is not None:
+            self.cache.put(call.cache_key, call.model, text)
+        return result
+
+    @staticmethod
+    def _parse_json(text: str) -> Dict[str, Any]:
         try:
             return json.loads(text)
         except json.JSONDecodeError as exc:
             raise ValueError(f"Ollama response is not valid JSON: {exc}") from exc
 
+
+class OllamaClient(OllamaClientBase):
+    def __init__(
+        self,
+        host: Union[str, List[str]] = "http://localhost:11434",
+        timeout: int = 60,
+        cache: Optional[ResponseCache] = None,
+        prompt_layout: Literal["inline", "system"] = "inline",
+        reuse_context: bool = False,
+        keep_alive: Optional[Dict[str, str]] = None,
+        default_keep_alive: Optional[str] = None,
+        max_context_tokens: int = 8192,
+        max_contexts: int = 32,
+        eject_seconds: float = 30.0,
+        hedge_percentile: Optional[float] = None,
+    ) -> None:
+        """
+        ``host`` may be a list of hosts; generations are then balanced across them
+        (see ``HostPool``), optionally hedged after ``hedge_percentile`` of the
+        observed time to first response.
+        """
+        super().__init__(
+            cache=cache,
+            prompt_layout=prompt_layout,
+            reuse_context=reuse_context,
+            keep_alive=keep_alive,
+            default_keep_alive=default_keep_alive,
+            max_context_tokens=max_context_tokens,
+            max_contexts=max_contexts,
+        )
+        hosts = [host] if isinstance(host, str) else list(host)
+        self.pool = HostPool(
+            hosts, timeout=timeout, eject_seconds=eject_seconds, hedge_percentile=hedge_percentile
+        )
+        if len(hosts) > 1:
+            # a slow host must not hold up construction
+            self.pool.start_refresh()
+        # first host answers admin calls (list, digests)
+        self.client = self.pool.hosts[0].client
+
+    def preload(self, model: str) -> None:
+        """Load the model into memory without generating (empty prompt)."""
+        self.pool.generate(self._preload_request(model))
+
+    def _model_digest(self, model: str) -> str:
+        """
+        Resolve the model digest so cache entries are invalidated when weights change.
+        Falls back to the model name if the server cannot be asked.
+        """
+        if model not in self._digests:
+            try:
+                self._digests[model] = self._digest_from_listing(self.client.list(), model)
+            except Exception:
+                self._digests[model] = model
+        return self._digests[model]
+
+    def generate_json(
+        self,
+        model: str,
+        prompt: str,
+        chunk_callback: Optional[callable] = None,
+        use_cache: bool = True,
+        expected_keys: Optional[Iterable[str]] = None,
+        field_callback: Optional[FieldCallback] = None,
+        schema: Optional[SchemaLike] = None,
+        stats_callback: Optional[StatsCallback] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Dict[str, Any]:
+        """
+        Request a JSON response. If parsing fails, raise a ValueError so callers can fallback.
+        With a cache configured, identical (model digest, prompt, options) requests are
+        answered from disk; ``use_cache=False`` bypasses the lookup and the store.
+        The answer is validated while it streams: output that cannot become a JSON
+        object with ``expected_keys`` aborts the request early with a
+        ``StreamValidationError`` (a ``ValueError``). Completed top-level fields are
+        passed to ``field_callback``.
+        ``schema`` (a Pydantic model or JSON schema) is sent as Ollama's ``format`` to
+        constrain generation; its properties double as ``expected_keys``.
+        ``stats_callback`` receives token counts and durations for every call,
+        including cache hits and aborted streams.
+        Once ``cancel_token`` fires the stream is closed, which stops generation on
+        the server, and ``RunCancelled`` is raised.
+        """
+        call = self._begin(
+            model, prompt, chunk_callback, expected_keys, field_callback, schema, stats_callback
+        )
+        if self.cache is not None and use_cache:
+            cached = self._lookup(call, self._model_digest(model))
+            if cached is not None:
+                return cached
+
+        self._prepare_send(call)
+        try:
+            if call.streaming:
+                stream = self.pool.generate(call.request, stream=True, cancel_token=cancel_token)
+                try:
+                    for part in stream:
+                        if cancel_token is not None and cancel_token.cancelled:
+                            call.stats.aborted = True
+                            cancel_token.raise_if_cancelled()
+                        if call.feed(part):
+                            break
+                finally:
+                    # Closing the generator closes the HTTP response, which stops generation.
+                    close = getattr(stream, "close", None)
+                    if close:
+                        close()
+            else:
+                call.feed(self.pool.generate(call.request, cancel_token=cancel_token))
+        except StreamValidationError:
+            call.stats.aborted = True
+            raise
+        finally:
+            call.report()
+        return self._complete(call)
+
     def list_models(self) -> Dict[str, Any]:
         return self.client.list()
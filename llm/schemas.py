@@ -0,0 +1,33 @@
+"""
+JSON schemas for structured outputs (Ollama ``format`` parameter).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Optional, Type, Union
+
+from pydantic import BaseModel
+
+SchemaLike = Union[Type[BaseModel], Dict[str, Any]]
+
+
+@lru_cache(maxsize=None)
+def json_schema_for(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Generate the JSON schema of a Pydantic model once per class."""
+    return model.model_json_schema()
+
+
+def resolve_schema(schema: Optional[SchemaLike]) -> Optional[Dict[str, Any]]:
+    if schema is None:
+        return None
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return json_schema_for(schema)
+    return schema
+
+
+def top_level_keys(schema: Optional[Dict[str, Any]]) -> Optional[tuple[str, ...]]:
+    """Property names of an object schema, used for early stream validation."""
+    if not schema or "properties" not in schema:
+        return None
+    return tuple(schema["properties"])
@@ -0,0 +1,87 @@
+"""
+Incremental helpers for consuming streamed LLM output.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+
+class ThinkTagSplitter:
+    """
+    State machine that separates ``<think>...</think>`` blocks from answer text.
+
+    Chunks are consumed once; tags split across chunk boundaries are held back
+    until the next chunk decides them. Answer text is collected in a list and
+    joined once in ``finish`` and optionally forwarded to ``answer_callback``
+    (e.g. an incremental JSON validator). Thinking text only goes to the
+    stream callback.
+    """
+
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+    THINKING_PREFIX = "[thinking] "
+
+    def __init__(
+        self,
+        chunk_callback: Optional[callable] = None,
+        answer_callback: Optional[callable] = None,
+    ) -> None:
+        self.chunk_callback = chunk_callback
+        self.answer_callback = answer_callback
+        self.in_think = False
+        self._pending = ""
+        self._answer: List[str] = []
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        data = self._pending + chunk if self._pending else chunk
+        self._pending = ""
+        pos = 0
+        size = len(data)
+        while pos < size:
+            tag = self.CLOSE_TAG if self.in_think else self.OPEN_TAG
+            idx = data.find(tag, pos)
+            if idx == -1:
+                keep = self._partial_tag_length(data, tag, pos)
+                self._route(data[pos : size - keep])
+                self._pending = data[size - keep :]
+                return
+            self._route(data[pos:idx])
+            pos = idx + len(tag)
+            self._toggle()
+
+    def feed_thinking(self, text: str) -> None:
+        """Route text the server already reported as thinking (``thinking`` field)."""
+        if text and self.chunk_callback:
+            self.chunk_callback(f"{self.THINKING_PREFIX}{text}")
+
+    def finish(self) -> str:
+        if self._pending:
+            self._route(self._pending)
+            self._pending = ""
+        return "".join(self._answer)
+
+    def _toggle(self) -> None:
+        self.in_think = not self.in_think
+        if self.chunk_callback:
+            self.chunk_callback(self.THINKING_PREFIX if self.in_think else "\n")
+
+    def _route(self, text: str) -> None:
+        if not text:
+            return
+        if self.chunk_callback:
+            self.chunk_callback(text)
+        if not self.in_think:
+            self._answer.append(text)
+            if self.answer_callback:
+                self.answer_callback(text)
+
+    @staticmethod
+    def _partial_tag_length(data: str, tag: str, start: int) -> int:
+        """Length of the longest suffix of ``data[start:]`` that is a prefix of ``tag``."""
+        for length in range(min(len(tag) - 1, len(data) - start), 0, -1):
+            if data.endswith(tag[:length]):
+                return length
+        return 0
@@ -0,0 +1,83 @@
+"""
+Per-call LLM telemetry (token counts and durations reported by Ollama).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field, computed_field
+
+_NS_PER_MS = 1_000_000
+
+
+class LLMCallStats(BaseModel):
+    model: str
+    cached: bool = Field(default=False)
+    aborted: bool = Field(default=False)
+    prompt_eval_count: int = Field(default=0)
+    eval_count: int = Field(default=0)
+    prompt_eval_duration_ms: float = Field(default=0.0)
+    eval_duration_ms: float = Field(default=0.0)
+    load_duration_ms: float = Field(default=0.0)
+    total_duration_ms: float = Field(default=0.0)
+    wall_ms: float = Field(default=0.0)
+    time_to_first_token_ms: Optional[float] = None
+
+    @computed_field
+    @property
+    def tokens_per_second(self) -> float:
+        if not self.eval_duration_ms:
+            return 0.0
+        return self.eval_count / (self.eval_duration_ms / 1000)
+
+    def absorb(self, response: Any) -> None:
+        """Copy counters from the final Ollama response (durations arrive in ns)."""
+        self.prompt_eval_count = response.get("prompt_eval_count") or 0
+        self.eval_count = response.get("eval_count") or 0
+        self.prompt_eval_duration_ms = (response.get("prompt_eval_duration") or 0) / _NS_PER_MS
+        self.eval_duration_ms = (response.get("eval_duration") or 0) / _NS_PER_MS
+        self.load_duration_ms = (response.get("load_duration") or 0) / _NS_PER_MS
+        self.total_duration_ms = (response.get("total_duration") or 0) / _NS_PER_MS
+
+
+StatsCallback = Callable[[LLMCallStats], None]
+
+
+class TelemetryAggregator:
+    """Collects call stats per agent and derives throughput and latency figures."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, List[LLMCallStats]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, agent: str, stats: LLMCallStats) -> None:
+        with self._lock:
+            self._calls.setdefault(agent, []).append(stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            calls = {agent: list(items) for agent, items in self._calls.items()}
+        result: Dict[str, Dict[str, float]] = {}
+        for agent, items in calls.items():
+            eval_tokens = sum(s.eval_count for s in items)
+            eval_ms = sum(s.eval_duration_ms for s in items)
+            ttfts = [s.time_to_first_token_ms for s in items if s.time_to_first_token_ms is not None]
+            result[agent] = {
+                "calls": len(items),
+                "cached": sum(1 for s in items if s.cached),
+                "aborted": sum(1 for s in items if s.aborted),
+                "prompt_tokens": sum(s.prompt_eval_count for s in items),
+                "eval_tokens": eval_tokens,
+                "tokens_per_second": eval_tokens / (eval_ms / 1000) if eval_ms else 0.0,
+                "avg_time_to_first_token_ms": sum(ttfts) / len(ttfts) if ttfts else 0.0,
+                "prompt_eval_ms": sum(s.prompt_eval_duration_ms for s in items),
+                "load_ms": sum(s.load_duration_ms for s in items),
+                "wall_ms": sum(s.wall_ms for s in items),
+            }
+        return result
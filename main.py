@@ -5,13 +5,54 @@ import json
 import sys
 
 from config.config import AppConfig
+from orchestrator.batch import run_batch
 from orchestrator.orchestrator import Orchestrator
+from orchestrator.service import serve
 from ui.app import run_ui
 
 
+def batch_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="main.py batch", description="Run tasks from a JSONL file without UI"
+    )
+    parser.add_argument("input", nargs="?", default="-", help="JSONL task file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL result file ('-' for stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Parallel orchestrators")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        report = run_batch(AppConfig(), source, sink, workers=args.workers)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(report.model_dump_json(indent=2), file=sys.stderr)
+    return 0 if not report.failed else 2
+
+
+def serve_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Run as local HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    try:
+        serve(AppConfig(), host=args.host, port=args.port)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
 def main() -> int:
+    if sys.argv[1:2] == ["batch"]:
+        return batch_main(sys.argv[2:])
+    if sys.argv[1:2] == ["serve"]:
+        return serve_main(sys.argv[2:])
     parser = argparse.ArgumentParser(description="Local multi-agent orchestrator")
     parser.add_argument("task", nargs="*", help="Task description")
+    parser.add_argument("--resume", metavar="TASK_ID", help="Continue an interrupted run")
     args = parser.parse_args()
 
     task_description = " ".join(args.task) if args.task else "Implement placeholder task"
@@ -19,8 +60,12 @@ def main() -> int:
     orchestrator = Orchestrator(app_cfg)
     plan_steps = []
     status = "Bereit"
-    if args.task:
-        result = orchestrator.run(task_description)
+    if args.task or args.resume:
+        if args.resume:
+            result = orchestrator.resume(args.resume)
+            task_description = result["task"]["description"]
+        else:
+            result = orchestrator.run(task_description)
         print(json.dumps(result, indent=2, ensure_ascii=True, default=str))
         status = f"{len(result.get('plan', {}).get('steps', []))} steps processed"
         plan_steps = [s.get("title") for s in result.get("plan", {}).get("steps", [])]
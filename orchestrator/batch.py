@@ -0,0 +1,135 @@
+"""
+Headless batch processing of a JSONL task stream.
+
+Each input line is a JSON object with ``description`` (or ``title``/``body``
+as in ``requests.jsonl``) and optional ``id``/``request_id``, ``priority`` and
+``owner``. Tasks run on a ``TaskScheduler``; one result line is written per
+task as soon as it finishes, in completion order.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from typing import Any, Dict, IO, List, Optional
+
+from pydantic import BaseModel, Field
+
+from config.config import AppConfig
+from orchestrator.scheduler import TaskScheduler
+
+
+class BatchReport(BaseModel):
+    tasks: int = Field(default=0)
+    succeeded: int = Field(default=0)
+    failed: int = Field(default=0)
+    wall_seconds: float = Field(default=0.0)
+    tasks_per_minute: float = Field(default=0.0)
+    # submit-to-finish latency, including queueing
+    latency_ms: Dict[str, float] = Field(default_factory=dict)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def parse_task(line: str, number: int) -> Dict[str, Any]:
+    entry = json.loads(line)
+    if isinstance(entry, str):
+        entry = {"description": entry}
+    description = entry.get("description") or entry.get("task")
+    if not description:
+        description = "\n\n".join(part for part in (entry.get("title"), entry.get("body")) if part)
+    if not description:
+        raise ValueError(f"Line {number}: no task description.")
+    return {
+        "id": str(entry.get("id") or entry.get("request_id") or number),
+        "description": description,
+        "priority": int(entry.get("priority", 0)),
+        "owner": str(entry.get("owner", "default")),
+    }
+
+
+def run_batch(
+    config: AppConfig,
+    source: IO[str],
+    sink: IO[str],
+    workers: Optional[int] = None,
+    scheduler: Optional[TaskScheduler] = None,
+) -> BatchReport:
+    """
+    Stream tasks from ``source`` into the scheduler (at most two per worker
+    queued at a time) and write result lines to ``sink``.
+    """
+    scheduler = scheduler or TaskScheduler(config, workers=workers)
+    in_flight = threading.BoundedSemaphore(2 * scheduler.workers)
+    write_lock = threading.Lock()
+    latencies: List[float] = []
+    report = BatchReport()
+    started = time.perf_counter()
+
+    def emit(record: Dict[str, Any]) -> None:
+        with write_lock:
+            sink.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            sink.flush()
+
+    def finished(task: Dict[str, Any], submitted: float, future) -> None:
+        latency_ms = (time.perf_counter() - submitted) * 1000
+        record: Dict[str, Any] = {"id": task["id"], "latency_ms": round(latency_ms, 1)}
+        try:
+            result = future.result()
+        except BaseException as exc:
+            record.update(status="error", error=f"{type(exc).__name__}: {exc}")
+        else:
+            record.update(
+                status="ok",
+                task_id=result["task"]["task_id"],
+                decisions=[r["decision"] for r in result["reviews"]],
+                summary=result["summary"].get("summary"),
+            )
+        with write_lock:
+            latencies.append(latency_ms)
+            if record["status"] == "ok":
+                report.succeeded += 1
+            else:
+                report.failed += 1
+        emit(record)
+        in_flight.release()
+
+    scheduler.start()
+    try:
+        for number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                task = parse_task(line, number)
+            except (ValueError, json.JSONDecodeError) as exc:
+                with write_lock:
+                    report.failed += 1
+                emit({"id": str(number), "status": "error", "error": f"invalid task: {exc}"})
+                continue
+            in_flight.acquire()
+            submitted = time.perf_counter()
+            future = scheduler.submit(task["description"], priority=task["priority"], owner=task["owner"])
+            future.add_done_callback(
+                lambda f, task=task, submitted=submitted: finished(task, submitted, f)
+            )
+    finally:
+        scheduler.shutdown(wait=True)
+
+    report.tasks = report.succeeded + report.failed
+    report.wall_seconds = round(time.perf_counter() - started, 3)
+    if report.wall_seconds:
+        report.tasks_per_minute = round(len(latencies) / report.wall_seconds * 60, 2)
+    report.latency_ms = {
+        f"p{pct}": round(percentile(latencies, pct), 1) for pct in (50, 90, 95, 99)
+    }
+    report.latency_ms["max"] = round(max(latencies, default=0.0), 1)
+    return report
@@ -0,0 +1,51 @@
+"""
+Reconstruct the state of an interrupted run from the event store.
+
+``TASK_CREATED`` carries the task, ``PLAN_CREATED`` the plan, every
+``STEP_COMPLETED`` the review and research findings of a finished step, and
+``RUN_COMPLETED`` the summary.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from context.models import PlanContext, ResearchFinding, ReviewContext, TaskContext
+from orchestrator.events import EventType
+from storage.event_store import EventStore
+
+
+class RunCheckpoint(BaseModel):
+    task: TaskContext
+    plan: Optional[PlanContext] = None
+    # step_id -> review of the finished step
+    reviews: Dict[str, ReviewContext] = Field(default_factory=dict)
+    research_memory: List[ResearchFinding] = Field(default_factory=list)
+    summary: Optional[Dict[str, Any]] = None
+
+    @property
+    def completed(self) -> bool:
+        return self.summary is not None
+
+
+def load_checkpoint(event_store: EventStore, task_id: str) -> Optional[RunCheckpoint]:
+    checkpoint: Optional[RunCheckpoint] = None
+    for event in event_store.fetch_for_task(task_id):
+        payload = event.payload
+        if event.event_type == EventType.TASK_CREATED:
+            checkpoint = RunCheckpoint(task=TaskContext.model_validate(payload))
+        elif checkpoint is None:
+            continue
+        elif event.event_type == EventType.PLAN_CREATED:
+            checkpoint.plan = PlanContext.model_validate(payload)
+        elif event.event_type == EventType.STEP_COMPLETED:
+            review = ReviewContext.model_validate(payload["review"])
+            checkpoint.reviews[review.step_id] = review
+            checkpoint.research_memory += [
+                ResearchFinding.model_validate(f) for f in payload.get("findings", [])
+            ]
+        elif event.event_type == EventType.RUN_COMPLETED:
+            checkpoint.summary = payload.get("summary")
+    return checkpoint
@@ -18,6 +18,14 @@ class EventType(str, Enum):
     TOOL_REGISTERED = "TOOL_REGISTERED"
     ERROR_ABORTED = "ERROR_ABORTED"
     RUN_COMPLETED = "RUN_COMPLETED"
+    LLM_CALL = "LLM_CALL"
+    SPECULATION_DISCARDED = "SPECULATION_DISCARDED"
+    STEP_COMPLETED = "STEP_COMPLETED"
+    RUN_RESUMED = "RUN_RESUMED"
+    FIX_APPLIED = "FIX_APPLIED"
+    RUN_CANCELLED = "RUN_CANCELLED"
+    # a top-level field of an answer still streaming; only passed to on_event, not stored
+    FIELD_PARSED = "FIELD_PARSED"
 
 
 class EventRecord(BaseModel):
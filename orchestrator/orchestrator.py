@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Callable, Dict, List, Optional
+import threading
+import warnings
+from contextlib import asynccontextmanager, contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar, copy_context
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from agents.decomposer_agent import DecomposerAgent, DecomposerInput
 from agents.executor_agent import ExecutorAgent, ExecutorInput
@@ -9,12 +15,16 @@ from agents.fix_manager_agent import FixManagerAgent, FixManagerInput
 from agents.planner_agent import PlannerAgent, PlannerInput
 from agents.prompter_agent import PrompterAgent, PrompterInput
 from agents.reviewer_agent import ReviewerAgent, ReviewerInput
-from agents.research_agent import ResearchAgent, ResearchInput
-from agents.summarizer_agent import SummarizerAgent, SummarizerInput
+from agents.research_agent import ResearchAgent, ResearchInput, ResearchOutput
+from agents.summarizer_agent import SummarizerAgent, SummarizerInput, SummaryOutput
 from config.config import AppConfig, resolve_paths
+from context.cancellation import CancelToken, RunCancelled
+from context.tracing import Tracer, span, traced, tracing
 from context.models import (
     ExecutionContext,
     ExecutionRequest,
+    ExecutionResult,
+    FixInstruction,
     PlanContext,
     PromptContext,
     ProjectMemory,
@@ -24,20 +34,93 @@ from context.models import (
     StepContext,
     TaskContext,
 )
-from context.context_logger import start_run, write_raw_context
-from llm.ollama_client import OllamaClient
+from context.context_logger import ContextLogInterceptor, ContextLogSink, start_run
+from llm.async_ollama_client import AsyncOllamaClient
+from llm.cache import ResponseCache
+from llm.interceptors import AsyncInterceptedLLMClient, InterceptedLLMClient
+from llm.ollama_client import OllamaClient, context_scope
+from llm.telemetry import LLMCallStats, TelemetryAggregator
+from orchestrator.checkpoint import RunCheckpoint, load_checkpoint
 from orchestrator.events import EventRecord, EventType
 from orchestrator.state import OrchestratorState, StateTracker
-from runner.pytest_runner import PytestRunner
+from runner.execution_cache import ExecutionCache
+from runner.pytest_runner import PytestRunner, failing_tests
+from runner.report import compact_report
+from runner.run_gc import RetentionPolicy
 from storage.event_store import EventStore
 from storage.snapshots import SnapshotWriter
 from tools.registry import ToolRegistry
-from prompts import build_prompt
 import json
 
 
 ProgressCallback = Callable[[str, Dict[str, object]], None]
 
+# set while run_async drives the current task; event writes then go off the loop
+_ASYNC_RUN: ContextVar[bool] = ContextVar("orchestrator_async_run", default=False)
+
+
+def build_llm_cache(config: AppConfig) -> Optional[ResponseCache]:
+    if not config.llm_cache_enabled:
+        return None
+    return ResponseCache(
+        config.storage_dir / "llm_cache.db",
+        max_bytes=config.llm_cache_max_bytes,
+        max_age_seconds=config.llm_cache_max_age_seconds,
+    )
+
+
+def build_execution_cache(config: AppConfig) -> Optional[ExecutionCache]:
+    if not config.execution_cache_enabled:
+        return None
+    return ExecutionCache(
+        config.storage_dir / "execution_cache.db",
+        max_bytes=config.execution_cache_max_bytes,
+        max_age_seconds=config.execution_cache_max_age_seconds,
+        fingerprint_data_dir=config.execution_cache_fingerprint_data_dir,
+    )
+
+
+def build_runner(config: AppConfig) -> PytestRunner:
+    return PytestRunner(
+        workspace=config.tool_dir,
+        timeout_seconds=config.pytest_timeout_seconds,
+        data_dir=config.user_files_dir,
+        workers=config.pytest_workers,
+        cache=build_execution_cache(config),
+        staging_dir=config.run_staging_dir,
+        retention=RetentionPolicy(
+            keep_last=config.run_keep_last,
+            keep_failing=config.run_keep_failing,
+            max_bytes=config.run_max_bytes,
+        ),
+        gc_interval_seconds=config.run_gc_interval_seconds,
+        static_gate=config.static_gate_enabled,
+        forbidden_calls=config.static_gate_forbidden_calls,
+    )
+
+
+def build_llm_client(config: AppConfig, cache: Optional[ResponseCache] = None) -> OllamaClient:
+    return OllamaClient(
+        host=config.ollama_hosts or config.ollama_host,
+        timeout=config.ollama_timeout,
+        cache=cache,
+        prompt_layout=config.prompt_layout,
+        reuse_context=config.llm_reuse_context,
+        max_context_tokens=config.llm_max_context_tokens,
+        max_contexts=config.llm_max_contexts,
+        keep_alive=config.model_keep_alive,
+        default_keep_alive=config.default_keep_alive,
+        eject_seconds=config.ollama_eject_seconds,
+        hedge_percentile=config.ollama_hedge_percentile,
+    )
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
 
 class Orchestrator:
     def __init__(
@@ -46,21 +129,38 @@ class Orchestrator:
         llm_client: OllamaClient | None = None,
         on_event: Optional[ProgressCallback] = None,
         on_stream: Optional[ProgressCallback] = None,
+        async_llm_client: AsyncOllamaClient | None = None,
+        runner: PytestRunner | None = None,
     ) -> None:
+        """
+        ``llm_client``, ``async_llm_client`` and ``runner`` may be shared with other
+        orchestrators (see ``TaskScheduler``); only missing ones are built from the config.
+        """
         self.config = resolve_paths(config)
-        self.state = StateTracker(max_fixes=5)
+        self._state = StateTracker(max_fixes=5)
+        self._step_local = threading.local()
+        self._memory_lock = threading.Lock()
+        # bumped when a step's review is not APPROVED or a fix is applied: speculation
+        # launched before that was prepared for an outcome that did not happen
+        self._outcome_version = 0
         self.event_store = EventStore(self.config.storage_dir / "events.db")
         self.snapshot_writer = SnapshotWriter(self.config.context_snapshot_dir)
         self.tool_registry = ToolRegistry(
             root=self.config.tool_dir, allowed_permissions=self.config.allowed_tool_permissions
         )
-        self.runner = PytestRunner(
-            workspace=self.config.tool_dir, timeout_seconds=self.config.pytest_timeout_seconds, data_dir=self.config.user_files_dir
-        )
+        self.runner = runner or build_runner(self.config)
         models = self.config.as_agent_config()
-        self.llm_client = llm_client or OllamaClient(
-            host=self.config.ollama_host, timeout=self.config.ollama_timeout
-        )
+        llm_cache = build_llm_cache(self.config) if llm_client is None else None
+        self.llm_client = llm_client or build_llm_client(self.config, llm_cache)
+        self.async_llm_client = async_llm_client
+        # built per async run, see ``_async_client_scope``
+        self._builds_async_client = async_llm_client is None and llm_client is None
+        self._llm_cache = llm_cache
+        self._pending_writes: Set[asyncio.Task] = set()
+        # token of the run in progress, see ``cancel``
+        self.cancel_token: Optional[CancelToken] = None
+        # spans of the current (or last) run; exported as Chrome trace JSON
+        self.tracer = Tracer()
         self.on_event = on_event
         self.on_stream = on_stream
         self.planner_agent = PlannerAgent(
@@ -87,11 +187,38 @@ class Orchestrator:
         self.research_agent = ResearchAgent(
             models["research"], llm_client=self.llm_client, stream_callback=self.on_stream
         )
+        for agent_key in self.config.llm_cache_bypass:
+            agent = getattr(self, f"{agent_key}_agent", None)
+            if agent is not None:
+                agent.use_cache = False
+        self.telemetry = TelemetryAggregator()
+        # every agent's calls pass the interceptor chain; the context log gets
+        # exactly what was sent and received, written off the calling thread
+        self.context_sink = ContextLogSink()
+        self._interceptors = [
+            ContextLogInterceptor(self.context_sink, lambda: getattr(self, "current_run_dir", None))
+        ]
+        for agent_key in models:
+            agent = getattr(self, f"{agent_key}_agent")
+            agent.telemetry_callback = self._on_llm_stats
+            agent.field_callback = self._on_field
+            agent.llm_client = InterceptedLLMClient(self.llm_client, self._interceptors, agent_key)
+        self._wire_async_client()
         self.memory = ProjectMemory()
+        self._last_model: Optional[str] = None
+        if self.config.preload_models:
+            # decomposer makes no LLM call; the rest is in order of first use
+            startup = [name for key, name in models.items() if key != "decomposer"]
+            startup = list(dict.fromkeys(startup))
+            self.warm_models(startup[:1] if self.config.single_model_memory else startup)
 
-    def set_stream_callback(self, cb: Optional[ProgressCallback]) -> None:
-        self.on_stream = cb
-        for agent in (
+    @property
+    def state(self) -> StateTracker:
+        """State of the step running in this thread (parallel steps each get their own)."""
+        return getattr(self._step_local, "state", None) or self._state
+
+    def _agents(self) -> tuple:
+        return (
             self.planner_agent,
             self.decomposer_agent,
             self.research_agent,
@@ -100,110 +227,589 @@ class Orchestrator:
             self.reviewer_agent,
             self.fix_manager_agent,
             self.summarizer_agent,
-        ):
+        )
+
+    def warm_models(self, model_names: List[str]) -> Optional[threading.Thread]:
+        """Load models in a background thread so the first real call skips the load."""
+        preload = getattr(self.llm_client, "preload", None)
+        if preload is None or not model_names:
+            return None
+
+        def _warm() -> None:
+            for name in model_names:
+                try:
+                    preload(name)
+                except Exception:
+                    pass
+
+        thread = threading.Thread(target=_warm, daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_next(self, agent) -> None:
+        """
+        Stage order is fixed by data flow, so model swaps cannot be reordered away;
+        instead the next stage's model is loaded while a stage without LLM call runs.
+        """
+        if self.config.preload_models and agent.model_name != self._last_model:
+            self.warm_models([agent.model_name])
+
+    def set_stream_callback(self, cb: Optional[ProgressCallback]) -> None:
+        self.on_stream = cb
+        for agent in self._agents():
             agent.stream_callback = cb
 
-    def run(self, task_description: str) -> Dict[str, object]:
-        self.current_run_dir = start_run(self.config.context_log_dir)
+    def run(self, task_description: str, cancel_token: Optional[CancelToken] = None) -> Dict[str, object]:
+        """
+        Run a task. ``cancel_token`` (or ``cancel``) stops it cooperatively: the
+        LLM stream is closed, pytest is killed and ``RunCancelled`` is raised. The
+        run is also cancelled after ``run_timeout_seconds``.
+        """
+        with self._run_scope(cancel_token):
+            task_ctx = self._start_run(task_description)
+            plan_ctx = self._plan(task_ctx)
+            return self._run_plan(task_ctx, plan_ctx, {})
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the run in progress, from any thread."""
+        token = self.cancel_token
+        if token is not None:
+            token.cancel(reason)
+
+    @contextmanager
+    def _run_scope(self, cancel_token: Optional[CancelToken]) -> Iterator[CancelToken]:
+        """
+        Give the run a token with the configured wall-clock budget, hand it to the
+        agents and follow ``cancel_token`` if one was passed in. Spans recorded
+        during the run are written to ``trace.json`` in its context-log directory.
+        """
+        token = CancelToken(self.config.run_timeout_seconds)
+        unlink = cancel_token.on_cancel(lambda: token.cancel(cancel_token.reason)) if cancel_token else None
+        self.cancel_token = token
+        for agent in self._agents():
+            agent.cancel_token = token
+        self.tracer = Tracer()
+        try:
+            with tracing(self.tracer), span("run", "run") as run_span:
+                try:
+                    yield token
+                finally:
+                    run_span.args["task_id"] = getattr(self, "current_task_id", None)
+                    # pending context-log writes belong inside the run span
+                    self.context_sink.flush()
+        except RunCancelled as exc:
+            self._log_event(
+                EventType.RUN_CANCELLED,
+                {"task_id": getattr(self, "current_task_id", None), "reason": str(exc)},
+            )
+            raise
+        finally:
+            token.close()
+            if unlink is not None:
+                unlink()
+            self._write_trace()
+
+    def _write_trace(self) -> None:
+        run_dir = getattr(self, "current_run_dir", None)
+        if not self.config.trace_runs or run_dir is None:
+            return
+        try:
+            self.tracer.write(run_dir / "trace.json")
+        except OSError:
+            pass
+
+    def _enter(self, state: OrchestratorState) -> OrchestratorState:
+        """Move to the next stage unless the run was cancelled."""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+        return self.state.next(state)
+
+    def _run_tests(
+        self, request: ExecutionRequest, previous: Optional[ExecutionResult] = None
+    ) -> ExecutionResult:
+        """Run pytest for ``request``; with ``previous`` only its failing tests, if the runner can."""
+        rerun = getattr(self.runner, "rerun", None) if previous is not None else None
+        if rerun is not None:
+            return rerun(request, previous, cancel_token=self.cancel_token)
+        return self.runner.run(request, cancel_token=self.cancel_token)
+
+    def resume(self, task_id: str, cancel_token: Optional[CancelToken] = None) -> Dict[str, object]:
+        """
+        Continue an interrupted run from the event store: steps with a recorded
+        ``STEP_COMPLETED`` are skipped and the research memory is restored. A run
+        that already completed is returned as persisted, without LLM calls.
+        """
+        checkpoint = self._checkpoint(task_id)
+        if checkpoint.completed and checkpoint.plan is not None:
+            return self._persisted_result(checkpoint)
+        with self._run_scope(cancel_token):
+            self._reopen_run(checkpoint)
+            plan_ctx = checkpoint.plan or self._plan(checkpoint.task)
+            return self._run_plan(checkpoint.task, plan_ctx, checkpoint.reviews)
+
+    def _checkpoint(self, task_id: str) -> RunCheckpoint:
+        checkpoint = load_checkpoint(self.event_store, task_id)
+        if checkpoint is None:
+            raise ValueError(f"No persisted run for task {task_id}.")
+        return checkpoint
+
+    def _persisted_result(self, checkpoint: RunCheckpoint) -> Dict[str, object]:
+        reviews = [
+            checkpoint.reviews[s.step_id] for s in checkpoint.plan.steps if s.step_id in checkpoint.reviews
+        ]
+        return self._run_result(checkpoint.task, checkpoint.plan, reviews, checkpoint.summary)
+
+    def _reopen_run(self, checkpoint: RunCheckpoint) -> None:
+        self._open_run(checkpoint.task)
+        self._log_event(
+            EventType.RUN_RESUMED,
+            {"task_id": checkpoint.task.task_id, "completed_steps": sorted(checkpoint.reviews)},
+        )
+        with self._memory_lock:
+            self.research_memory = list(checkpoint.research_memory)
+        if checkpoint.plan is not None:
+            self.last_plan = checkpoint.plan
+
+    def _run_plan(
+        self, task_ctx: TaskContext, plan_ctx: PlanContext, completed: Dict[str, ReviewContext]
+    ) -> Dict[str, object]:
+        """Run every step not in ``completed`` (step_id -> review), then summarize."""
+        if self.config.max_parallel_steps > 1 and len(plan_ctx.steps) > 1:
+            reviews = self._run_steps_parallel(task_ctx, plan_ctx, completed)
+        else:
+            reviews = []
+            if self.config.pipeline_steps and len(plan_ctx.steps) > 1:
+                reviews = self._run_steps_pipelined(task_ctx, plan_ctx, completed)
+            else:
+                for idx, step in enumerate(plan_ctx.steps):
+                    review = completed.get(step.step_id) or self._run_step(task_ctx, plan_ctx, idx)
+                    reviews.append(review)
+                    plan_ctx.current_step_index = idx + 1
+
+        summary = self._summarize(task_ctx, plan_ctx, reviews)
+        return self._finish_run(task_ctx, plan_ctx, reviews, summary)
+
+    async def run_async(
+        self, task_description: str, cancel_token: Optional[CancelToken] = None
+    ) -> Dict[str, object]:
+        """
+        Awaitable ``run``: LLM calls, pytest and event-store writes do not block the
+        event loop, and cancelling the task cancels the pending LLM request or kills
+        pytest. Steps run in plan order: ``max_parallel_steps`` and ``pipeline_steps``
+        apply to ``run`` only (a warning says so when they are set). One run at a
+        time per orchestrator; for concurrent tasks use one orchestrator each,
+        sharing ``async_llm_client``. A fired ``cancel_token`` or the run budget
+        cancels the task and raises ``RunCancelled``.
+        """
+
+        async def body() -> Dict[str, object]:
+            task_ctx = self._start_run(task_description)
+            plan_ctx = await self._plan_async(task_ctx)
+            return await self._run_plan_async(task_ctx, plan_ctx, {})
+
+        return await self._run_async(body, cancel_token)
+
+    async def resume_async(self, task_id: str, cancel_token: Optional[CancelToken] = None) -> Dict[str, object]:
+        """Awaitable ``resume``; steps run as in ``run_async``."""
+        checkpoint = self._checkpoint(task_id)
+        if checkpoint.completed and checkpoint.plan is not None:
+            return self._persisted_result(checkpoint)
+
+        async def body() -> Dict[str, object]:
+            self._reopen_run(checkpoint)
+            plan_ctx = checkpoint.plan or await self._plan_async(checkpoint.task)
+            return await self._run_plan_async(checkpoint.task, plan_ctx, checkpoint.reviews)
+
+        return await self._run_async(body, cancel_token)
+
+    async def _run_async(
+        self, body: Callable[[], Awaitable[Dict[str, object]]], cancel_token: Optional[CancelToken]
+    ) -> Dict[str, object]:
+        token = _ASYNC_RUN.set(True)
+        try:
+            async with self._async_client_scope():
+                with self._run_scope(cancel_token) as run_token:
+                    loop = asyncio.get_running_loop()
+                    current = asyncio.current_task()
+                    unlink = run_token.on_cancel(lambda: loop.call_soon_threadsafe(current.cancel))
+                    try:
+                        return await body()
+                    except asyncio.CancelledError:
+                        if run_token.cancelled:
+                            raise RunCancelled(run_token.reason) from None
+                        raise
+                    finally:
+                        unlink()
+        finally:
+            _ASYNC_RUN.reset(token)
+            if self._pending_writes:
+                await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+    async def _run_plan_async(
+        self, task_ctx: TaskContext, plan_ctx: PlanContext, completed: Dict[str, ReviewContext]
+    ) -> Dict[str, object]:
+        if self.config.max_parallel_steps > 1 or self.config.pipeline_steps:
+            warnings.warn(
+                "run_async runs steps in plan order; max_parallel_steps and pipeline_steps are ignored",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+        reviews: List[ReviewContext] = []
+        for idx, step in enumerate(plan_ctx.steps):
+            reviews.append(completed.get(step.step_id) or await self._run_step_async(task_ctx, plan_ctx, idx))
+            plan_ctx.current_step_index = idx + 1
+        summary = await self._summarize_async(task_ctx, plan_ctx, reviews)
+        return self._finish_run(task_ctx, plan_ctx, reviews, summary)
+
+    async def stream_async(self, task_description: str) -> AsyncIterator[Tuple[str, str, object]]:
+        """
+        Run ``run_async`` and yield its progress as ``(kind, name, data)``:
+        ``("event", event_type, payload)``, ``("stream", agent, chunk)`` and finally
+        ``("result", "run", result)``. Leaving the loop early cancels the run.
+        The ``on_event``/``on_stream`` callbacks are replaced while it runs.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def put(item: Optional[Tuple[str, str, object]]) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        on_event, on_stream = self.on_event, self.on_stream
+        self.on_event = lambda name, payload: put(("event", name, payload))
+        self.set_stream_callback(lambda agent, chunk: put(("stream", agent, chunk)))
+        task = loop.create_task(self.run_async(task_description))
+        task.add_done_callback(lambda _task: put(None))
+        try:
+            while (item := await queue.get()) is not None:
+                yield item
+            yield ("result", "run", task.result())
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self.on_event = on_event
+            self.set_stream_callback(on_stream)
+
+    @asynccontextmanager
+    async def _async_client_scope(self) -> AsyncIterator[None]:
+        """
+        Build the awaitable client for one async run and close it afterwards: its
+        connections belong to the running event loop. ``AsyncOllamaClient`` talks
+        to one host; with several ``ollama_hosts`` none is built and the agents
+        run the pooled sync client on a worker thread instead. An injected client
+        is used as is.
+        """
+        if not self._builds_async_client or len(self.config.ollama_hosts) > 1:
+            yield
+            return
+        self.async_llm_client = AsyncOllamaClient(
+            host=(self.config.ollama_hosts or [self.config.ollama_host])[0],
+            timeout=self.config.ollama_timeout,
+            cache=self._llm_cache,
+            prompt_layout=self.config.prompt_layout,
+            reuse_context=self.config.llm_reuse_context,
+            max_context_tokens=self.config.llm_max_context_tokens,
+            max_contexts=self.config.llm_max_contexts,
+            keep_alive=self.config.model_keep_alive,
+            default_keep_alive=self.config.default_keep_alive,
+        )
+        self._wire_async_client()
+        try:
+            yield
+        finally:
+            client, self.async_llm_client = self.async_llm_client, None
+            self._wire_async_client()
+            await client.aclose()
+
+    def _wire_async_client(self) -> None:
+        for agent_key in self.config.as_agent_config():
+            agent = getattr(self, f"{agent_key}_agent")
+            agent.async_llm_client = (
+                AsyncInterceptedLLMClient(self.async_llm_client, self._interceptors, agent_key)
+                if self.async_llm_client is not None
+                else None
+            )
+
+    def _start_run(self, task_description: str) -> TaskContext:
         # intake removed: directly build TaskContext
         task_ctx = TaskContext(description=task_description, language=self.config.language)
+        self._open_run(task_ctx)
         self._log_event(EventType.TASK_CREATED, task_ctx.model_dump())
         self.snapshot_writer.write("task", task_ctx.model_dump())
-        plan_ctx = self._plan(task_ctx)
-        reviews: List[ReviewContext] = []
-
-        for idx, step in enumerate(plan_ctx.steps):
-            self.state.active_step_id = step.step_id
-            step_ctx = self._decompose(plan_ctx, idx)
-            research = self._research(task_ctx, plan_ctx, step_ctx)
-            prompt_ctx = self._prompt(task_ctx, step_ctx, plan_ctx, research)
-            exec_request = self._execute(step_ctx, prompt_ctx, research)
-            execution_ctx = self._run_code(step_ctx, plan_ctx, prompt_ctx, exec_request, research)
-            review_ctx = self._review(execution_ctx)
+        return task_ctx
 
-            if review_ctx.decision != ReviewDecision.APPROVED:
-                review_ctx = self._fix_loop(execution_ctx, review_ctx)
+    def _open_run(self, task_ctx: TaskContext) -> None:
+        self.current_run_dir = start_run(self.config.context_log_dir)
+        self.current_task_id = task_ctx.task_id
+        self.telemetry.reset()
+        if hasattr(self.llm_client, "reset_contexts"):
+            self.llm_client.reset_contexts()
+        if hasattr(self.async_llm_client, "reset_contexts"):
+            self.async_llm_client.reset_contexts()
 
-            reviews.append(review_ctx)
-            plan_ctx.current_step_index = idx + 1
-            self.state.reset_fix()
+    def _finish_run(
+        self,
+        task_ctx: TaskContext,
+        plan_ctx: PlanContext,
+        reviews: List[ReviewContext],
+        summary: Dict[str, object],
+    ) -> Dict[str, object]:
+        self._log_event(EventType.RUN_COMPLETED, {"task_id": task_ctx.task_id, "summary": summary})
+        return self._run_result(task_ctx, plan_ctx, reviews, summary)
 
-        summary = self._summarize(task_ctx, plan_ctx, reviews)
-        self._log_event(EventType.RUN_COMPLETED, {"task_id": task_ctx.task_id})
+    def _run_result(
+        self,
+        task_ctx: TaskContext,
+        plan_ctx: PlanContext,
+        reviews: List[ReviewContext],
+        summary: Dict[str, object],
+    ) -> Dict[str, object]:
         return {
             "task": task_ctx.model_dump(),
             "plan": plan_ctx.model_dump(),
             "reviews": [r.model_dump() for r in reviews],
             "summary": summary,
+            "llm_stats": self.telemetry.summary(),
         }
 
-    def _plan(self, task: TaskContext) -> PlanContext:
-        self.state.next(OrchestratorState.PLAN)
-        # Build and log raw prompt for planner
-        planner_prompt = (
-            "Erstelle einen Plan als JSON für die Aufgabe:\n"
-            f"\"{task.description}\"\n"
-            "Antwortformat:\n"
-            '{ "version": "0.1.0", "steps": [ { "title": "", "summary": "" } ] }\n'
+    def _run_step(self, task_ctx: TaskContext, plan_ctx: PlanContext, idx: int) -> ReviewContext:
+        self.state.active_step_id = plan_ctx.steps[idx].step_id
+        with span("step", "step", step_id=self.state.active_step_id), context_scope(self.state.active_step_id):
+            step_ctx, research, prompt_ctx = self._prepare_step(task_ctx, plan_ctx, idx)
+            self._remember_findings(research)
+            return self._finish_step(plan_ctx, step_ctx, research, prompt_ctx)
+
+    async def _run_step_async(self, task_ctx: TaskContext, plan_ctx: PlanContext, idx: int) -> ReviewContext:
+        self.state.active_step_id = plan_ctx.steps[idx].step_id
+        with span("step", "step", step_id=self.state.active_step_id), context_scope(self.state.active_step_id):
+            step_ctx = await self._decompose_async(plan_ctx, idx)
+            research = await self._research_async(task_ctx, plan_ctx, step_ctx)
+            prompt_ctx = await self._prompt_async(task_ctx, step_ctx, plan_ctx, research)
+            self._remember_findings(research)
+            exec_request = await self._execute_async(step_ctx, prompt_ctx, research)
+            execution_ctx = await self._run_code_async(step_ctx, plan_ctx, prompt_ctx, exec_request, research)
+            review_ctx = await self._review_async(execution_ctx)
+
+            if review_ctx.decision != ReviewDecision.APPROVED:
+                review_ctx = await self._fix_loop_async(plan_ctx, step_ctx, execution_ctx, review_ctx)
+            self.state.reset_fix()
+            self._step_completed(research, review_ctx)
+            return review_ctx
+
+    def _prepare_step(
+        self, task_ctx: TaskContext, plan_ctx: PlanContext, idx: int
+    ) -> Tuple[StepContext, List[ResearchFinding], PromptContext]:
+        """LLM stages before execution; findings are not yet added to the research memory."""
+        step_ctx = self._decompose(plan_ctx, idx)
+        research = self._research(task_ctx, plan_ctx, step_ctx)
+        prompt_ctx = self._prompt(task_ctx, step_ctx, plan_ctx, research)
+        return step_ctx, research, prompt_ctx
+
+    def _finish_step(
+        self,
+        plan_ctx: PlanContext,
+        step_ctx: StepContext,
+        research: List[ResearchFinding],
+        prompt_ctx: PromptContext,
+        before_run: Optional[Callable[[], None]] = None,
+    ) -> ReviewContext:
+        exec_request = self._execute(step_ctx, prompt_ctx, research)
+        if before_run is not None:
+            before_run()
+        execution_ctx = self._run_code(step_ctx, plan_ctx, prompt_ctx, exec_request, research)
+        review_ctx = self._review(execution_ctx)
+
+        if review_ctx.decision != ReviewDecision.APPROVED:
+            self._outcome_changed()
+            review_ctx = self._fix_loop(plan_ctx, step_ctx, execution_ctx, review_ctx)
+        self.state.reset_fix()
+        self._step_completed(research, review_ctx)
+        return review_ctx
+
+    def _outcome_changed(self) -> None:
+        with self._memory_lock:
+            self._outcome_version += 1
+
+    def _step_completed(self, research: List[ResearchFinding], review_ctx: ReviewContext) -> None:
+        """Checkpoint a finished step so ``resume`` can skip it."""
+        self._log_event(
+            EventType.STEP_COMPLETED,
+            {
+                "task_id": review_ctx.task_id,
+                "step_id": review_ctx.step_id,
+                "findings": [f.model_dump() for f in research],
+                "review": review_ctx.model_dump(),
+            },
         )
-        raw_prompt = build_prompt("planner", planner_prompt, language=task.language)
-        if hasattr(self, "current_run_dir"):
-            write_raw_context(
-                self.current_run_dir,
-                stage="prompt für Modell planner:",
-                raw=raw_prompt,
-            )
-        result = self.planner_agent.run(PlannerInput(task=task))
+
+    def _remember_findings(self, findings: List[ResearchFinding]) -> None:
+        with self._memory_lock:
+            self.research_memory = getattr(self, "research_memory", []) + findings
+
+    def _speculate(
+        self, task_ctx: TaskContext, plan_ctx: PlanContext, idx: int
+    ) -> Tuple[StepContext, List[ResearchFinding], PromptContext]:
+        """Prepare a step ahead of time on a worker thread with its own state tracker."""
+        self._step_local.state = StateTracker(max_fixes=self._state.max_fixes)
+        self.state.active_step_id = plan_ctx.steps[idx].step_id
+        try:
+            with span("speculate", "step", step_id=self.state.active_step_id), context_scope(self.state.active_step_id):
+                return self._prepare_step(task_ctx, plan_ctx, idx)
+        finally:
+            self._step_local.state = None
+
+    def _run_steps_pipelined(
+        self, task_ctx: TaskContext, plan_ctx: PlanContext, completed: Dict[str, ReviewContext]
+    ) -> List[ReviewContext]:
+        """
+        Run the steps in order, but prepare step N+1 (decompose, research, prompt)
+        on a background thread while step N is executed by pytest and reviewed.
+        The speculative result assumes step N passes its first review; if step N
+        needed a fix instead, it is discarded and the stages are redone.
+        """
+        reviews: List[ReviewContext] = []
+        ahead: Optional[Future] = None
+        launched_at = 0
+        steps = plan_ctx.steps
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            for idx in range(len(steps)):
+                if steps[idx].step_id in completed:
+                    reviews.append(completed[steps[idx].step_id])
+                    plan_ctx.current_step_index = idx + 1
+                    continue
+                self.state.active_step_id = steps[idx].step_id
+                with span("step", "step", step_id=steps[idx].step_id), context_scope(steps[idx].step_id):
+                    prepared = None
+                    if ahead is not None:
+                        try:
+                            prepared = ahead.result()
+                        except Exception:
+                            prepared = None
+                        else:
+                            if launched_at != self._outcome_version:
+                                self._log_event(
+                                    EventType.SPECULATION_DISCARDED,
+                                    {"step_id": steps[idx].step_id, "reason": "previous step needed a fix"},
+                                )
+                                prepared = None
+                        ahead = None
+                    if prepared is None:
+                        prepared = self._prepare_step(task_ctx, plan_ctx, idx)
+                    step_ctx, research, prompt_ctx = prepared
+                    self._remember_findings(research)
+
+                    def start_next(next_idx: int = idx + 1) -> None:
+                        nonlocal ahead, launched_at
+                        if next_idx < len(steps) and steps[next_idx].step_id not in completed:
+                            launched_at = self._outcome_version
+                            ahead = pool.submit(
+                                copy_context().run, self._speculate, task_ctx, plan_ctx, next_idx
+                            )
+
+                    reviews.append(
+                        self._finish_step(plan_ctx, step_ctx, research, prompt_ctx, before_run=start_next)
+                    )
+                plan_ctx.current_step_index = idx + 1
+        return reviews
+
+    def _run_step_isolated(self, task_ctx: TaskContext, plan_ctx: PlanContext, idx: int) -> ReviewContext:
+        """Run a step on a worker thread with its own state tracker."""
+        self._step_local.state = StateTracker(max_fixes=self._state.max_fixes)
+        try:
+            return self._run_step(task_ctx, plan_ctx, idx)
+        finally:
+            self._step_local.state = None
+
+    def _run_steps_parallel(
+        self, task_ctx: TaskContext, plan_ctx: PlanContext, completed: Dict[str, ReviewContext]
+    ) -> List[ReviewContext]:
+        """
+        Execute the plan as a DAG over ``PlanStep.dependencies``: every step whose
+        dependencies are done is started, up to ``max_parallel_steps`` at a time.
+        Reviews are returned in plan order.
+        """
+        steps = plan_ctx.steps
+        position = {step.step_id: idx for idx, step in enumerate(steps)}
+        requires = [
+            {position[dep] for dep in step.dependencies if dep in position} for step in steps
+        ]
+        done: Dict[int, ReviewContext] = {
+            idx: completed[step.step_id] for idx, step in enumerate(steps) if step.step_id in completed
+        }
+        running: Dict[Future, int] = {}
+        with ThreadPoolExecutor(max_workers=self.config.max_parallel_steps) as pool:
+            while len(done) < len(steps):
+                for idx in range(len(steps)):
+                    if idx not in done and idx not in running.values() and requires[idx] <= done.keys():
+                        # copied context: spans of the step nest under the run
+                        future = pool.submit(copy_context().run, self._run_step_isolated, task_ctx, plan_ctx, idx)
+                        running[future] = idx
+                if not running:
+                    raise ValueError("Plan dependencies contain a cycle.")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done[running.pop(future)] = future.result()
+                    plan_ctx.current_step_index = len(done)
+        return [done[idx] for idx in range(len(steps))]
+
+    @traced("plan")
+    def _plan(self, task: TaskContext) -> PlanContext:
+        request = self._plan_input(task)
+        return self._plan_done(self.planner_agent.run(request))
+
+    @traced("plan")
+    async def _plan_async(self, task: TaskContext) -> PlanContext:
+        request = self._plan_input(task)
+        return self._plan_done(await self.planner_agent.run_async(request))
+
+    def _plan_input(self, task: TaskContext) -> PlannerInput:
+        self._enter(OrchestratorState.PLAN)
+        return PlannerInput(task=task)
+
+    def _plan_done(self, result: PlanContext) -> PlanContext:
         self._log_event(EventType.PLAN_CREATED, result.model_dump())
         self.snapshot_writer.write("plan", result.model_dump())
-        if hasattr(self, "current_run_dir"):
-            write_raw_context(
-                self.current_run_dir,
-                stage="output von Modell planner:",
-                raw=json.dumps(result.model_dump(), ensure_ascii=False, indent=2, default=str),
-            )
         self.last_plan = result
         return result
 
+    @traced("decompose")
     def _decompose(self, plan: PlanContext, step_index: int) -> StepContext:
-        self.state.next(OrchestratorState.DECOMPOSE)
+        self._enter(OrchestratorState.DECOMPOSE)
+        self._warm_next(self.research_agent)
         return self.decomposer_agent.run(DecomposerInput(plan=plan, step_index=step_index))
 
+    @traced("decompose")
+    async def _decompose_async(self, plan: PlanContext, step_index: int) -> StepContext:
+        self._enter(OrchestratorState.DECOMPOSE)
+        self._warm_next(self.research_agent)
+        return await self.decomposer_agent.run_async(DecomposerInput(plan=plan, step_index=step_index))
+
+    @traced("research")
     def _research(self, task: TaskContext, plan: PlanContext, step: StepContext) -> List[ResearchFinding]:
-        self.state.next(OrchestratorState.RESEARCH)
-        raw_prompt = build_prompt(
-            "research",
-            (
-                "Sammle fehlende Informationen für den aktuellen Schritt.\n"
-                f"Aufgabe: {task.description}\n"
-                f"Aktueller Schritt: {step.summary}\n"
-                f"Plan-Titel: {[s.title for s in plan.steps]}\n"
-                "Gib JSON zurück im Schema: {\"findings\": [{\"source\": \"string\", \"content\": \"string\"}]}\n"
-                "Wenn keine neuen Infos: gib leere Liste."
-            ),
+        request = self._research_input(task, plan, step)
+        return self._research_done(plan, step, self.research_agent.run(request))
+
+    @traced("research")
+    async def _research_async(
+        self, task: TaskContext, plan: PlanContext, step: StepContext
+    ) -> List[ResearchFinding]:
+        request = self._research_input(task, plan, step)
+        return self._research_done(plan, step, await self.research_agent.run_async(request))
+
+    def _research_input(self, task: TaskContext, plan: PlanContext, step: StepContext) -> ResearchInput:
+        return ResearchInput(
+            task_description=task.description,
+            step_summary=step.summary,
+            plan_titles=[s.title for s in plan.steps],
             language=task.language,
+            prior_findings=list(getattr(self, "research_memory", [])),
         )
-        output = self.research_agent.run(
-            ResearchInput(
-                task_description=task.description,
-                step_summary=step.summary,
-                plan_titles=[s.title for s in plan.steps],
-                language=task.language,
-                prior_findings=getattr(self, "research_memory", []),
-            )
-        )
-        self.research_memory = getattr(self, "research_memory", []) + output.findings
+
+    def _research_done(self, plan: PlanContext, step: StepContext, output: ResearchOutput) -> List[ResearchFinding]:
         if hasattr(self, "current_run_dir"):
-            write_raw_context(
-                self.current_run_dir,
-                stage="prompt für Modell research:",
-                raw=raw_prompt,
-            )
-            write_raw_context(
-                self.current_run_dir,
-                stage="output von Modell research:",
-                raw=json.dumps([f.model_dump() for f in output.findings], ensure_ascii=False, indent=2, default=str),
-            )
             # persist findings for user inspection
             info_path = self.config.user_infos_dir / f"findings_{plan.plan_id}_{step.step_id}.json"
             info_path.write_text(
@@ -212,41 +818,41 @@ class Orchestrator:
             )
         return output.findings
 
+    @traced("prompt")
     def _prompt(self, task: TaskContext, step: StepContext, plan: PlanContext, findings: List[ResearchFinding]) -> PromptContext:
-        self.state.next(OrchestratorState.PROMPT_BUILD)
+        self._enter(OrchestratorState.PROMPT_BUILD)
         prompter_input = PrompterInput(task=task, step=step, plan=plan, findings=findings)
-        prompt = self.prompter_agent.run(prompter_input)
-        if hasattr(self, "current_run_dir"):
-            raw_prompt = build_prompt(
-                "prompter",
-                (
-                    f"Erzeuge JSON mit Prompt und optional tool_hints für diesen Schritt:\n"
-                    f"Step: {step.summary}\n"
-                    f"Plan: {[s.title for s in plan.steps]}\n"
-                    f"Funde: {[f.content for f in findings]}"
-                ),
-                language=task.language,
-            )
-            write_raw_context(
-                self.current_run_dir,
-                stage="prompt für Modell prompter:",
-                raw=raw_prompt,
-            )
-            write_raw_context(
-                self.current_run_dir,
-                stage="output von Modell prompter:",
-                raw=json.dumps(prompt.model_dump(), ensure_ascii=False, indent=2, default=str),
-            )
-        return prompt
+        return self.prompter_agent.run(prompter_input)
 
+    @traced("prompt")
+    async def _prompt_async(
+        self, task: TaskContext, step: StepContext, plan: PlanContext, findings: List[ResearchFinding]
+    ) -> PromptContext:
+        self._enter(OrchestratorState.PROMPT_BUILD)
+        prompter_input = PrompterInput(task=task, step=step, plan=plan, findings=findings)
+        return await self.prompter_agent.run_async(prompter_input)
+
+    @traced("execute")
     def _execute(self, step: StepContext, prompt: PromptContext, findings: List[ResearchFinding]) -> ExecutionRequest:
-        self.state.next(OrchestratorState.EXECUTE)
+        self._enter(OrchestratorState.EXECUTE)
         exec_request = self.executor_agent.run(
             ExecutorInput(step=step, prompt=prompt, findings=findings)
         )
         exec_request.working_dir = self.config.tool_dir
         return exec_request
 
+    @traced("execute")
+    async def _execute_async(
+        self, step: StepContext, prompt: PromptContext, findings: List[ResearchFinding]
+    ) -> ExecutionRequest:
+        self._enter(OrchestratorState.EXECUTE)
+        exec_request = await self.executor_agent.run_async(
+            ExecutorInput(step=step, prompt=prompt, findings=findings)
+        )
+        exec_request.working_dir = self.config.tool_dir
+        return exec_request
+
+    @traced("run_code")
     def _run_code(
         self,
         step: StepContext,
@@ -255,8 +861,38 @@ class Orchestrator:
         request: ExecutionRequest,
         findings: List[ResearchFinding],
     ) -> ExecutionContext:
-        self.state.next(OrchestratorState.RUN_CODE)
-        result = self.runner.run(request)
+        self._enter(OrchestratorState.RUN_CODE)
+        self._warm_next(self.reviewer_agent)
+        result = self._run_tests(request)
+        return self._run_code_done(step, plan, prompt, request, findings, result)
+
+    @traced("run_code")
+    async def _run_code_async(
+        self,
+        step: StepContext,
+        plan: PlanContext,
+        prompt: PromptContext,
+        request: ExecutionRequest,
+        findings: List[ResearchFinding],
+    ) -> ExecutionContext:
+        self._enter(OrchestratorState.RUN_CODE)
+        self._warm_next(self.reviewer_agent)
+        run_async = getattr(self.runner, "run_async", None)
+        if run_async is not None:
+            result = await run_async(request)
+        else:
+            result = await asyncio.to_thread(self._run_tests, request)
+        return self._run_code_done(step, plan, prompt, request, findings, result)
+
+    def _run_code_done(
+        self,
+        step: StepContext,
+        plan: PlanContext,
+        prompt: PromptContext,
+        request: ExecutionRequest,
+        findings: List[ResearchFinding],
+        result: ExecutionResult,
+    ) -> ExecutionContext:
         context = ExecutionContext(
             step_id=step.step_id,
             plan_id=plan.plan_id,
@@ -271,125 +907,202 @@ class Orchestrator:
             "status": result.status.value,
             "stdout": result.stdout,
             "stderr": result.stderr,
+            "test_report": {node: case.model_dump() for node, case in result.test_report.items()},
         }
         event_type = EventType.STEP_EXECUTED if result.status.value == "PASSED" else EventType.TEST_FAILED
         self._log_event(event_type, payload)
-        self.snapshot_writer.write("execution", context.model_dump())
-        if hasattr(self, "current_run_dir"):
-            write_raw_context(
-                self.current_run_dir,
-                stage="prompt für Modell executor:",
-                raw=prompt.prompt,
-            )
-            write_raw_context(
-                self.current_run_dir,
-                stage="output von Modell executor (request):",
-                raw=json.dumps(request.model_dump(), ensure_ascii=False, indent=2, default=str),
-            )
+        step_no = next(i for i, s in enumerate(plan.steps, start=1) if s.step_id == step.step_id)
+        self.snapshot_writer.write(f"execution_step{step_no:02d}", context.model_dump())
         return context
 
+    @traced("review")
     def _review(self, execution: ExecutionContext) -> ReviewContext:
-        self.state.next(OrchestratorState.REVIEW)
-        if hasattr(self, "current_run_dir"):
-            review_prompt = build_prompt(
-                "reviewer",
-                (
-                    "Analysiere Testergebnisse und gib Empfehlungen als JSON.\n"
-                    f"stdout:\n{execution.result.stdout}\n"
-                    f"stderr:\n{execution.result.stderr}\n"
-                    'Schema: { "recommendations": ["string"] }'
-                ),
-                language=execution.prompt.language,
-                    )
-            write_raw_context(
-                self.current_run_dir,
-                stage="prompt für Modell reviewer:",
-                raw=review_prompt,
-            )
-        review_ctx = self.reviewer_agent.run(ReviewerInput(execution=execution))
-        if hasattr(self, "current_run_dir"):
-            write_raw_context(
-                self.current_run_dir,
-                stage="output von Modell reviewer:",
-                raw=json.dumps(review_ctx.model_dump(), ensure_ascii=False, indent=2, default=str),
-            )
-        return review_ctx
+        request = self._review_input(execution)
+        return self.reviewer_agent.run(request)
+
+    @traced("review")
+    async def _review_async(self, execution: ExecutionContext) -> ReviewContext:
+        request = self._review_input(execution)
+        return await self.reviewer_agent.run_async(request)
 
-    def _fix_loop(self, execution: ExecutionContext, review: ReviewContext) -> ReviewContext:
-        self.state.next(OrchestratorState.FIX)
+    def _review_input(self, execution: ExecutionContext) -> ReviewerInput:
+        self._enter(OrchestratorState.REVIEW)
+        return ReviewerInput(execution=execution)
+
+    @traced("fix_loop")
+    def _fix_loop(
+        self, plan: PlanContext, step: StepContext, execution: ExecutionContext, review: ReviewContext
+    ) -> ReviewContext:
+        """
+        Up to ``max_fixes`` rounds of: fix manager proposes, executor patches code and
+        tests, only the failing tests are re-run in the same run directory, review.
+        """
         while self.state.fix_attempts < self.state.max_fixes and review.decision != ReviewDecision.APPROVED:
-            self.state.increment_fix()
-            if hasattr(self, "current_run_dir"):
-                fix_prompt = build_prompt(
-                    "fix_manager",
-                    (
-                        "Schlage konkrete Fix-Schritte als JSON vor.\n"
-                        f"Issues: {[i.detail for i in review.issues]}\n"
-                        'Schema: { "change_summary": ["string"], "retry": true }'
-                    ),
-                    language=execution.prompt.language,
-                )
-                write_raw_context(
-                    self.current_run_dir,
-                    stage="prompt für Modell fix_manager:",
-                    raw=fix_prompt,
-                )
-            fix_instr = self.fix_manager_agent.run(FixManagerInput(review=review, execution=execution))
-            if hasattr(self, "current_run_dir"):
-                write_raw_context(
-                    self.current_run_dir,
-                    stage="output von Modell fix_manager:",
-                    raw=json.dumps(fix_instr.model_dump(), ensure_ascii=False, indent=2, default=str),
-                )
-            # For now we do not auto-apply fixes; they are recorded and the loop stops.
+            self._enter(OrchestratorState.FIX)
+            fix_instr = self.fix_manager_agent.run(self._fix_input(execution, review))
+            if not self._fix_done(execution, fix_instr):
+                return review
+            self._enter(OrchestratorState.EXECUTE)
+            request = self.executor_agent.run(self._fix_execute_input(step, execution, fix_instr))
+            request.working_dir = self.config.tool_dir
+            self._enter(OrchestratorState.RUN_CODE)
+            result = self._run_tests(request, execution.result)
+            execution = self._fix_applied(plan, step, execution, request, result, fix_instr)
+            review = self._review(execution)
+        self._fix_exhausted(execution, review)
+        return review
+
+    @traced("fix_loop")
+    async def _fix_loop_async(
+        self, plan: PlanContext, step: StepContext, execution: ExecutionContext, review: ReviewContext
+    ) -> ReviewContext:
+        while self.state.fix_attempts < self.state.max_fixes and review.decision != ReviewDecision.APPROVED:
+            self._enter(OrchestratorState.FIX)
+            fix_instr = await self.fix_manager_agent.run_async(self._fix_input(execution, review))
+            if not self._fix_done(execution, fix_instr):
+                return review
+            self._enter(OrchestratorState.EXECUTE)
+            request = await self.executor_agent.run_async(self._fix_execute_input(step, execution, fix_instr))
+            request.working_dir = self.config.tool_dir
+            self._enter(OrchestratorState.RUN_CODE)
+            rerun_async = getattr(self.runner, "rerun_async", None)
+            if rerun_async is not None:
+                result = await rerun_async(request, execution.result)
+            else:
+                result = await asyncio.to_thread(self._run_tests, request, execution.result)
+            execution = self._fix_applied(plan, step, execution, request, result, fix_instr)
+            review = await self._review_async(execution)
+        self._fix_exhausted(execution, review)
+        return review
+
+    def _fix_input(self, execution: ExecutionContext, review: ReviewContext) -> FixManagerInput:
+        self.state.increment_fix()
+        return FixManagerInput(review=review, execution=execution)
+
+    def _fix_done(self, execution: ExecutionContext, fix_instr: FixInstruction) -> bool:
+        """False (and logged) when the fix manager advises against a retry."""
+        if fix_instr.retry:
+            return True
+        self._log_event(
+            EventType.ERROR_ABORTED,
+            {
+                "step_id": execution.step_id,
+                "reason": "Fix manager declined retry",
+                "attempt": self.state.fix_attempts,
+                "fix": fix_instr.model_dump(),
+            },
+        )
+        return False
+
+    def _fix_execute_input(
+        self, step: StepContext, execution: ExecutionContext, fix_instr: FixInstruction
+    ) -> ExecutorInput:
+        failure = compact_report(execution.result)
+        return ExecutorInput(
+            step=step,
+            prompt=execution.prompt,
+            findings=execution.research_findings,
+            previous=execution.request,
+            fix=fix_instr,
+            failure=failure,
+        )
+
+    def _fix_applied(
+        self,
+        plan: PlanContext,
+        step: StepContext,
+        execution: ExecutionContext,
+        request: ExecutionRequest,
+        result: ExecutionResult,
+        fix_instr: FixInstruction,
+    ) -> ExecutionContext:
+        self._outcome_changed()
+        self._log_event(
+            EventType.FIX_APPLIED,
+            {
+                "step_id": step.step_id,
+                "attempt": self.state.fix_attempts,
+                "fix": fix_instr.model_dump(),
+                "rerun_tests": failing_tests(execution.result),
+                "status": result.status.value,
+            },
+        )
+        return self._run_code_done(step, plan, execution.prompt, request, execution.research_findings, result)
+
+    def _fix_exhausted(self, execution: ExecutionContext, review: ReviewContext) -> None:
+        if review.decision != ReviewDecision.APPROVED:
             self._log_event(
                 EventType.ERROR_ABORTED,
                 {
                     "step_id": execution.step_id,
-                    "reason": "Auto-fix not applied",
+                    "reason": "Fix attempts exhausted",
                     "attempt": self.state.fix_attempts,
-                    "fix": fix_instr.model_dump(),
                 },
             )
-            break
-        return review
 
+    @traced("summarize")
     def _summarize(
         self, task: TaskContext, plan: PlanContext, reviews: List[ReviewContext]
     ) -> Dict[str, object]:
-        self.state.next(OrchestratorState.SUMMARIZE)
-        if hasattr(self, "current_run_dir"):
-            summarize_prompt = build_prompt(
-                "summarizer",
-                (
-                    "Fasse den Run als JSON zusammen. Schema: {\"summary\":\"string\"}.\n"
-                    f"Task: {task.description}\n"
-                    f"Plan: {[s.title for s in plan.steps]}\n"
-                    f"Reviews: {[r.decision.value for r in reviews]}"
-                ),
-                language=task.language,
-            )
-            write_raw_context(
-                self.current_run_dir,
-                stage="prompt für Modell summarizer:",
-                raw=summarize_prompt,
-            )
-        summary = self.summarizer_agent.run(
-            SummarizerInput(task=task, plan=plan, reviews=reviews, memory=self.memory)
-        )
+        request = self._summarize_input(task, plan, reviews)
+        return self._summarize_done(self.summarizer_agent.run(request))
+
+    @traced("summarize")
+    async def _summarize_async(
+        self, task: TaskContext, plan: PlanContext, reviews: List[ReviewContext]
+    ) -> Dict[str, object]:
+        request = self._summarize_input(task, plan, reviews)
+        return self._summarize_done(await self.summarizer_agent.run_async(request))
+
+    def _summarize_input(
+        self, task: TaskContext, plan: PlanContext, reviews: List[ReviewContext]
+    ) -> SummarizerInput:
+        self._enter(OrchestratorState.SUMMARIZE)
+        return SummarizerInput(task=task, plan=plan, reviews=reviews, memory=self.memory)
+
+    def _summarize_done(self, summary: SummaryOutput) -> Dict[str, object]:
         self.memory = summary.memory
         self.snapshot_writer.write("summary", summary.model_dump())
-        if hasattr(self, "current_run_dir"):
-            write_raw_context(
-                self.current_run_dir,
-                stage="output von Modell summarizer:",
-                raw=json.dumps(summary.model_dump(), ensure_ascii=False, indent=2, default=str),
-            )
         return summary.model_dump()
 
+    def _on_llm_stats(self, agent_name: str, stats: LLMCallStats) -> None:
+        self.telemetry.record(agent_name, stats)
+        self._last_model = stats.model
+        self._log_event(
+            EventType.LLM_CALL,
+            {
+                "agent": agent_name,
+                "task_id": getattr(self, "current_task_id", None),
+                "step_id": self.state.active_step_id,
+                "state": self.state.current.value,
+                **stats.model_dump(),
+            },
+        )
+
+    def _on_field(self, agent_name: str, key: str, value: Any) -> None:
+        """
+        Report a field as soon as the streamed answer completes it. Not stored: the
+        whole answer follows in the context log once the call is done.
+        """
+        if self.on_event:
+            try:
+                self.on_event(
+                    EventType.FIELD_PARSED.value,
+                    {"agent": agent_name, "step_id": self.state.active_step_id, "field": key, "value": value},
+                )
+            except Exception:
+                pass
+
     def _log_event(self, event_type: EventType, payload: Dict[str, object]) -> None:
         event = EventRecord(event_type=event_type, payload=payload)
-        self.event_store.append(event)
+        loop = _running_loop() if _ASYNC_RUN.get() else None
+        if loop is not None:
+            # inside run_async: write in the background, run_async awaits it at the end
+            write = loop.create_task(self.event_store.append_async(event))
+            self._pending_writes.add(write)
+            write.add_done_callback(self._pending_writes.discard)
+        else:
+            self.event_store.append(event)
         if self.on_event:
             try:
                 self.on_event(event_type.value, payload)
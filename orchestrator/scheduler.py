@@ -0,0 +1,218 @@
+"""
+Task scheduler running many orchestrator tasks on a worker pool.
+
+Tasks are taken by priority (lower value first); within a priority the owner
+with the fewest started tasks goes next, then submission order, so one owner
+cannot starve the others. All workers share one LLM client and one runner
+whose concurrency is capped: LLM calls per model and pytest subprocesses.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from config.config import AppConfig, resolve_paths
+from context.cancellation import CancelToken
+from context.models import ExecutionRequest, ExecutionResult
+from orchestrator.orchestrator import (
+    Orchestrator,
+    build_llm_cache,
+    build_llm_client,
+    build_runner,
+)
+
+
+class CappedLLMClient:
+    """Wraps an LLM client so at most ``per_model`` calls per model run at once."""
+
+    def __init__(self, client: Any, per_model: int) -> None:
+        self.client = client
+        self.per_model = per_model
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, model: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if model not in self._slots:
+                self._slots[model] = threading.BoundedSemaphore(self.per_model)
+            return self._slots[model]
+
+    def generate_json(self, model: str, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        slot = self._slot(model)
+        cancel_token: Optional[CancelToken] = kwargs.get("cancel_token")
+        # a cancelled run stops waiting for a free slot
+        while not slot.acquire(timeout=0.2 if cancel_token is not None else None):
+            cancel_token.raise_if_cancelled()
+        try:
+            return self.client.generate_json(model, prompt, **kwargs)
+        finally:
+            slot.release()
+
+    def reset_contexts(self) -> None:
+        # the client is shared: one run starting must not drop the reused contexts
+        # of runs in flight; old chains go by the client's LRU bound instead
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        # preload, list_models, ... pass through uncapped
+        return getattr(self.client, name)
+
+
+class CappedRunner:
+    """Wraps a runner so at most ``max_processes`` pytest runs execute at once."""
+
+    def __init__(self, runner: Any, max_processes: int) -> None:
+        self.runner = runner
+        self._slots = threading.BoundedSemaphore(max_processes)
+
+    def run(self, request: ExecutionRequest, **kwargs: Any) -> ExecutionResult:
+        with self._slots:
+            return self.runner.run(request, **kwargs)
+
+    def rerun(self, request: ExecutionRequest, previous: ExecutionResult, **kwargs: Any) -> ExecutionResult:
+        with self._slots:
+            rerun = getattr(self.runner, "rerun", None)
+            return rerun(request, previous, **kwargs) if rerun else self.runner.run(request, **kwargs)
+
+
+# (kind, name, data): ("event", event_type, payload) or ("stream", agent, chunk)
+ProgressListener = Callable[[str, str, Any], None]
+
+
+class ScheduledTask(BaseModel):
+    description: str
+    priority: int = Field(default=0)
+    owner: str = Field(default="default")
+    sequence: int = Field(default=0)
+
+
+class TaskScheduler:
+    def __init__(
+        self,
+        config: AppConfig,
+        workers: Optional[int] = None,
+        llm_client: Any = None,
+        runner: Any = None,
+        orchestrator_factory: Optional[Callable[[Any, Any], Orchestrator]] = None,
+    ) -> None:
+        """
+        ``orchestrator_factory`` receives the shared (capped) LLM client and runner
+        and returns a fresh ``Orchestrator`` using them; every worker gets its own,
+        since an orchestrator holds per-run state.
+        """
+        self.config = resolve_paths(config)
+        self.workers = workers or self.config.scheduler_workers
+        base_client = llm_client or build_llm_client(self.config, build_llm_cache(self.config))
+        self.llm_client = CappedLLMClient(base_client, self.config.llm_calls_per_model)
+        base_runner = runner or build_runner(self.config)
+        self.runner = CappedRunner(base_runner, self.config.max_pytest_processes)
+        self.orchestrator_factory = orchestrator_factory or (
+            lambda client, runner: Orchestrator(self.config, llm_client=client, runner=runner)
+        )
+        self._pending: List[Tuple[ScheduledTask, Future, Optional[ProgressListener], Optional[CancelToken]]] = []
+        self._started: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        for idx in range(self.workers):
+            orchestrator = self.orchestrator_factory(self.llm_client, self.runner)
+            thread = threading.Thread(
+                target=self._work, args=(orchestrator,), name=f"task-worker-{idx}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(
+        self,
+        description: str,
+        priority: int = 0,
+        owner: str = "default",
+        progress: Optional[ProgressListener] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Future:
+        """
+        Queue a task; the future resolves to the ``Orchestrator.run`` result.
+        ``progress`` receives the task's events and stream chunks while it runs.
+        ``cancel_token`` stops the task once it is running (``Future.cancel`` only
+        works while it is queued); the future then fails with ``RunCancelled``.
+        """
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler is shut down.")
+            task = ScheduledTask(
+                description=description,
+                priority=priority,
+                owner=owner,
+                sequence=next(self._sequence),
+            )
+            self._pending.append((task, future, progress, cancel_token))
+            self._cond.notify()
+        return future
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        with self._cond:
+            self._closed = True
+            if cancel_pending:
+                for _, future, _, _ in self._pending:
+                    future.cancel()
+                self._pending.clear()
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _next(
+        self,
+    ) -> Optional[Tuple[ScheduledTask, Future, Optional[ProgressListener], Optional[CancelToken]]]:
+        with self._cond:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            entry = min(
+                self._pending,
+                key=lambda item: (
+                    item[0].priority,
+                    self._started.get(item[0].owner, 0),
+                    item[0].sequence,
+                ),
+            )
+            self._pending.remove(entry)
+            owner = entry[0].owner
+            self._started[owner] = self._started.get(owner, 0) + 1
+            return entry
+
+    def _work(self, orchestrator: Orchestrator) -> None:
+        while True:
+            entry = self._next()
+            if entry is None:
+                return
+            task, future, progress, cancel_token = entry
+            if not future.set_running_or_notify_cancel():
+                continue
+            if progress is not None:
+                orchestrator.on_event = lambda name, payload: progress("event", name, payload)
+                orchestrator.set_stream_callback(lambda agent, chunk: progress("stream", agent, chunk))
+            try:
+                future.set_result(orchestrator.run(task.description, cancel_token=cancel_token))
+            except BaseException as exc:
+                future.set_exception(exc)
+            finally:
+                if progress is not None:
+                    orchestrator.on_event = None
+                    orchestrator.set_stream_callback(None)
@@ -0,0 +1,242 @@
+"""
+Long-lived local HTTP service around a ``TaskScheduler``.
+
+Orchestrators, loaded models and caches stay resident between tasks. Endpoints:
+
+- ``POST /tasks`` with ``{"description", "priority"?, "owner"?}`` -> ``{"id"}``
+- ``GET /tasks/<id>``: status, and the result once finished
+- ``GET /tasks/<id>/events``: server-sent events (``event``/``stream`` progress,
+  then ``end`` with the final status); earlier progress is replayed first
+- ``DELETE /tasks/<id>``: cancel a task; a running one is stopped (LLM stream
+  closed, pytest killed) and ends as ``cancelled``
+- ``GET /health``
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import uuid4
+
+from config.config import AppConfig
+from context.cancellation import CancelToken, RunCancelled
+from orchestrator.scheduler import TaskScheduler
+
+
+class TaskRecord:
+    def __init__(self, task_id: str, description: str) -> None:
+        self.task_id = task_id
+        self.description = description
+        self.future: Optional[Future] = None
+        self.cancel_token = CancelToken()
+        self.progress: List[Tuple[str, str, Any]] = []
+        self.cond = threading.Condition()
+
+    def add_progress(self, kind: str, name: str, data: Any) -> None:
+        with self.cond:
+            self.progress.append((kind, name, data))
+            self.cond.notify_all()
+
+    def finished(self, _future: Future) -> None:
+        with self.cond:
+            self.cond.notify_all()
+
+    @property
+    def status(self) -> str:
+        future = self.future
+        if future is None or not (future.running() or future.done()):
+            return "queued"
+        if future.running():
+            return "running"
+        if future.cancelled() or isinstance(future.exception(), RunCancelled):
+            return "cancelled"
+        return "failed" if future.exception() is not None else "done"
+
+    def snapshot(self) -> Dict[str, Any]:
+        status = self.status
+        data: Dict[str, Any] = {"id": self.task_id, "description": self.description, "status": status}
+        if status == "done":
+            data["result"] = self.future.result()
+        elif status == "failed":
+            exc = self.future.exception()
+            data["error"] = f"{type(exc).__name__}: {exc}"
+        return data
+
+
+class OrchestratorService:
+    def __init__(
+        self,
+        config: AppConfig,
+        scheduler: Optional[TaskScheduler] = None,
+        max_records: int = 500,
+    ) -> None:
+        self.scheduler = scheduler or TaskScheduler(config)
+        self.max_records = max_records
+        self._records: "OrderedDict[str, TaskRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.scheduler.start()
+
+    def stop(self) -> None:
+        self.scheduler.shutdown(wait=True, cancel_pending=True)
+
+    def submit(self, description: str, priority: int = 0, owner: str = "default") -> str:
+        record = TaskRecord(str(uuid4()), description)
+        record.future = self.scheduler.submit(
+            description,
+            priority=priority,
+            owner=owner,
+            progress=record.add_progress,
+            cancel_token=record.cancel_token,
+        )
+        record.future.add_done_callback(record.finished)
+        with self._lock:
+            self._records[record.task_id] = record
+            self._prune()
+        return record.task_id
+
+    def get(self, task_id: str) -> Optional[TaskRecord]:
+        with self._lock:
+            return self._records.get(task_id)
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a queued or running task; False once it has finished."""
+        record = self.get(task_id)
+        if record is None or record.future is None or record.future.done():
+            return False
+        if not record.future.cancel():
+            record.cancel_token.cancel("cancelled via API")
+        return True
+
+    def events(self, task_id: str, keepalive: float = 15.0) -> Iterator[Optional[Tuple[str, str, Any]]]:
+        """Yield progress from the start until the task ends; None is a keep-alive tick."""
+        record = self.get(task_id)
+        if record is None:
+            return
+        sent = 0
+        while True:
+            with record.cond:
+                if sent == len(record.progress) and not record.future.done():
+                    record.cond.wait(keepalive)
+                items = record.progress[sent:]
+                done = record.future.done()
+            if not items and not done:
+                yield None
+            for item in items:
+                yield item
+            sent += len(items)
+            if done and sent == len(record.progress):
+                return
+
+    def _prune(self) -> None:
+        """Forget the oldest finished tasks beyond ``max_records``."""
+        finished = [key for key, rec in self._records.items() if rec.future and rec.future.done()]
+        for key in finished[: max(0, len(self._records) - self.max_records)]:
+            del self._records[key]
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service: OrchestratorService
+
+    def do_GET(self) -> None:
+        parts = self._parts()
+        if parts == ["health"]:
+            self._json(200, {"status": "ok", "pending": self.service.scheduler.pending()})
+        elif len(parts) == 2 and parts[0] == "tasks":
+            record = self.service.get(parts[1])
+            if record is None:
+                self._json(404, {"error": "unknown task"})
+            else:
+                self._json(200, record.snapshot())
+        elif len(parts) == 3 and parts[0] == "tasks" and parts[2] == "events":
+            self._stream(parts[1])
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if self._parts() != ["tasks"]:
+            self._json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            description = body["description"]
+            task_id = self.service.submit(
+                description,
+                priority=int(body.get("priority", 0)),
+                owner=str(body.get("owner", "default")),
+            )
+        except (KeyError, ValueError, TypeError) as exc:
+            self._json(400, {"error": f"invalid request: {exc}"})
+            return
+        self._json(202, {"id": task_id})
+
+    def do_DELETE(self) -> None:
+        parts = self._parts()
+        if len(parts) != 2 or parts[0] != "tasks" or self.service.get(parts[1]) is None:
+            self._json(404, {"error": "unknown task"})
+            return
+        cancelled = self.service.cancel(parts[1])
+        self._json(200 if cancelled else 409, {"id": parts[1], "cancelled": cancelled})
+
+    def _stream(self, task_id: str) -> None:
+        if self.service.get(task_id) is None:
+            self._json(404, {"error": "unknown task"})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            for item in self.service.events(task_id):
+                if item is None:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    kind, name, data = item
+                    self._event(kind, {"name": name, "data": data})
+                self.wfile.flush()
+            self._event("end", {"status": self.service.get(task_id).status})
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _event(self, kind: str, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload, ensure_ascii=False, default=str)
+        self.wfile.write(f"event: {kind}\ndata: {data}\n\n".encode("utf-8"))
+
+    def _parts(self) -> List[str]:
+        return [p for p in self.path.split("?", 1)[0].split("/") if p]
+
+    def _json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def make_server(service: OrchestratorService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(config: AppConfig, host: str = "127.0.0.1", port: int = 8765) -> None:
+    service = OrchestratorService(config)
+    service.start()
+    server = make_server(service, host, port)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.stop()
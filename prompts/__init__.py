@@ -56,18 +56,36 @@ SYSTEM_PROMPTS = {
 }
 
 
+class LayeredPrompt(str):
+    """
+    Full prompt text that also keeps its byte-stable prefix (global + role prompt)
+    and the variable suffix, so clients can send the prefix as ``system``.
+    """
+
+    prefix: str
+    suffix: str
+
+    def __new__(cls, prefix: str, suffix: str) -> "LayeredPrompt":
+        obj = super().__new__(cls, f"{prefix}\n\n{suffix}")
+        obj.prefix = prefix
+        obj.suffix = suffix
+        return obj
+
+
 def build_prompt(
     role: str,
     user_prompt: str,
     language: str = "de",
     history: list[tuple[str, str]] | None = None,
     infos: list[str] | None = None,
-) -> str:
-    parts = [
-        f"Systemablauf Übersicht:\n{GLOBAL_SYSTEM_PROMPT}",
-        f"Deine Rolle ({role}):\n{SYSTEM_PROMPTS.get(role, '')}",
-        f"Userinput:\n{user_prompt}",
-    ]
+) -> LayeredPrompt:
+    prefix = "\n\n".join(
+        [
+            f"Systemablauf Übersicht:\n{GLOBAL_SYSTEM_PROMPT}",
+            f"Deine Rolle ({role}):\n{SYSTEM_PROMPTS.get(role, '')}",
+        ]
+    )
+    parts = [f"Userinput:\n{user_prompt}"]
     if history:
         hist_lines = []
         for name, content in history:
@@ -75,4 +93,4 @@ def build_prompt(
         parts.append("Antworten von Modellen:\n" + "\n\n".join(hist_lines))
     if infos:
         parts.append("Wichtige Infos:\n" + "\n".join(infos))
-    return "\n\n".join(parts)
+    return LayeredPrompt(prefix, "\n\n".join(parts))
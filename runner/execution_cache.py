@@ -0,0 +1,102 @@
+"""
+Content-addressed cache for pytest executions.
+
+A run is determined by the generated module, the tests, the selected node ids
+and the environment they run in (interpreter, pytest version, ``USER_DATA_DIR``
+and, opt-in, a fingerprint of the files in it). Repeats of such a run return
+the stored ``ExecutionResult`` instead of starting pytest again. Timed-out runs
+and requests marked ``cacheable=False`` are not stored (see ``SQLiteCache``
+for storage and eviction).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from context.models import ExecutionRequest, ExecutionResult
+from context.sqlite_cache import SQLiteCache, hash_key
+
+
+def _pytest_version() -> str:
+    try:
+        return metadata.version("pytest")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def fingerprint_dir(path: Path) -> str:
+    """Hash relative path, size and mtime of every file below ``path``."""
+    digest = hashlib.sha256()
+    if not path.is_dir():
+        return digest.hexdigest()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = Path(root) / name
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            relative = file_path.relative_to(path).as_posix()
+            digest.update(f"{relative}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ExecutionCache(SQLiteCache):
+    table = "executions"
+    value_column = "result"
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age_seconds: int = 7 * 24 * 3600,
+        fingerprint_data_dir: bool = False,
+    ) -> None:
+        self.fingerprint_data_dir = fingerprint_data_dir
+        self._environment = {
+            "python": sys.version,
+            "executable": sys.executable,
+            "pytest": _pytest_version(),
+        }
+        super().__init__(db_path, max_bytes=max_bytes, max_age_seconds=max_age_seconds)
+
+    def make_key(
+        self,
+        request: ExecutionRequest,
+        targets: Optional[Sequence[str]],
+        data_dir: Path,
+    ) -> str:
+        parts: Dict[str, Any] = {
+            "code": request.code,
+            "tests": request.tests,
+            "targets": list(targets) if targets else None,
+            "data_dir": str(data_dir),
+            **self._environment,
+        }
+        if self.fingerprint_data_dir:
+            parts["data_dir_files"] = fingerprint_dir(Path(data_dir))
+        return hash_key(parts)
+
+    def get(self, key: str) -> Optional[ExecutionResult]:
+        payload = self._fetch(key)
+        result = None
+        if payload is not None:
+            try:
+                result = ExecutionResult.model_validate_json(payload)
+            except ValueError:
+                # stored by an older ExecutionResult layout
+                self.invalidate(key)
+        self._count(result is not None)
+        return result
+
+    def put(self, key: str, result: ExecutionResult) -> None:
+        if result.exit_code is None or result.exit_code < 0:
+            # timed out or killed: not a property of the code
+            return
+        self._put(key, result.model_dump_json())
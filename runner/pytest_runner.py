@@ -2,27 +2,232 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
+import signal
 import subprocess
 import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
-from context.models import ExecutionRequest, ExecutionResult, ExecutionStatus
+from context.cancellation import CancelToken
+from context.models import CaseReport, ExecutionRequest, ExecutionResult, ExecutionStatus
+from context.tracing import span
+from runner import worker_pool
+from runner.execution_cache import ExecutionCache
+from runner.report import FAILING, JUNIT_ARGS, REPORT_FILE, parse_junit_xml, parse_summary
+from runner.run_gc import RUN_PREFIX, RetentionPolicy, RunDirCollector
+from runner.static_gate import DEFAULT_FORBIDDEN, check_request
+from runner.worker_pool import JobTimedOut, PytestWorkerPool, WorkerDied
+
+# pytest exit codes: usage error (e.g. node id no longer exists), no tests collected
+_TARGETS_MISSING = {4, 5}
+# as pytest's "interrupted" (collection errors): the static gate stopped the run
+GATE_EXIT_CODE = 2
+# own process group, so a kill also reaches processes spawned by the tests
+_NEW_GROUP = (
+    {"start_new_session": True}
+    if os.name == "posix"
+    else {"creationflags": getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)}
+)
+
+
+def kill_process_group(proc) -> None:
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def parse_test_report(run_dir: Path, stdout: str) -> Dict[str, CaseReport]:
+    """Per-test results from the run's junit XML, else from the short test summary."""
+    report = parse_junit_xml(run_dir / REPORT_FILE)
+    return report if report is not None else parse_summary(stdout)
+
+
+def failing_tests(result: ExecutionResult) -> List[str]:
+    return [node for node, case in result.test_report.items() if case.outcome in FAILING]
+
+
+def merge_rerun(previous: ExecutionResult, rerun: ExecutionResult) -> ExecutionResult:
+    """
+    Combine a targeted re-run with the run it repeats: outcomes of re-run tests
+    replace the old ones, tests that were not re-run keep theirs. Only a failed
+    merge is conclusive; a passing one still needs a full run.
+    """
+    report = {**previous.test_report, **rerun.test_report}
+    passed = rerun.exit_code == 0 and not any(case.outcome in FAILING for case in report.values())
+    return rerun.model_copy(
+        update={
+            "test_report": report,
+            "status": ExecutionStatus.PASSED if passed else ExecutionStatus.FAILED,
+        }
+    )
 
 
 class PytestRunner:
-    def __init__(self, workspace: Path, timeout_seconds: int = 120, data_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        workspace: Path,
+        timeout_seconds: int = 120,
+        data_dir: Path | None = None,
+        workers: int = 0,
+        cache: Optional[ExecutionCache] = None,
+        staging_dir: Optional[Path] = None,
+        retention: Optional[RetentionPolicy] = None,
+        gc_interval_seconds: float = 300.0,
+        static_gate: bool = True,
+        forbidden_calls: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        ``workers`` > 0 runs tests on that many warm, pre-forked pytest workers
+        (POSIX; started with the first run); otherwise, or if a worker dies,
+        every run is a fresh subprocess. With a ``cache``, repeats of a run
+        (same code, tests, node ids and environment) return the stored result;
+        requests with ``cacheable=False`` always run. ``staging_dir`` (e.g. on a
+        tmpfs) holds new run directories instead of the request's working dir;
+        with a ``retention`` policy a background collector prunes old runs
+        (started with the first run). The ``static_gate`` fails requests that do
+        not compile, import missing ``task_module`` names or call one of
+        ``forbidden_calls`` before anything is written or started.
+        """
         self.workspace = workspace
         self.timeout_seconds = timeout_seconds
         self.workspace.mkdir(parents=True, exist_ok=True)
         self.data_dir = data_dir or workspace
         Path(self.data_dir).mkdir(parents=True, exist_ok=True)
+        self.workers = workers if worker_pool.available() else 0
+        self._pool: Optional[PytestWorkerPool] = None
+        self._pool_lock = threading.Lock()
+        self.cache = cache
+        self.staging_dir = Path(staging_dir) if staging_dir is not None else None
+        self._run_lock = threading.Lock()
+        self._in_use: Dict[Path, int] = {}
+        self.static_gate = static_gate
+        self.forbidden_calls = list(forbidden_calls) if forbidden_calls is not None else list(DEFAULT_FORBIDDEN)
+        self.collector: Optional[RunDirCollector] = None
+        if retention is not None:
+            self.collector = RunDirCollector(
+                self._roots, retention, interval_seconds=gc_interval_seconds, in_use=self._is_in_use
+            )
+
+    @property
+    def pool(self) -> Optional[PytestWorkerPool]:
+        if self.workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = PytestWorkerPool(self.workers)
+            return self._pool
+
+    def _roots(self) -> List[Path]:
+        # only directories the runner owns; a request's working_dir may hold anything
+        return [self.staging_dir or self.workspace]
+
+    def _is_in_use(self, run_dir: Path) -> bool:
+        with self._run_lock:
+            return run_dir in self._in_use
+
+    @contextmanager
+    def _using(self, run_dir: Path) -> Iterator[None]:
+        """Keep the collector away from ``run_dir`` while pytest runs in it."""
+        with self._run_lock:
+            self._in_use[run_dir] = self._in_use.get(run_dir, 0) + 1
+        try:
+            yield
+        finally:
+            with self._run_lock:
+                self._in_use[run_dir] -= 1
+                if not self._in_use[run_dir]:
+                    del self._in_use[run_dir]
+
+    def close(self) -> None:
+        if self.collector is not None:
+            self.collector.stop()
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+    def invalidate_cache(self, request: Optional[ExecutionRequest] = None) -> None:
+        """Drop the cached full-suite run of ``request``, or every cached run."""
+        if self.cache is None:
+            return
+        if request is None:
+            self.cache.clear()
+        else:
+            self.cache.invalidate(self.cache.make_key(request, None, Path(self.data_dir)))
+
+    def _gate(self, request: ExecutionRequest) -> Optional[ExecutionResult]:
+        """A failed result with the static diagnostics, or None if the request may run."""
+        if not self.static_gate:
+            return None
+        with span("static_gate", "check"):
+            issues = check_request(request.code, request.tests, self.forbidden_calls)
+        if not issues:
+            return None
+        return ExecutionResult(
+            status=ExecutionStatus.FAILED,
+            stderr="\n".join(line for found in issues.values() for line in found),
+            exit_code=GATE_EXIT_CODE,
+            test_report={
+                filename: CaseReport(outcome="ERROR", message="\n".join(found))
+                for filename, found in issues.items()
+            },
+        )
+
+    def _cache_key(self, request: ExecutionRequest, targets: Optional[Sequence[str]]) -> Optional[str]:
+        if self.cache is None or not request.cacheable:
+            return None
+        return self.cache.make_key(request, targets, Path(self.data_dir))
+
+    def _cached(
+        self,
+        key: Optional[str],
+        request: ExecutionRequest,
+        run_dir: Optional[Path],
+        targets: Optional[Sequence[str]],
+    ) -> Optional[ExecutionResult]:
+        """
+        The stored result for ``key``, pointing at a run directory that holds this
+        request's files (so a later ``rerun`` can patch it like a real run).
+        """
+        if key is None:
+            return None
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        with span("pytest", "cache", hit=True, targets=len(targets or ())):
+            _, run_dir, _ = self._prepare(request, run_dir, targets)
+        return cached.model_copy(update={"run_dir": run_dir})
 
-    def run(self, request: ExecutionRequest) -> ExecutionResult:
-        run_id = f"run_{uuid4()}"
-        base_dir = Path(request.working_dir) if request.working_dir else self.workspace
-        run_dir = base_dir / run_id
+    def _store(self, key: Optional[str], result: ExecutionResult) -> ExecutionResult:
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    def _prepare(
+        self,
+        request: ExecutionRequest,
+        run_dir: Optional[Path] = None,
+        targets: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[str], Path, Dict[str, str]]:
+        """
+        Write module and tests into a fresh run directory (or overwrite them in
+        ``run_dir``); return command, cwd and env. ``targets`` restricts the run to
+        these node ids.
+        """
+        if self.collector is not None:
+            self.collector.start()
+        if run_dir is None:
+            base_dir = self.staging_dir or (Path(request.working_dir) if request.working_dir else self.workspace)
+            run_dir = base_dir / f"{RUN_PREFIX}{uuid4()}"
         tests_dir = run_dir / "tests"
         run_dir.mkdir(parents=True, exist_ok=True)
         tests_dir.mkdir(parents=True, exist_ok=True)
@@ -32,31 +237,239 @@ class PytestRunner:
 
         code_path.write_text(request.code)
         tests_path.write_text(request.tests)
+        # a report left by an earlier run in this directory must not be read back
+        (run_dir / REPORT_FILE).unlink(missing_ok=True)
 
-        cmd = [sys.executable, "-m", "pytest", "-q", str(tests_dir)]
+        cmd = [sys.executable, "-m", "pytest", *self._pytest_args(run_dir, targets)]
+        env = os.environ.copy()
+        env.update(self._job_env())
+        return cmd, run_dir, env
 
-        result = ExecutionResult(status=ExecutionStatus.RUNNING)
-        try:
-            env = os.environ.copy()
-            env["USER_DATA_DIR"] = str(self.data_dir)
-            proc = subprocess.run(
+    @staticmethod
+    def _pytest_args(run_dir: Path, targets: Optional[Sequence[str]]) -> List[str]:
+        # rootdir = run_dir keeps node ids ("tests/test_task_module.py::test_x") valid for re-runs
+        args = ["-q", "-rA", f"--rootdir={run_dir}", f"--junitxml={run_dir / REPORT_FILE}", *JUNIT_ARGS]
+        return args + (list(targets) if targets else ["tests"])
+
+    def _job_env(self) -> Dict[str, str]:
+        return {"USER_DATA_DIR": str(self.data_dir)}
+
+    @staticmethod
+    def _finished(returncode: int, stdout: str, stderr: str, run_dir: Path) -> ExecutionResult:
+        return ExecutionResult(
+            status=ExecutionStatus.PASSED if returncode == 0 else ExecutionStatus.FAILED,
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=returncode,
+            test_report=parse_test_report(run_dir, stdout),
+            run_dir=run_dir,
+        )
+
+    def _timed_out(self, exc: BaseException, run_dir: Path) -> ExecutionResult:
+        return ExecutionResult(
+            status=ExecutionStatus.FAILED,
+            stderr=f"Timed out after {self.timeout_seconds}s: {exc}",
+            exit_code=-1,
+            run_dir=run_dir,
+        )
+
+    def run(
+        self,
+        request: ExecutionRequest,
+        run_dir: Optional[Path] = None,
+        targets: Optional[Sequence[str]] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> ExecutionResult:
+        """
+        Run the tests of ``request``. Passing the ``run_dir`` of an earlier result
+        patches the files in place; ``targets`` re-runs only those node ids.
+        On timeout, or when ``cancel_token`` fires, the whole pytest process group
+        is killed; cancellation then raises ``RunCancelled``.
+        """
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        gated = self._gate(request)
+        if gated is not None:
+            return gated
+        key = self._cache_key(request, targets)
+        cached = self._cached(key, request, run_dir, targets)
+        if cached is not None:
+            return cached
+        return self._store(key, self._execute(request, run_dir, targets, cancel_token))
+
+    def _execute(
+        self,
+        request: ExecutionRequest,
+        run_dir: Optional[Path],
+        targets: Optional[Sequence[str]],
+        cancel_token: Optional[CancelToken],
+    ) -> ExecutionResult:
+        cmd, run_dir, env = self._prepare(request, run_dir, targets)
+        with self._using(run_dir):
+            return self._spawn(cmd, run_dir, env, targets, cancel_token)
+
+    def _spawn(
+        self,
+        cmd: List[str],
+        run_dir: Path,
+        env: Dict[str, str],
+        targets: Optional[Sequence[str]],
+        cancel_token: Optional[CancelToken],
+    ) -> ExecutionResult:
+        if self.workers > 0:
+            try:
+                return self._run_pooled(run_dir, targets, cancel_token)
+            except WorkerDied:
+                pass  # replaced by the pool; this run falls back to a subprocess
+        with span("pytest", "subprocess", run_dir=run_dir.name, targets=len(targets or ())):
+            proc = subprocess.Popen(
                 cmd,
                 cwd=run_dir,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=self.timeout_seconds,
                 env=env,
+                **_NEW_GROUP,
             )
-            result.exit_code = proc.returncode
-            result.stdout = proc.stdout
-            result.stderr = proc.stderr
-            result.status = (
-                ExecutionStatus.PASSED
-                if proc.returncode == 0
-                else ExecutionStatus.FAILED
+            unregister = cancel_token.on_cancel(lambda: kill_process_group(proc)) if cancel_token else None
+            try:
+                stdout, stderr = proc.communicate(timeout=self.timeout_seconds)
+            except subprocess.TimeoutExpired as exc:
+                kill_process_group(proc)
+                proc.communicate()
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                return self._timed_out(exc, run_dir)
+            except BaseException:
+                kill_process_group(proc)
+                proc.wait()
+                raise
+            finally:
+                if unregister is not None:
+                    unregister()
+            if cancel_token is not None:
+                # killed by the token rather than finished
+                cancel_token.raise_if_cancelled()
+            return self._finished(proc.returncode, stdout, stderr, run_dir)
+
+    def _run_pooled(
+        self, run_dir: Path, targets: Optional[Sequence[str]], cancel_token: Optional[CancelToken]
+    ) -> ExecutionResult:
+        with span("pytest", "worker", run_dir=run_dir.name, targets=len(targets or ())):
+            try:
+                exit_code, stdout, stderr = self.pool.run(
+                    run_dir,
+                    self._pytest_args(run_dir, targets),
+                    self._job_env(),
+                    self.timeout_seconds,
+                    cancel_token,
+                )
+            except JobTimedOut as exc:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                return self._timed_out(exc, run_dir)
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        return self._finished(exit_code, stdout, stderr, run_dir)
+
+    def rerun(
+        self,
+        request: ExecutionRequest,
+        previous: ExecutionResult,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> ExecutionResult:
+        """
+        Patch ``previous``'s run directory with ``request`` and re-run only the tests
+        that failed there. Once those pass, the whole suite runs once more, since
+        the patch may have broken tests that passed before. Without a usable node
+        id list the whole suite runs right away.
+        """
+        targets = failing_tests(previous)
+        if previous.run_dir is None or not targets:
+            return self.run(request, run_dir=previous.run_dir, cancel_token=cancel_token)
+        result = self.run(request, previous.run_dir, targets, cancel_token=cancel_token)
+        if result.exit_code not in _TARGETS_MISSING:
+            merged = merge_rerun(previous, result)
+            if merged.status != ExecutionStatus.PASSED:
+                return merged
+        return self.run(request, run_dir=previous.run_dir, cancel_token=cancel_token)
+
+    async def rerun_async(self, request: ExecutionRequest, previous: ExecutionResult) -> ExecutionResult:
+        targets = failing_tests(previous)
+        if previous.run_dir is None or not targets:
+            return await self.run_async(request, run_dir=previous.run_dir)
+        result = await self.run_async(request, previous.run_dir, targets)
+        if result.exit_code not in _TARGETS_MISSING:
+            merged = merge_rerun(previous, result)
+            if merged.status != ExecutionStatus.PASSED:
+                return merged
+        return await self.run_async(request, run_dir=previous.run_dir)
+
+    async def run_async(
+        self,
+        request: ExecutionRequest,
+        run_dir: Optional[Path] = None,
+        targets: Optional[Sequence[str]] = None,
+    ) -> ExecutionResult:
+        """
+        Awaitable ``run`` on an asyncio subprocess (or a pool worker). The pytest
+        process group is killed on timeout and when the awaiting task is cancelled.
+        """
+        gated = self._gate(request)
+        if gated is not None:
+            return gated
+        key = self._cache_key(request, targets)
+        cached = self._cached(key, request, run_dir, targets)
+        if cached is not None:
+            return cached
+        return self._store(key, await self._execute_async(request, run_dir, targets))
+
+    async def _execute_async(
+        self,
+        request: ExecutionRequest,
+        run_dir: Optional[Path],
+        targets: Optional[Sequence[str]],
+    ) -> ExecutionResult:
+        if self.workers > 0:
+            token = CancelToken()
+            try:
+                return await asyncio.to_thread(self._execute, request, run_dir, targets, token)
+            except asyncio.CancelledError:
+                token.cancel()
+                raise
+        cmd, run_dir, env = self._prepare(request, run_dir, targets)
+        with self._using(run_dir):
+            return await self._spawn_async(cmd, run_dir, env, targets)
+
+    async def _spawn_async(
+        self,
+        cmd: List[str],
+        run_dir: Path,
+        env: Dict[str, str],
+        targets: Optional[Sequence[str]],
+    ) -> ExecutionResult:
+        with span("pytest", "subprocess", run_dir=run_dir.name, targets=len(targets or ())):
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=run_dir,
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **_NEW_GROUP,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), self.timeout_seconds)
+            except asyncio.TimeoutError as exc:
+                kill_process_group(proc)
+                await proc.wait()
+                return self._timed_out(exc, run_dir)
+            except asyncio.CancelledError:
+                kill_process_group(proc)
+                await proc.wait()
+                raise
+            return self._finished(
+                proc.returncode,
+                stdout.decode(errors="replace"),
+                stderr.decode(errors="replace"),
+                run_dir,
             )
-        except subprocess.TimeoutExpired as exc:
-            result.status = ExecutionStatus.FAILED
-            result.stderr = f"Timed out after {self.timeout_seconds}s: {exc}"
-            result.exit_code = -1
-        return result
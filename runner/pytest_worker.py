@@ -0,0 +1,111 @@
+"""
+Warm pytest worker process (POSIX), started by ``PytestWorkerPool``.
+
+Imports pytest and its plugins once, then serves jobs read from stdin, one JSON
+object per line: ``{"run_dir", "args", "env"}``. Each job runs in a forked
+child (own session, cwd ``run_dir``, output in temporary files), so generated
+code never loads into the worker itself. Replies on stdout, one JSON line each:
+``{"ready": true}`` once warm, then per job ``{"pid"}`` when the child started
+and ``{"exit_code", "stdout", "stderr"}`` when it ended (negative exit code:
+killed by that signal).
+
+Runs as a plain script; it imports nothing from this project.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import traceback
+from typing import Any, Dict
+
+# pytest: internal error
+_INTERNAL_ERROR = 3
+
+
+def _warm() -> None:
+    import pytest  # noqa: F401
+    from importlib.metadata import entry_points
+
+    for entry in entry_points(group="pytest11"):
+        try:
+            entry.load()
+        except Exception:
+            continue
+
+
+def _reply(message: Dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def _child(job: Dict[str, Any], out_path: str, err_path: str) -> None:
+    code = _INTERNAL_ERROR
+    try:
+        os.setsid()
+        os.chdir(job["run_dir"])
+        os.environ.update(job.get("env") or {})
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.close(devnull)
+        for fd, path in ((1, out_path), (2, err_path)):
+            target = os.open(path, os.O_WRONLY | os.O_TRUNC)
+            os.dup2(target, fd)
+            os.close(target)
+        # as with "python -m pytest": the run directory is importable
+        sys.path.insert(0, job["run_dir"])
+        sys.argv = ["pytest", *job["args"]]
+        import pytest
+
+        code = int(pytest.main(list(job["args"])))
+    except SystemExit as exc:
+        code = exc.code if isinstance(exc.code, int) else _INTERNAL_ERROR
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            return handle.read()
+    finally:
+        os.unlink(path)
+
+
+def main() -> None:
+    _warm()
+    _reply({"ready": True})
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        out_fd, out_path = tempfile.mkstemp(prefix="pytest-out-")
+        err_fd, err_path = tempfile.mkstemp(prefix="pytest-err-")
+        os.close(out_fd)
+        os.close(err_fd)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            _child(job, out_path, err_path)
+        _reply({"pid": pid})
+        _, status = os.waitpid(pid, 0)
+        _reply(
+            {
+                "exit_code": os.waitstatus_to_exitcode(status),
+                "stdout": _read(out_path),
+                "stderr": _read(err_path),
+            }
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Machine-readable pytest results.
+
+The runner has pytest write a junit XML report (``xunit1`` family, which keeps
+the test file per case) and turns it into ``ExecutionResult.test_report``: node
+id -> outcome, duration and a truncated failure message. ``compact_report``
+renders that report for prompts instead of the raw pytest output.
+"""
+
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from context.models import CaseReport, ExecutionResult
+
+REPORT_FILE = "pytest_report.xml"
+# pytest options that produce it
+JUNIT_ARGS = ["-o", "junit_family=xunit1", "-o", "junit_logging=no"]
+
+MESSAGE_CHARS = 500
+FAILING = {"FAILED", "ERROR"}
+
+# "-rA" short summary lines, e.g. "FAILED tests/test_task_module.py::test_x - AssertionError"
+_SUMMARY_LINE = re.compile(r"^(PASSED|FAILED|ERROR|XFAIL|XPASS) (\S+?)(?: - (.*))?$")
+
+
+def _truncate(text: str, limit: int = MESSAGE_CHARS) -> str:
+    text = text.strip()
+    return text if len(text) <= limit else text[: limit - 3].rstrip() + "..."
+
+
+def _node_id(case: ET.Element) -> str:
+    file = case.get("file") or ""
+    classname = case.get("classname") or ""
+    name = case.get("name") or ""
+    if not file:
+        return "::".join(part for part in (classname.replace(".", "/"), name) if part)
+    if not classname:
+        # collection error: the case is the module itself
+        return file
+    module = file[:-3].replace("/", ".") if file.endswith(".py") else file
+    classes = classname[len(module) + 1 :].split(".") if classname.startswith(module + ".") else []
+    return "::".join([file, *[c for c in classes if c], name])
+
+
+def _message(element: ET.Element) -> Optional[str]:
+    """The "E" lines of the traceback plus its location line, else pytest's short message."""
+    lines = [line for line in (element.text or "").splitlines() if line.strip()]
+    errors = [line[1:].strip() for line in lines if line.startswith("E ")]
+    if errors:
+        if lines and not lines[-1].startswith("E "):
+            errors.append(lines[-1].strip())
+        return _truncate("\n".join(errors))
+    message = element.get("message") or (lines[-1] if lines else "")
+    return _truncate(message) or None
+
+
+def _case(case: ET.Element) -> CaseReport:
+    duration = float(case.get("time") or 0.0)
+    for tag, outcome in (("failure", "FAILED"), ("error", "ERROR")):
+        element = case.find(tag)
+        if element is not None:
+            return CaseReport(outcome=outcome, duration=duration, message=_message(element))
+    skipped = case.find("skipped")
+    if skipped is not None:
+        outcome = "XFAIL" if skipped.get("type") == "pytest.xfail" else "SKIPPED"
+        return CaseReport(outcome=outcome, duration=duration, message=_message(skipped))
+    return CaseReport(outcome="PASSED", duration=duration)
+
+
+def parse_junit_xml(path: Path) -> Optional[Dict[str, CaseReport]]:
+    """Per-test results from a junit XML report; None if it is missing or unreadable."""
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        return None
+    return {_node_id(case): _case(case) for case in root.iter("testcase")}
+
+
+def parse_summary(stdout: str) -> Dict[str, CaseReport]:
+    """Outcomes from the ``-rA`` short test summary (no durations); fallback without XML."""
+    report: Dict[str, CaseReport] = {}
+    for line in stdout.splitlines():
+        match = _SUMMARY_LINE.match(line.strip())
+        if match:
+            outcome, node, message = match.groups()
+            report[node] = CaseReport(outcome=outcome, message=_truncate(message) if message else None)
+    return report
+
+
+def compact_report(result: ExecutionResult, limit: int = 4000) -> str:
+    """
+    Counts per outcome and one block per failing test, for prompts. Without a
+    report (timeout, crash) the tail of stderr/stdout stands in.
+    """
+    if not result.test_report:
+        raw = result.stderr.strip() or result.stdout.strip()
+        return raw if len(raw) <= limit else "..." + raw[-(limit - 3) :]
+    counts: Dict[str, int] = {}
+    for case in result.test_report.values():
+        counts[case.outcome] = counts.get(case.outcome, 0) + 1
+    lines: List[str] = [", ".join(f"{n} {outcome.lower()}" for outcome, n in sorted(counts.items()))]
+    for node, case in result.test_report.items():
+        if case.outcome in FAILING:
+            lines.append(f"{case.outcome} {node} ({case.duration:.2f}s)")
+            if case.message:
+                lines.extend(f"    {line}" for line in case.message.splitlines())
+    text = "\n".join(lines)
+    return text if len(text) <= limit else text[: limit - 3] + "..."
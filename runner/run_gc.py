@@ -0,0 +1,173 @@
+"""
+Lifecycle of pytest run directories (``run_<uuid>``).
+
+Every run leaves a directory behind. ``RunDirCollector`` applies a
+``RetentionPolicy`` to the run directories under its roots (only names the
+runner creates; any other ``run_*`` entry is left alone): the newest runs are
+kept, older failing runs are kept while the total stays under the size cap,
+everything else is deleted. Kept runs lose their ``__pycache__`` and
+``.pytest_cache``. Directories still in use by the runner are never touched.
+The collector runs one pass on demand (``collect``) or periodically on a
+daemon thread (``start``).
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from runner.report import REPORT_FILE
+
+RUN_PREFIX = "run_"
+_CACHE_DIRS = ("__pycache__", ".pytest_cache")
+
+
+class RetentionPolicy(BaseModel):
+    # the newest runs, kept whatever their outcome
+    keep_last: int = Field(default=20)
+    # older failing runs are kept too, as long as max_bytes allows
+    keep_failing: bool = Field(default=True)
+    # cap for all run directories together; the oldest go first (None: no cap)
+    max_bytes: Optional[int] = Field(default=256 * 1024 * 1024)
+    # younger runs may still be written by another process
+    min_age_seconds: float = Field(default=60.0)
+
+
+def is_run_dir_name(name: str) -> bool:
+    """``run_<uuid>`` as created by ``PytestRunner``."""
+    if not name.startswith(RUN_PREFIX):
+        return False
+    suffix = name[len(RUN_PREFIX) :]
+    try:
+        return str(UUID(suffix)) == suffix
+    except ValueError:
+        return False
+
+
+def dir_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def run_failed(run_dir: Path) -> bool:
+    """A run failed if its report lists failures/errors or it left no report (timeout, crash)."""
+    try:
+        root = ET.parse(run_dir / REPORT_FILE).getroot()
+    except (OSError, ET.ParseError):
+        return True
+    suites = [root] if root.tag == "testsuite" else list(root.iter("testsuite"))
+    return any(int(s.get("failures") or 0) + int(s.get("errors") or 0) > 0 for s in suites)
+
+
+class RunDirCollector:
+    def __init__(
+        self,
+        roots: Callable[[], Iterable[Path]],
+        policy: RetentionPolicy,
+        interval_seconds: float = 300.0,
+        in_use: Callable[[Path], bool] = lambda path: False,
+    ) -> None:
+        """``roots`` returns the directories holding run directories at call time."""
+        self.roots = roots
+        self.policy = policy
+        self.interval_seconds = interval_seconds
+        self.in_use = in_use
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval_seconds <= 0:
+            return
+        self._thread = threading.Thread(target=self._loop, name="run-dir-gc", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.collect()
+            except Exception:
+                pass
+            self._stop.wait(self.interval_seconds)
+
+    def _runs(self) -> List[Path]:
+        runs: List[Path] = []
+        for root in {Path(r) for r in self.roots()}:
+            if root.is_dir():
+                runs.extend(p for p in root.iterdir() if is_run_dir_name(p.name) and p.is_dir())
+
+        def mtime(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        return sorted(runs, key=mtime, reverse=True)
+
+    def collect(self) -> Dict[str, int]:
+        """One pass of the policy; returns counts of removed/kept runs and kept bytes."""
+        with self._lock:
+            policy = self.policy
+            now = time.time()
+            runs = self._runs()
+            protected = set(runs[: policy.keep_last])
+            for run in runs[policy.keep_last :]:
+                try:
+                    young = now - run.stat().st_mtime < policy.min_age_seconds
+                except OSError:
+                    continue
+                if young or self.in_use(run):
+                    protected.add(run)
+
+            removed = 0
+            kept: List[Path] = []
+            for run in runs:
+                if run in protected or (policy.keep_failing and run_failed(run)):
+                    kept.append(run)
+                else:
+                    removed += self._remove(run)
+
+            for run in kept:
+                if not self.in_use(run):
+                    for name in _CACHE_DIRS:
+                        for cache in run.rglob(name):
+                            shutil.rmtree(cache, ignore_errors=True)
+
+            sizes = {run: dir_size(run) for run in kept}
+            total = sum(sizes.values())
+            if policy.max_bytes is not None:
+                # oldest first; the newest/active runs stay even over the cap
+                for run in reversed(kept[:]):
+                    if total <= policy.max_bytes:
+                        break
+                    if run in protected:
+                        continue
+                    removed += self._remove(run)
+                    total -= sizes[run]
+                    kept.remove(run)
+            return {"removed": removed, "kept": len(kept), "bytes": total}
+
+    @staticmethod
+    def _remove(run: Path) -> int:
+        shutil.rmtree(run, ignore_errors=True)
+        return 0 if run.exists() else 1
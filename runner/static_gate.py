@@ -0,0 +1,253 @@
+"""
+In-process pre-flight check of generated code before pytest starts.
+
+``check_request`` compiles ``task_module.py`` and the tests, verifies that the
+names the tests take from ``task_module`` exist there, and flags calls to
+forbidden functions (by default the ones that would take down or escape the
+pytest process). Obvious errors are thereby reported in microseconds, without
+a run directory or a subprocess. ``side_effects`` finds calls that reach
+outside the test (files, processes, network, clock, randomness); such runs are
+not reproducible and must not be served from the execution cache.
+"""
+
+from __future__ import annotations
+
+import ast
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MODULE_FILE = "task_module.py"
+TESTS_FILE = "tests/test_task_module.py"
+MODULE_NAME = "task_module"
+
+DEFAULT_FORBIDDEN = [
+    "os._exit",
+    "os.abort",
+    "os.fork",
+    "os.forkpty",
+    "os.kill",
+    "os.killpg",
+    "breakpoint",
+    "pdb.set_trace",
+]
+
+# calls (or whole modules, as prefix) whose outcome depends on or changes the outside world
+SIDE_EFFECT_CALLS = [
+    "os.remove",
+    "os.unlink",
+    "os.rename",
+    "os.replace",
+    "os.mkdir",
+    "os.makedirs",
+    "os.rmdir",
+    "os.system",
+    "shutil",
+    "subprocess",
+    "socket",
+    "urllib.request",
+    "http.client",
+    "requests",
+    "time.time",
+    "datetime.datetime.now",
+    "datetime.datetime.utcnow",
+    "datetime.date.today",
+    "random",
+]
+# file-system methods, whatever object they are called on (``Path(...).write_text``)
+_WRITE_METHODS = {"write_text", "write_bytes", "mkdir", "touch", "unlink", "rmdir", "symlink_to", "hardlink_to"}
+
+
+def _compile(source: str, filename: str) -> Tuple[Optional[ast.Module], List[str]]:
+    try:
+        tree = ast.parse(source, filename=filename)
+        # symbol-table errors ("return" outside function, ...) only show up here
+        compile(tree, filename, "exec", dont_inherit=True)
+    except SyntaxError as exc:
+        # exc.text may come from a same-named file on disk; quote the source itself
+        lines = source.splitlines()
+        line = lines[exc.lineno - 1] if exc.lineno and 0 < exc.lineno <= len(lines) else ""
+        location = f"{filename}:{exc.lineno or 0}:{exc.offset or 0}"
+        message = f"{location}: {type(exc).__name__}: {exc.msg}"
+        if line.strip():
+            message += f"\n    {line.strip()}"
+        return None, [message]
+    except ValueError as exc:  # e.g. null bytes
+        return None, [f"{filename}: {exc}"]
+    return tree, []
+
+
+def _module_level(body: Iterable[ast.stmt]) -> Iterable[ast.stmt]:
+    """Statements executed at import time, including those nested in if/try/with/for."""
+    for node in body:
+        yield node
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        for field in ("body", "orelse", "finalbody"):
+            yield from _module_level(getattr(node, field, None) or [])
+        for handler in getattr(node, "handlers", None) or []:
+            yield from _module_level(handler.body)
+
+
+def _target_names(target: ast.AST) -> Iterable[str]:
+    for node in ast.walk(target):
+        if isinstance(node, ast.Name):
+            yield node.id
+
+
+def defined_names(tree: ast.Module) -> Optional[Set[str]]:
+    """Top-level names of a module; None if they cannot be known statically."""
+    names: Set[str] = set()
+    for node in _module_level(tree.body):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                names.update(_target_names(target))
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign, ast.For, ast.AsyncFor)):
+            names.update(_target_names(node.target))
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            for item in node.items:
+                if item.optional_vars is not None:
+                    names.update(_target_names(item.optional_vars))
+        elif isinstance(node, ast.Import):
+            names.update(alias.asname or alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if any(alias.name == "*" for alias in node.names):
+                return None
+            names.update(alias.asname or alias.name for alias in node.names)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Global):
+            names.update(node.names)
+        elif isinstance(node, ast.NamedExpr):
+            names.update(_target_names(node.target))
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in {"globals", "exec"}:
+            return None
+    if "__getattr__" in names:
+        return None
+    return names
+
+
+def _missing_imports(tests: ast.Module, names: Set[str]) -> List[str]:
+    issues: List[str] = []
+    aliases: Set[str] = set()
+    available = ", ".join(sorted(n for n in names if not n.startswith("_"))) or "-"
+
+    def missing(lineno: int, name: str) -> None:
+        issues.append(
+            f"{TESTS_FILE}:{lineno}: '{name}' is not defined in {MODULE_FILE} (defined: {available})"
+        )
+
+    for node in ast.walk(tests):
+        if isinstance(node, ast.ImportFrom) and node.module == MODULE_NAME and not node.level:
+            for alias in node.names:
+                if alias.name != "*" and alias.name not in names:
+                    missing(node.lineno, alias.name)
+        elif isinstance(node, ast.Import):
+            aliases.update(alias.asname or alias.name for alias in node.names if alias.name == MODULE_NAME)
+    for node in ast.walk(tests):
+        if (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.ctx, ast.Load)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in aliases
+            and not (node.attr.startswith("__") and node.attr.endswith("__"))
+            and node.attr not in names
+        ):
+            missing(node.lineno, node.attr)
+    return issues
+
+
+def _call_name(func: ast.AST, aliases: Dict[str, str]) -> Optional[str]:
+    parts: List[str] = []
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if not isinstance(func, ast.Name):
+        return None
+    parts.append(aliases.get(func.id, func.id))
+    return ".".join(reversed(parts))
+
+
+def _import_aliases(tree: ast.Module) -> Dict[str, str]:
+    aliases: Dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+    return aliases
+
+
+def _forbidden_calls(tree: ast.Module, filename: str, forbidden: Set[str]) -> List[str]:
+    aliases = _import_aliases(tree)
+    issues: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            name = _call_name(node.func, aliases)
+            if name in forbidden:
+                issues.append(f"{filename}:{node.lineno}: forbidden call {name}()")
+    return issues
+
+
+def _writing_open(node: ast.Call, name: Optional[str]) -> bool:
+    """``open``/``io.open``/``<path>.open`` with a mode that writes."""
+    if name in {"open", "io.open"}:
+        position = 1
+    elif isinstance(node.func, ast.Attribute) and node.func.attr == "open" and name not in {"os.open"}:
+        position = 0
+    else:
+        return False
+    mode = node.args[position] if len(node.args) > position else None
+    for keyword in node.keywords:
+        if keyword.arg == "mode":
+            mode = keyword.value
+    if mode is None:
+        return False
+    if not (isinstance(mode, ast.Constant) and isinstance(mode.value, str)):
+        return True  # computed mode: assume the worst
+    return any(flag in mode.value for flag in "wax+")
+
+
+def side_effects(code: str, tests: str, calls: Iterable[str] = SIDE_EFFECT_CALLS) -> List[str]:
+    """Calls in the module or tests that make a run non-reproducible, as ``file:line: name()``."""
+    prefixes = tuple(calls)
+    found: List[str] = []
+    for source, filename in ((code, MODULE_FILE), (tests, TESTS_FILE)):
+        try:
+            tree = ast.parse(source, filename=filename)
+        except (SyntaxError, ValueError):
+            continue
+        aliases = _import_aliases(tree)
+        for node in sorted(ast.walk(tree), key=lambda n: getattr(n, "lineno", 0)):
+            if not isinstance(node, ast.Call):
+                continue
+            name = _call_name(node.func, aliases)
+            method = node.func.attr if isinstance(node.func, ast.Attribute) else None
+            if (
+                (name is not None and any(name == p or name.startswith(p + ".") for p in prefixes))
+                or method in _WRITE_METHODS
+                or _writing_open(node, name)
+            ):
+                found.append(f"{filename}:{node.lineno}: {name or method}()")
+    return found
+
+
+def check_request(code: str, tests: str, forbidden: Iterable[str] = DEFAULT_FORBIDDEN) -> Dict[str, List[str]]:
+    """Diagnostics per file (``task_module.py`` / the tests); empty if the gate passes."""
+    forbidden_set = set(forbidden)
+    issues: Dict[str, List[str]] = {}
+    module_tree, module_issues = _compile(code, MODULE_FILE)
+    tests_tree, tests_issues = _compile(tests, TESTS_FILE)
+    if module_tree is not None:
+        module_issues += _forbidden_calls(module_tree, MODULE_FILE, forbidden_set)
+    if tests_tree is not None:
+        tests_issues += _forbidden_calls(tests_tree, TESTS_FILE, forbidden_set)
+        names = defined_names(module_tree) if module_tree is not None else None
+        if names is not None:
+            tests_issues += _missing_imports(tests_tree, names)
+    for filename, found in ((MODULE_FILE, module_issues), (TESTS_FILE, tests_issues)):
+        if found:
+            issues[filename] = found
+    return issues
@@ -0,0 +1,183 @@
+"""
+Pool of warm pytest worker processes (see ``pytest_worker.py``).
+
+A worker has pytest and its plugins imported already and forks a clean child
+per job, so a run skips interpreter start-up and plugin discovery. POSIX only:
+``available()`` is False where ``os.fork`` is missing and callers fall back to
+a plain subprocess.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from context.cancellation import CancelToken
+
+_WORKER_SCRIPT = Path(__file__).with_name("pytest_worker.py")
+
+
+def available() -> bool:
+    return os.name == "posix" and hasattr(os, "fork")
+
+
+class WorkerDied(RuntimeError):
+    """The worker process exited; the job did not run to completion."""
+
+
+class JobTimedOut(Exception):
+    def __init__(self, timeout: float, exit_code: int, stdout: str, stderr: str) -> None:
+        super().__init__(f"pytest job exceeded {timeout}s")
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+class PytestWorker:
+    def __init__(self) -> None:
+        self.proc = subprocess.Popen(
+            [sys.executable, str(_WORKER_SCRIPT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self._replies: queue.Queue = queue.Queue()
+        self._ready = False
+        threading.Thread(target=self._read, name="pytest-worker-reader", daemon=True).start()
+
+    def _read(self) -> None:
+        for line in self.proc.stdout:
+            try:
+                self._replies.put(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        self._replies.put(None)
+
+    def _reply(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        message = self._replies.get(timeout=timeout)
+        if message is None:
+            self._replies.put(None)
+            raise WorkerDied("pytest worker exited")
+        return message
+
+    def run(
+        self,
+        run_dir: Path,
+        args: Sequence[str],
+        env: Dict[str, str],
+        timeout: float,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Tuple[int, str, str]:
+        """
+        Run pytest with ``args`` in ``run_dir``; return exit code, stdout, stderr.
+        The job's process group is killed on timeout (``JobTimedOut``) or when
+        ``cancel_token`` fires (the killed job's result is returned).
+        """
+        if not self._ready:
+            self._reply()
+            self._ready = True
+        job = {"run_dir": str(run_dir), "args": list(args), "env": env}
+        try:
+            self.proc.stdin.write(json.dumps(job) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as exc:
+            raise WorkerDied("pytest worker exited") from exc
+        pid = self._reply()["pid"]
+        kill = functools.partial(_kill_job, pid)
+        unregister = cancel_token.on_cancel(kill) if cancel_token is not None else None
+        try:
+            try:
+                result = self._reply(timeout=timeout)
+            except queue.Empty:
+                kill()
+                result = self._reply()
+                raise JobTimedOut(timeout, result["exit_code"], result["stdout"], result["stderr"])
+        finally:
+            if unregister is not None:
+                unregister()
+        return result["exit_code"], result["stdout"], result["stderr"]
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+def _kill_job(pid: int) -> None:
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+class PytestWorkerPool:
+    def __init__(self, size: int) -> None:
+        """Start ``size`` workers right away; they warm up in the background."""
+        self.size = size
+        self._idle: queue.Queue = queue.Queue()
+        self._workers: List[PytestWorker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(size):
+            self._add()
+        atexit.register(self.close)
+
+    def _add(self) -> None:
+        worker = PytestWorker()
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+
+    def run(
+        self,
+        run_dir: Path,
+        args: Sequence[str],
+        env: Dict[str, str],
+        timeout: float,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> Tuple[int, str, str]:
+        """Run a job on the next idle worker (waiting for one if all are busy)."""
+        worker: PytestWorker = self._idle.get()
+        try:
+            result = worker.run(run_dir, args, env, timeout, cancel_token)
+        except WorkerDied:
+            self._replace(worker)
+            raise
+        except BaseException:
+            self._idle.put(worker)
+            raise
+        self._idle.put(worker)
+        return result
+
+    def _replace(self, worker: PytestWorker) -> None:
+        worker.close()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            closed = self._closed
+        if not closed:
+            self._add()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import sqlite3
 from pathlib import Path
@@ -46,19 +47,30 @@ class EventStore:
             )
             conn.commit()
 
+    async def append_async(self, event: EventRecord) -> None:
+        """``append`` off the event loop; events keep their creation-time order."""
+        await asyncio.to_thread(self.append, event)
+
     def fetch_all(self) -> Iterable[EventRecord]:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
                 "SELECT event_id, event_type, created_at, payload FROM events ORDER BY created_at;"
             )
             rows = cursor.fetchall()
-            for event_id, event_type, created_at, payload in rows:
-                yield EventRecord(
-                    event_id=event_id,
-                    event_type=event_type,
-                    created_at=created_at,
-                    payload=json.loads(payload),
-                )
+            for row in rows:
+                yield self._record(row)
+
+    def fetch_for_task(self, task_id: str) -> Iterable[EventRecord]:
+        """Events whose payload carries ``task_id``, oldest first."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "SELECT event_id, event_type, created_at, payload FROM events "
+                "WHERE json_extract(payload, '$.task_id') = ? ORDER BY created_at;",
+                (task_id,),
+            )
+            rows = cursor.fetchall()
+            for row in rows:
+                yield self._record(row)
 
     def last(self) -> Optional[EventRecord]:
         with sqlite3.connect(self.db_path) as conn:
@@ -68,10 +80,14 @@ class EventStore:
             row = cursor.fetchone()
             if not row:
                 return None
-            event_id, event_type, created_at, payload = row
-            return EventRecord(
-                event_id=event_id,
-                event_type=event_type,
-                created_at=created_at,
-                payload=json.loads(payload),
-            )
+            return self._record(row)
+
+    @staticmethod
+    def _record(row: tuple) -> EventRecord:
+        event_id, event_type, created_at, payload = row
+        return EventRecord(
+            event_id=event_id,
+            event_type=event_type,
+            created_at=created_at,
+            payload=json.loads(payload),
+        )
@@ -3,19 +3,33 @@
 from __future__ import annotations
 
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
+from context.tracing import span
+
 
 class SnapshotWriter:
     def __init__(self, snapshot_dir: Path):
         self.snapshot_dir = snapshot_dir
         self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
 
     def write(self, name: str, payload: Dict[str, Any]) -> Path:
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
-        path = self.snapshot_dir / f"{name}_{timestamp}.json"
+        with span("snapshot", "io", snapshot=name):
+            return self._write(name, payload)
+
+    def _write(self, name: str, payload: Dict[str, Any]) -> Path:
+        with self._lock:
+            timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+            path = self.snapshot_dir / f"{name}_{timestamp}.json"
+            suffix = 1
+            while path.exists():
+                path = self.snapshot_dir / f"{name}_{timestamp}_{suffix}.json"
+                suffix += 1
+            path.touch()
         with path.open("w", encoding="utf-8") as handle:
             json.dump(payload, handle, indent=2, ensure_ascii=True, default=str)
         return path
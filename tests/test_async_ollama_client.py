@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agents.planner_agent import PlannerAgent, PlannerInput, PlannerResponse
+from context.models import TaskContext
+from llm.async_ollama_client import AsyncOllamaClient
+from llm.cache import ResponseCache
+from llm.json_stream import StreamValidationError
+from llm.ollama_client import context_scope
+
+
+class FakeAsyncOllama:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def generate(self, stream=False, **request):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+        async def parts():
+            try:
+                await asyncio.sleep(0.01)
+                yield {"response": '{"value": '}
+                yield {"response": '"ok"}'}
+                yield {"response": "", "done": True, "eval_count": 2}
+            finally:
+                self.active -= 1
+
+        return parts()
+
+
+def test_generate_json_bounds_concurrency():
+    async def scenario():
+        client = AsyncOllamaClient(max_parallel=2)
+        fake = FakeAsyncOllama()
+        client.client = fake
+        chunks = []
+        results = await asyncio.gather(
+            *[
+                client.generate_json("llama3", f"p{i}", chunk_callback=chunks.append)
+                for i in range(5)
+            ]
+        )
+        return fake, results, chunks
+
+    fake, results, chunks = asyncio.run(scenario())
+    assert results == [{"value": "ok"}] * 5
+    assert fake.peak == 2
+    assert "".join(chunks).count('{"value": "ok"}') == 5
+
+
+class ContextEchoOllama:
+    """Returns the received context extended by two tokens; records what it got."""
+
+    def __init__(self):
+        self.received = []
+
+    async def generate(self, stream=False, **request):
+        context = request.get("context")
+        self.received.append((request["prompt"], context))
+
+        async def parts():
+            await asyncio.sleep(0.001)
+            yield {"response": '{"value": "ok"}'}
+            yield {"response": "", "done": True, "context": list(context or []) + [1, 2]}
+
+        return parts()
+
+
+def test_reused_context_is_kept_per_scope_bounded_and_part_of_the_cache_key(tmp_path):
+    async def call(client, scope, prompt):
+        with context_scope(scope):
+            return await client.generate_json("llama3", prompt, expected_keys=("value",))
+
+    async def scenario():
+        client = AsyncOllamaClient(
+            reuse_context=True, cache=ResponseCache(tmp_path / "cache.db"), max_context_tokens=4
+        )
+        fake = ContextEchoOllama()
+        client.client = fake
+        # concurrent steps do not continue each other's context
+        await asyncio.gather(call(client, "a", "a1"), call(client, "b", "b1"))
+        await call(client, "a", "a2")
+        await call(client, "a", "a3")  # context would exceed 4 tokens: dropped
+        await call(client, "a", "a4")
+        await call(client, "b", "b1")  # same prompt after another history: asked again
+        await call(client, "c", "b1")  # same prompt, same (empty) history: served from cache
+        return fake.received
+
+    received = asyncio.run(scenario())
+    contexts = dict(received[:2])
+    assert contexts["a1"] is None and contexts["b1"] is None
+    assert received[2:] == [("a2", [1, 2]), ("a3", [1, 2, 1, 2]), ("a4", None), ("b1", [1, 2])]
+
+
+class RecordingOllama:
+    """Streams a fixed answer and records every request."""
+
+    def __init__(self, answer: str):
+        self.answer = answer
+        self.requests = []
+
+    async def generate(self, stream=False, **request):
+        self.requests.append(request)
+
+        async def parts():
+            yield {"response": self.answer}
+            yield {"response": "", "done": True}
+
+        return parts()
+
+
+def test_agent_schema_is_sent_as_format_and_drives_expected_keys():
+    answer = '{"version": "1.0", "steps": [{"title": "A", "summary": "a", "depends_on": []}]}'
+
+    async def scenario():
+        client = AsyncOllamaClient()
+        fake = RecordingOllama(answer)
+        client.client = fake
+        agent = PlannerAgent("llama3")
+        agent.async_llm_client = client
+        plan = await agent.run_async(PlannerInput(task=TaskContext(description="Aufgabe")))
+
+        fake.answer = '{"bogus": 1}'
+        with pytest.raises(StreamValidationError, match=r"expected one of \['steps', 'version'\]"):
+            await client.generate_json("llama3", "p", schema=PlannerResponse)
+        # explicit keys take precedence over the schema's properties
+        overridden = await client.generate_json(
+            "llama3", "p", schema=PlannerResponse, expected_keys=("bogus",)
+        )
+        return plan, fake.requests, overridden
+
+    plan, requests, overridden = asyncio.run(scenario())
+    assert [step.title for step in plan.steps] == ["A"]
+    assert all(r["format"] == PlannerResponse.model_json_schema() for r in requests)
+    assert overridden == {"bogus": 1}
+
+
+def test_keep_alive_is_sent_per_model_with_generations_and_preloads():
+    async def scenario():
+        client = AsyncOllamaClient(keep_alive={"llama3": "30m"}, default_keep_alive="5m")
+        fake = RecordingOllama('{"value": "ok"}')
+        client.client = fake
+        await client.preload("llama3")
+        await client.generate_json("llama3", "p", expected_keys=("value",))
+        await client.generate_json("qwen", "p", expected_keys=("value",))
+        no_default = AsyncOllamaClient()
+        no_default.client = fake
+        await no_default.generate_json("qwen", "p", expected_keys=("value",))
+        return fake.requests
+
+    preload, pinned, other, unset = asyncio.run(scenario())
+    assert preload == {"model": "llama3", "prompt": "", "keep_alive": "30m"}
+    assert pinned["keep_alive"] == "30m" and other["keep_alive"] == "5m"
+    assert "keep_alive" not in unset
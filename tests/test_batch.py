@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import io
+import json
+
+from orchestrator.batch import percentile, run_batch
+from orchestrator.scheduler import TaskScheduler
+from tests.test_scheduler import CountingLLM, CountingRunner, make_config
+
+
+def test_run_batch_writes_one_line_per_task(tmp_path):
+    cfg = make_config(tmp_path)
+    scheduler = TaskScheduler(cfg, workers=2, llm_client=CountingLLM(), runner=CountingRunner())
+    source = io.StringIO(
+        "\n".join(
+            [
+                json.dumps({"id": "a", "description": "Erster Task"}),
+                json.dumps({"request_id": "b", "title": "Zweiter", "body": "Task", "priority": 1}),
+                "",
+                "kein json",
+            ]
+        )
+    )
+    sink = io.StringIO()
+
+    report = run_batch(cfg, source, sink, scheduler=scheduler)
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    by_id = {line["id"]: line for line in lines}
+    assert by_id["a"]["status"] == "ok" and by_id["b"]["status"] == "ok"
+    assert by_id["4"]["status"] == "error"
+    assert (report.tasks, report.succeeded, report.failed) == (3, 2, 1)
+    assert report.latency_ms["p50"] > 0
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 50) == 2.0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 99) == 4.0
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import json
+import threading
+
+from context.context_logger import ContextLogSink, start_run
+from llm.interceptors import LLMExchange
+
+
+def test_sink_survives_unwritable_exchange(tmp_path):
+    sink = ContextLogSink()
+    run_dir = start_run(tmp_path / "logs")
+
+    # a lone surrogate cannot be encoded: the write fails outside OSError
+    sink.submit(run_dir, LLMExchange(caller="Bad", model="m", prompt="p", result={"value": "\ud800"}))
+    sink.submit(run_dir, LLMExchange(caller="Good", model="m", prompt="p", result={"value": "ok"}))
+    flushed = threading.Thread(target=sink.flush, daemon=True)
+    flushed.start()
+    flushed.join(timeout=5)
+
+    assert not flushed.is_alive()
+    lines = (run_dir / "exchanges.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["caller"] for line in lines] == ["Good"]
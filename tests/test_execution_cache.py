@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from agents.executor_agent import ExecutorAgent, ExecutorInput
+from context.models import ExecutionRequest, ExecutionStatus, PromptContext, StepContext
+from runner.execution_cache import ExecutionCache
+from runner.pytest_runner import PytestRunner
+
+# every real execution appends a line to runs.log in USER_DATA_DIR
+_COUNTING_TESTS = (
+    "import os\n"
+    "from pathlib import Path\n"
+    "from task_module import value\n\n"
+    "def test_value():\n"
+    "    with open(Path(os.environ['USER_DATA_DIR']) / 'runs.log', 'a') as f:\n"
+    "        f.write('run\\n')\n"
+    "    assert value() == 1\n"
+)
+
+
+def _executions(data_dir):
+    log = data_dir / "runs.log"
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def test_repeated_run_is_served_from_cache(tmp_path):
+    data_dir = tmp_path / "files"
+    cache = ExecutionCache(tmp_path / "exec.db")
+    runner = PytestRunner(workspace=tmp_path / "runs", data_dir=data_dir, cache=cache)
+    request = ExecutionRequest(code="def value():\n    return 1\n", tests=_COUNTING_TESTS, working_dir=tmp_path / "runs")
+
+    first = runner.run(request)
+    second = runner.run(request)
+
+    assert first.status == ExecutionStatus.PASSED
+    assert second.status == first.status and second.test_report == first.test_report
+    assert second.run_dir != first.run_dir and (second.run_dir / "task_module.py").exists()
+    assert _executions(data_dir) == 1
+    assert cache.stats()["hits"] == 1
+
+    # different code, side-effect opt-out and explicit invalidation all execute again
+    runner.run(request.model_copy(update={"code": "def value():\n    return 2\n"}))
+    runner.run(request.model_copy(update={"cacheable": False}))
+    runner.invalidate_cache(request)
+    runner.run(request)
+    assert _executions(data_dir) == 4
+
+
+def test_data_dir_fingerprint_is_part_of_the_key(tmp_path):
+    data_dir = tmp_path / "files"
+    data_dir.mkdir()
+    cache = ExecutionCache(tmp_path / "exec.db", fingerprint_data_dir=True)
+    request = ExecutionRequest(code="x = 1\n", tests="def test_x():\n    pass\n")
+
+    key = cache.make_key(request, None, data_dir)
+    assert cache.make_key(request, None, data_dir) == key
+    (data_dir / "input.csv").write_text("a,b\n")
+    assert cache.make_key(request, None, data_dir) != key
+    assert cache.make_key(request, ["tests/test_task_module.py::test_x"], data_dir) != cache.make_key(
+        request, None, data_dir
+    )
+
+
+def test_side_effecting_fallback_request_is_never_served_from_cache(tmp_path):
+    data_dir = tmp_path / "files"
+    cache = ExecutionCache(tmp_path / "exec.db")
+    runner = PytestRunner(workspace=tmp_path / "runs", data_dir=data_dir, cache=cache)
+    ids = {"step_id": "s", "plan_id": "p", "task_id": "t"}
+    request = ExecutorAgent("llama3")._result(
+        ExecutorInput(step=StepContext(summary="x", **ids), prompt=PromptContext(prompt="x", **ids)), None
+    )
+    assert not request.cacheable
+    request = request.model_copy(update={"working_dir": tmp_path / "runs"})
+
+    assert runner.run(request).status == ExecutionStatus.PASSED
+    (data_dir / "output.txt").unlink()
+    assert runner.run(request).status == ExecutionStatus.PASSED
+    # the second run wrote the file again instead of replaying the first
+    assert (data_dir / "output.txt").read_text(encoding="utf-8") == "ok"
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Sequence
+
+import pytest
+
+from agents.planner_agent import PlannerResponse
+from llm.json_stream import StreamValidationError
+from llm.ollama_client import OllamaClient
+
+
+def _stub_server(answer: str, delay: float = 0.0, bodies: Optional[list] = None, running: Sequence[str] = ()):
+    """
+    Ollama stand-in answering every generation with ``answer``; posted bodies go
+    to ``bodies``, ``running`` is what ``/api/ps`` reports as loaded.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            payload = json.dumps({"models": [{"model": name} for name in running]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if bodies is not None:
+                bodies.append(body)
+            time.sleep(delay)
+            parts = [{"model": body["model"], "response": answer, "done": False}]
+            parts.append({"model": body["model"], "response": "", "done": True, "eval_count": 1})
+            if not body.get("stream", True):
+                parts = [{"model": body["model"], "response": answer, "done": True}]
+            payload = "\n".join(json.dumps(p) for p in parts).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _unused_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def _blackhole():
+    """A host that accepts connections and never answers."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen()
+    return sock, f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_failover_ejects_unreachable_host():
+    server, url = _stub_server('{"host": "alive"}')
+    try:
+        client = OllamaClient(host=[_unused_url(), url], timeout=2)
+        assert client.generate_json("llama3", "p", expected_keys=("host",)) == {"host": "alive"}
+        dead, alive = client.pool.hosts
+        assert dead.ejected_until > time.monotonic()
+        assert "llama3" in alive.loaded
+        assert dead.in_flight == alive.in_flight == 0
+    finally:
+        server.shutdown()
+
+
+def test_slow_request_is_hedged_to_second_host():
+    slow, slow_url = _stub_server('{"host": "slow"}', delay=1.0)
+    fast, fast_url = _stub_server('{"host": "fast"}')
+    try:
+        client = OllamaClient(host=[slow_url, fast_url], timeout=5, hedge_percentile=50)
+        client.pool.hosts[0].loaded.add("llama3")
+        for _ in range(client.pool.min_samples):
+            client.pool.record_latency("llama3", 0.05)
+
+        started = time.monotonic()
+        result = client.generate_json("llama3", "p", expected_keys=("host",))
+        assert result == {"host": "fast"}
+        assert time.monotonic() - started < 0.9
+    finally:
+        slow.shutdown()
+        fast.shutdown()
+
+
+def _missing_model_server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            payload = json.dumps({"error": f"model '{body['model']}' not found"}).encode()
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_model_error_neither_ejects_nor_marks_model_loaded():
+    server, url = _missing_model_server()
+    try:
+        client = OllamaClient(host=[url], timeout=2)
+        host = client.pool.hosts[0]
+        host.ejected_until = time.monotonic() + 60
+        for stream in (False, True):
+            try:
+                parts = client.pool.generate({"model": "missing", "prompt": "p"}, stream=stream)
+                if stream:
+                    list(parts)
+            except Exception as exc:
+                assert "not found" in str(exc)
+            else:
+                raise AssertionError("expected the missing model to fail")
+            assert "missing" not in host.loaded
+            assert host.ejected_until == 0.0
+            assert host.in_flight == 0
+    finally:
+        server.shutdown()
+
+
+def test_schema_is_posted_as_format_and_limits_keys():
+    bodies = []
+    server, url = _stub_server('{"version": "1", "steps": []}', bodies=bodies)
+    try:
+        client = OllamaClient(host=url, timeout=5)
+        assert client.generate_json("llama3", "p", schema=PlannerResponse) == {"version": "1", "steps": []}
+        assert bodies[0]["format"] == PlannerResponse.model_json_schema()
+        assert bodies[0]["stream"] is True
+        with pytest.raises(StreamValidationError, match="'version'"):
+            client.generate_json("llama3", "p", schema={"type": "object", "properties": {"other": {}}})
+    finally:
+        server.shutdown()
+
+
+def test_keep_alive_is_posted_with_generations_and_preload():
+    bodies = []
+    server, url = _stub_server('{"value": "ok"}', bodies=bodies)
+    try:
+        client = OllamaClient(host=url, timeout=5, keep_alive={"llama3": "30m"}, default_keep_alive="5m")
+        client.preload("llama3")
+        client.generate_json("qwen", "p", expected_keys=("value",))
+        preload, generation = bodies
+        assert (preload["model"], preload["prompt"], preload["keep_alive"]) == ("llama3", "", "30m")
+        assert (generation["model"], generation["keep_alive"]) == ("qwen", "5m")
+        assert "llama3" in client.pool.hosts[0].loaded
+    finally:
+        server.shutdown()
+
+
+def test_loaded_models_are_refreshed_without_blocking_construction():
+    server, url = _stub_server('{"value": "ok"}', running=["llama3"])
+    hole, hole_url = _blackhole()
+    try:
+        started = time.monotonic()
+        client = OllamaClient(host=[url, hole_url], timeout=5)
+        assert time.monotonic() - started < 1.0
+        alive = client.pool.hosts[0]
+        deadline = time.monotonic() + 5
+        while "llama3" not in alive.loaded and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert alive.loaded == {"llama3"}
+    finally:
+        hole.close()
+        client.pool.stop_refresh()
+        server.shutdown()
+
+
+def test_single_host_without_token_runs_on_the_calling_thread(monkeypatch):
+    server, url = _stub_server('{"value": "ok"}')
+    try:
+        client = OllamaClient(host=url, timeout=5)
+
+        def threaded_path(*args, **kwargs):
+            raise AssertionError("single host request took the threaded path")
+
+        monkeypatch.setattr(client.pool, "hedge_after", threaded_path)
+        assert client.generate_json("llama3", "p", expected_keys=("value",)) == {"value": "ok"}
+        assert client.pool.hosts[0].in_flight == 0 and "llama3" in client.pool.hosts[0].loaded
+    finally:
+        server.shutdown()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from agents.planner_agent import PlannerResponse
+from llm.cache import ResponseCache
+from llm.ollama_client import OllamaClient
+from orchestrator.orchestrator import Orchestrator
+from tests.test_host_pool import _stub_server
+from tests.test_scheduler import make_config
+
+
+def test_cache_hit_miss_and_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.db", max_bytes=10)
+    key_a = ResponseCache.make_key(digest="d", prompt="a", options={"temperature": 0})
+    key_b = ResponseCache.make_key(digest="d", prompt="b", options={"temperature": 0})
+
+    assert cache.get(key_a) is None
+    cache.put(key_a, "llama3", '{"x":1}')
+    assert cache.get(key_a) == '{"x":1}'
+
+    cache.put(key_b, "llama3", '{"y":2}')
+    assert cache.get(key_a) is None
+    assert cache.get(key_b) == '{"y":2}'
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["entries"] == 1
+
+
+def test_cache_expires_entries(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.db", max_age_seconds=-1)
+    key = ResponseCache.make_key(prompt="p")
+    cache.put(key, "llama3", "{}")
+    assert cache.get(key) is None
+
+
+def test_client_cache_hit_skips_the_request_unless_bypassed(tmp_path):
+    bodies = []
+    server, url = _stub_server('{"version": "1", "steps": []}', bodies=bodies)
+    try:
+        client = OllamaClient(host=url, timeout=5, cache=ResponseCache(tmp_path / "cache.db"))
+        first = client.generate_json("llama3", "p", schema=PlannerResponse)
+        assert client.generate_json("llama3", "p", schema=PlannerResponse) == first
+        assert len(bodies) == 1
+        client.generate_json("llama3", "p", schema=PlannerResponse, use_cache=False)
+        assert len(bodies) == 2
+
+        # llm_cache_bypass turns the cache off for the named agents only
+        orch = Orchestrator(make_config(tmp_path, llm_cache_bypass=["planner"]), llm_client=client)
+        orch.planner_agent._generate_json("p")
+        # the same request from an agent that keeps the cache is a hit
+        orch.summarizer_agent.output_model = PlannerResponse
+        orch.summarizer_agent._generate_json("p")
+        assert len(bodies) == 3
+    finally:
+        server.shutdown()
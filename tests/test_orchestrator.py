@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
+import time
 from pathlib import Path
 
-from config.config import AppConfig
+import pytest
+
+from context.cancellation import CancelToken, RunCancelled
 from context.models import ExecutionRequest, ExecutionResult, ExecutionStatus
+from llm.telemetry import LLMCallStats, TelemetryAggregator
+from orchestrator.events import EventType
 from orchestrator.orchestrator import Orchestrator
+from runner import worker_pool
+from runner.pytest_runner import PytestRunner
+from runner.report import compact_report
+from tests.test_scheduler import make_config
 
 
 class StubRunner:
@@ -12,7 +24,7 @@ class StubRunner:
         self.workspace = workspace
         self.workspace.mkdir(parents=True, exist_ok=True)
 
-    def run(self, request: ExecutionRequest) -> ExecutionResult:
+    def run(self, request: ExecutionRequest, **kwargs) -> ExecutionResult:
         return ExecutionResult(
             status=ExecutionStatus.PASSED,
             stdout="stubbed",
@@ -25,19 +37,15 @@ class StubLLM:
     def __init__(self):
         self.calls = []
 
-    def generate_json(self, model: str, prompt: str):
+    def generate_json(self, model: str, prompt: str, **kwargs):
         self.calls.append((model, prompt))
         return {}
 
 
 def test_orchestrator_min_flow(tmp_path):
-    cfg = AppConfig(
-        storage_dir=tmp_path / "storage",
-        context_snapshot_dir=tmp_path / "snapshots",
-        runner_workspace=tmp_path / "runs",
-        tool_dir=tmp_path / "tools",
-    )
-    orch = Orchestrator(cfg, llm_client=StubLLM())
+    cfg = make_config(tmp_path)
+    llm = StubLLM()
+    orch = Orchestrator(cfg, llm_client=llm)
     orch.runner = StubRunner(cfg.runner_workspace)
 
     result = orch.run("Einfacher Testtask")
@@ -46,3 +54,563 @@ def test_orchestrator_min_flow(tmp_path):
     assert result["plan"]["current_step_index"] == len(result["plan"]["steps"])
     assert result["reviews"]
     assert result["summary"]["summary"]
+    # the agents really asked the LLM (and fell back on its empty answers)
+    assert any("PlannerAgent" in prompt for _, prompt in llm.calls)
+    assert any("SummarizerAgent" in prompt for _, prompt in llm.calls)
+
+
+class PlanLLM:
+    """Answers the planner with four steps: 1 and 2 independent, 3 needs both, 4 needs 3."""
+
+    def generate_json(self, model: str, prompt: str, **kwargs):
+        if "PlannerAgent" in prompt:
+            return {
+                "version": "0.1.0",
+                "steps": [
+                    {"title": "A", "summary": "a", "depends_on": []},
+                    {"title": "B", "summary": "b", "depends_on": []},
+                    {"title": "C", "summary": "c", "depends_on": [1, 2]},
+                    {"title": "D", "summary": "d", "depends_on": [3]},
+                ],
+            }
+        return {}
+
+
+class ConcurrencyRunner(StubRunner):
+    def __init__(self, workspace: Path):
+        super().__init__(workspace)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def run(self, request: ExecutionRequest, **kwargs) -> ExecutionResult:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return super().run(request)
+
+
+def test_orchestrator_runs_independent_steps_in_parallel(tmp_path):
+    cfg = make_config(tmp_path, max_parallel_steps=4)
+    orch = Orchestrator(cfg, llm_client=PlanLLM())
+    orch.runner = ConcurrencyRunner(cfg.runner_workspace)
+
+    result = orch.run("Paralleler Testtask")
+
+    steps = result["plan"]["steps"]
+    assert steps[2]["dependencies"] == [steps[0]["step_id"], steps[1]["step_id"]]
+    assert [r["step_id"] for r in result["reviews"]] == [s["step_id"] for s in steps]
+    assert result["plan"]["current_step_index"] == 4
+    assert orch.runner.peak == 2
+
+
+class SlowLLM(PlanLLM):
+    """Records which stage prompts overlap a running pytest."""
+
+    def __init__(self, runner: ConcurrencyRunner):
+        self.runner = runner
+        self.during_run = []
+
+    def generate_json(self, model: str, prompt: str, **kwargs):
+        if self.runner.active:
+            self.during_run.append(prompt.split("\n", 1)[0])
+        time.sleep(0.01)
+        return super().generate_json(model, prompt, **kwargs)
+
+
+def test_orchestrator_pipelines_next_step_during_pytest(tmp_path):
+    cfg = make_config(tmp_path, pipeline_steps=True)
+    runner = ConcurrencyRunner(cfg.runner_workspace)
+    llm = SlowLLM(runner)
+    orch = Orchestrator(cfg, llm_client=llm)
+    orch.runner = runner
+
+    result = orch.run("Pipeline-Testtask")
+
+    steps = result["plan"]["steps"]
+    assert [r["step_id"] for r in result["reviews"]] == [s["step_id"] for s in steps]
+    assert result["plan"]["current_step_index"] == len(steps)
+    assert runner.peak == 1
+    assert llm.during_run
+
+
+class FailFirstRunner(StubRunner):
+    """Fails the very first pytest run, passes every later one."""
+
+    def __init__(self, workspace: Path):
+        super().__init__(workspace)
+        self.runs = 0
+
+    def run(self, request: ExecutionRequest, **kwargs) -> ExecutionResult:
+        self.runs += 1
+        if self.runs == 1:
+            return ExecutionResult(status=ExecutionStatus.FAILED, stderr="boom", exit_code=1)
+        return super().run(request)
+
+
+class CountingLLM(PlanLLM):
+    def __init__(self):
+        self.prompts = 0
+        self.lock = threading.Lock()
+
+    def generate_json(self, model: str, prompt: str, **kwargs):
+        if "PrompterAgent" in prompt:
+            with self.lock:
+                self.prompts += 1
+        return super().generate_json(model, prompt, **kwargs)
+
+
+class StatsLLM(PlanLLM):
+    """Reports fixed counters for every call through ``stats_callback``."""
+
+    def generate_json(self, model: str, prompt: str, stats_callback=None, **kwargs):
+        stats_callback(
+            LLMCallStats(
+                model=model, eval_count=10, eval_duration_ms=500.0, prompt_eval_count=4, time_to_first_token_ms=20.0
+            )
+        )
+        return super().generate_json(model, prompt, **kwargs)
+
+
+def test_run_reports_llm_stats_per_agent(tmp_path):
+    cfg = make_config(tmp_path)
+    events = []
+    orch = Orchestrator(cfg, llm_client=StatsLLM(), on_event=lambda name, payload: events.append((name, payload)))
+    orch.runner = StubRunner(cfg.runner_workspace)
+
+    result = orch.run("Telemetrie-Testtask")
+
+    calls = [payload for name, payload in events if name == "LLM_CALL"]
+    assert calls and all(c["eval_count"] == 10 and c["tokens_per_second"] == 20.0 for c in calls)
+    assert calls[0]["agent"] == "PlannerAgent" and calls[0]["task_id"] == result["task"]["task_id"]
+    stats = result["llm_stats"]
+    assert "DecomposerAgent" not in stats
+    assert stats["PlannerAgent"]["calls"] == 1
+    assert stats["PrompterAgent"]["calls"] == 4
+    assert sum(agent["calls"] for agent in stats.values()) == len(calls)
+    reviewer = stats["ReviewerAgent"]
+    assert reviewer["tokens_per_second"] == 20.0 and reviewer["avg_time_to_first_token_ms"] == 20.0
+    assert reviewer["eval_tokens"] == 10 * reviewer["calls"] and reviewer["prompt_tokens"] == 4 * reviewer["calls"]
+
+    aggregator = TelemetryAggregator()
+    aggregator.record("A", LLMCallStats(model="m", cached=True))
+    aggregator.record("A", LLMCallStats(model="m", aborted=True, eval_count=5, eval_duration_ms=250.0))
+    summary = aggregator.summary()["A"]
+    assert (summary["calls"], summary["cached"], summary["aborted"]) == (2, 1, 1)
+    assert summary["tokens_per_second"] == 20.0 and summary["avg_time_to_first_token_ms"] == 0.0
+    aggregator.reset()
+    assert aggregator.summary() == {}
+
+
+class PreloadLLM(StatsLLM):
+    def __init__(self):
+        self.preloaded = []
+
+    def preload(self, model: str) -> None:
+        self.preloaded.append(model)
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_preload_warms_startup_models_and_the_next_stage(tmp_path):
+    models = {
+        key: f"{key}-m"
+        for key in ["planner", "research", "decomposer", "prompter", "executor", "reviewer", "fix_manager", "summarizer"]
+    }
+
+    def make(name: str, **options) -> Orchestrator:
+        cfg = make_config(tmp_path / name, unified_model=False, models=models, **options)
+        orch = Orchestrator(cfg, llm_client=PreloadLLM())
+        orch.runner = StubRunner(cfg.runner_workspace)
+        return orch
+
+    # all models in order of first use; the decomposer makes no LLM call
+    everything = make("all", preload_models=True)
+    expected = [m for key, m in models.items() if key != "decomposer"]
+    assert _wait_for(lambda: len(everything.llm_client.preloaded) == len(expected))
+    assert everything.llm_client.preloaded == expected
+
+    single = make("single", preload_models=True, single_model_memory=True)
+    assert _wait_for(lambda: single.llm_client.preloaded == ["planner-m"])
+    single.run("Preload-Testtask")
+    # the next stage's model is loaded while decompose / pytest run
+    assert _wait_for(lambda: {"research-m", "reviewer-m"} <= set(single.llm_client.preloaded))
+    assert "decomposer-m" not in single.llm_client.preloaded
+
+    off = make("off")
+    off.run("Preload-Testtask")
+    time.sleep(0.05)
+    assert off.llm_client.preloaded == []
+
+
+class FieldLLM(PlanLLM):
+    """Reports each top-level field of the answer like the streaming validator does."""
+
+    def generate_json(self, model: str, prompt: str, field_callback=None, **kwargs):
+        answer = super().generate_json(model, prompt, **kwargs)
+        for key, value in answer.items():
+            field_callback(key, value)
+        return answer
+
+
+def test_streamed_fields_reach_on_event(tmp_path):
+    cfg = make_config(tmp_path)
+    events = []
+    orch = Orchestrator(cfg, llm_client=FieldLLM(), on_event=lambda name, payload: events.append((name, payload)))
+    orch.runner = StubRunner(cfg.runner_workspace)
+
+    orch.run("Feld-Testtask")
+
+    fields = [payload for name, payload in events if name == "FIELD_PARSED"]
+    assert [(f["agent"], f["field"]) for f in fields] == [("PlannerAgent", "version"), ("PlannerAgent", "steps")]
+    assert len(fields[1]["value"]) == 4
+    # live progress only, not part of the stored event log
+    assert all(e.event_type != EventType.FIELD_PARSED for e in orch.event_store.fetch_all())
+
+
+def test_pipeline_discards_speculation_when_previous_step_needs_fix(tmp_path):
+    cfg = make_config(tmp_path, pipeline_steps=True)
+    llm = CountingLLM()
+    orch = Orchestrator(cfg, llm_client=llm)
+    orch.runner = FailFirstRunner(cfg.runner_workspace)
+
+    result = orch.run("Verwerfen-Testtask")
+
+    steps = result["plan"]["steps"]
+    discarded = [e for e in orch.event_store.fetch_all() if e.event_type == EventType.SPECULATION_DISCARDED]
+    assert [e.payload["step_id"] for e in discarded] == [steps[1]["step_id"]]
+    # step 2 was prepared twice: speculatively, then again after step 1's fix
+    assert llm.prompts == len(steps) + 1
+    assert [r["decision"] for r in result["reviews"]] == ["APPROVED"] * len(steps)
+
+
+class AsyncPlanLLM(PlanLLM):
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def generate_json(self, model: str, prompt: str, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        return PlanLLM.generate_json(self, model, prompt, **kwargs)
+
+
+def test_orchestrator_run_async_streams_events(tmp_path):
+    llm = AsyncPlanLLM()
+
+    def make(name: str) -> Orchestrator:
+        cfg = make_config(tmp_path / name)
+        orch = Orchestrator(cfg, llm_client=StubLLM(), async_llm_client=llm)
+        orch.runner = StubRunner(cfg.runner_workspace)
+        return orch
+
+    async def collect(orch: Orchestrator):
+        return [item async for item in orch.stream_async("Async-Testtask")]
+
+    async def scenario():
+        return await asyncio.gather(*(collect(make(f"run{i}")) for i in range(3)))
+
+    for items in asyncio.run(scenario()):
+        kind, _, result = items[-1]
+        assert kind == "result"
+        assert len(result["reviews"]) == 4
+        events = [name for kind, name, _ in items if kind == "event"]
+        assert events[0] == "TASK_CREATED" and events[-1] == "RUN_COMPLETED"
+    assert llm.peak > 1
+
+
+def test_async_client_lives_for_one_async_run_and_not_for_several_hosts(tmp_path):
+    def make(hosts) -> Orchestrator:
+        cfg = make_config(tmp_path, ollama_hosts=hosts)
+        return Orchestrator(cfg)
+
+    async def inside_run(orch: Orchestrator):
+        async with orch._async_client_scope():
+            return orch.async_llm_client, orch.planner_agent.async_llm_client
+
+    single = make(["http://127.0.0.1:9"])
+    assert single.async_llm_client is None and single.planner_agent.async_llm_client is None
+    client, wired = asyncio.run(inside_run(single))
+    assert client.host == "http://127.0.0.1:9" and wired.client is client
+    # closed with its event loop; the next loop gets its own
+    assert client.client._client.is_closed
+    assert single.async_llm_client is None and single.planner_agent.async_llm_client is None
+    assert asyncio.run(inside_run(single))[0] is not client
+
+    # AsyncOllamaClient has no host pool: async agents use the pooled sync client instead
+    pooled = make(["http://127.0.0.1:9", "http://127.0.0.1:10"])
+    assert asyncio.run(inside_run(pooled)) == (None, None)
+    assert len(pooled.llm_client.pool.hosts) == 2
+
+
+def test_run_async_warns_that_step_parallelism_is_sync_only(tmp_path):
+    cfg = make_config(tmp_path, pipeline_steps=True)
+    orch = Orchestrator(cfg, llm_client=StubLLM(), async_llm_client=AsyncPlanLLM())
+    orch.runner = StubRunner(cfg.runner_workspace)
+
+    with pytest.warns(RuntimeWarning, match="pipeline_steps"):
+        result = asyncio.run(orch.run_async("Async-Testtask"))
+    assert len(result["reviews"]) == 4
+
+
+class CrashingRunner(StubRunner):
+    def __init__(self, workspace: Path, crash_on: int):
+        super().__init__(workspace)
+        self.calls = 0
+        self.crash_on = crash_on
+
+    def run(self, request: ExecutionRequest, **kwargs) -> ExecutionResult:
+        self.calls += 1
+        if self.calls == self.crash_on:
+            raise KeyboardInterrupt
+        return super().run(request)
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_orchestrator_resumes_interrupted_run(tmp_path, mode):
+    cfg = make_config(tmp_path)
+    orch = Orchestrator(cfg, llm_client=PlanLLM())
+    orch.runner = CrashingRunner(cfg.runner_workspace, crash_on=3)
+    try:
+        orch.run("Unterbrochener Task")
+    except KeyboardInterrupt:
+        pass
+    task_id = orch.current_task_id
+    plan_id = orch.last_plan.plan_id
+
+    if mode == "sync":
+        resumed = Orchestrator(cfg, llm_client=PlanLLM())
+        resume = resumed.resume
+    else:
+        resumed = Orchestrator(cfg, llm_client=PlanLLM(), async_llm_client=AsyncPlanLLM())
+
+        def resume(task_id):
+            return asyncio.run(resumed.resume_async(task_id))
+
+    resumed.runner = CrashingRunner(cfg.runner_workspace, crash_on=0)
+    result = resume(task_id)
+
+    assert resumed.runner.calls == 2
+    assert result["plan"]["plan_id"] == plan_id
+    assert len(result["reviews"]) == 4
+    assert resume(task_id)["summary"]["summary"] == result["summary"]["summary"]
+    assert resumed.runner.calls == 2
+
+
+class FixingLLM:
+    """One-step plan whose first implementation fails one of two tests; the fix round repairs it."""
+
+    tests = "from task_module import f\n\ndef test_value():\n    assert f() == 2\n\ndef test_type():\n    assert isinstance(f(), int)\n"
+
+    def generate_json(self, model: str, prompt: str, **kwargs):
+        if "PlannerAgent" in prompt:
+            return {"steps": [{"title": "F", "summary": "f liefert 2", "depends_on": []}]}
+        if "Korrigiere" in prompt:
+            return {"code": "def f():\n    return 2\n", "tests": self.tests, "expected_output": ""}
+        if "ExecutorAgent" in prompt:
+            return {"code": "def f():\n    return 1\n", "tests": self.tests, "expected_output": ""}
+        return {}
+
+
+def test_orchestrator_fix_loop_reruns_only_failing_tests(tmp_path):
+    cfg = make_config(tmp_path, user_files_dir=tmp_path / "files")
+    events = []
+    orch = Orchestrator(cfg, llm_client=FixingLLM(), on_event=lambda name, payload: events.append((name, payload)))
+
+    result = orch.run("Fix-Task")
+
+    assert [r["decision"] for r in result["reviews"]] == ["APPROVED"]
+    fixes = [payload for name, payload in events if name == "FIX_APPLIED"]
+    assert len(fixes) == 1
+    assert fixes[0]["rerun_tests"] == ["tests/test_task_module.py::test_value"]
+    assert fixes[0]["status"] == "PASSED"
+
+
+def test_rerun_catches_fix_that_breaks_a_passing_test(tmp_path):
+    runner = PytestRunner(workspace=tmp_path / "runs", timeout_seconds=60, data_dir=tmp_path / "files")
+    tests = (
+        "from task_module import a, b\n\n"
+        "def test_a():\n    assert a() == 1\n\n"
+        "def test_b():\n    assert b() == 2\n"
+    )
+    broken_a = ExecutionRequest(
+        code="def a():\n    return 0\n\ndef b():\n    return 2\n", tests=tests, working_dir=tmp_path / "runs"
+    )
+    first = runner.run(broken_a)
+    assert first.test_report["tests/test_task_module.py::test_b"].outcome == "PASSED"
+
+    # repairs test_a, breaks test_b
+    regressed = broken_a.model_copy(update={"code": "def a():\n    return 1\n\ndef b():\n    return 0\n"})
+    result = runner.rerun(regressed, first)
+    assert result.status == ExecutionStatus.FAILED
+    assert result.test_report["tests/test_task_module.py::test_b"].outcome == "FAILED"
+
+    async_result = asyncio.run(runner.rerun_async(regressed, first))
+    assert async_result.status == ExecutionStatus.FAILED
+    assert async_result.test_report["tests/test_task_module.py::test_a"].outcome == "PASSED"
+
+
+class HangingLLM:
+    """Generates "forever" until the run's token fires."""
+
+    def generate_json(self, model: str, prompt: str, cancel_token=None, **kwargs):
+        cancel_token.wait(30)
+        cancel_token.raise_if_cancelled()
+        return {}
+
+
+def test_run_budget_cancels_hanging_generation(tmp_path):
+    cfg = make_config(tmp_path, run_timeout_seconds=0.3)
+    events = []
+    orch = Orchestrator(cfg, llm_client=HangingLLM(), on_event=lambda name, payload: events.append((name, payload)))
+
+    started = time.perf_counter()
+    with pytest.raises(RunCancelled, match="deadline exceeded"):
+        orch.run("Endloser Task")
+
+    assert time.perf_counter() - started < 5
+    assert events[-1][0] == "RUN_CANCELLED"
+    assert events[-1][1]["task_id"] == orch.current_task_id
+
+
+def test_runner_collects_structured_test_report(tmp_path):
+    runner = PytestRunner(workspace=tmp_path / "runs", timeout_seconds=60, data_dir=tmp_path / "files")
+    tests = (
+        "import pytest\n\n"
+        "def test_ok():\n    pass\n\n"
+        "def test_bad():\n    assert 1 + 1 == 3, 'rechnet falsch'\n\n"
+        "@pytest.mark.parametrize('x', [1, 2])\ndef test_param(x):\n    pass\n\n"
+        "class TestGroup:\n    def test_member(self):\n        pass\n"
+    )
+    result = runner.run(ExecutionRequest(code="", tests=tests, working_dir=tmp_path / "runs"))
+
+    prefix = "tests/test_task_module.py::"
+    assert set(result.test_report) == {
+        prefix + "test_ok",
+        prefix + "test_bad",
+        prefix + "test_param[1]",
+        prefix + "test_param[2]",
+        prefix + "TestGroup::test_member",
+    }
+    bad = result.test_report[prefix + "test_bad"]
+    assert bad.outcome == "FAILED"
+    assert "rechnet falsch" in bad.message and bad.duration >= 0
+    assert result.test_report[prefix + "test_ok"].outcome == "PASSED"
+
+    compact = compact_report(result)
+    assert compact.splitlines()[0] == "1 failed, 4 passed"
+    assert f"FAILED {prefix}test_bad" in compact
+    assert len(compact) < len(result.stdout)
+
+
+def test_runner_cancel_kills_whole_process_group(tmp_path):
+    runner = PytestRunner(workspace=tmp_path / "runs", timeout_seconds=60, data_dir=tmp_path / "files")
+    # the grandchild keeps the output pipes open: only a group kill lets the run return
+    tests = (
+        "import subprocess, sys, time\n\n"
+        "def test_hangs():\n"
+        "    subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "    time.sleep(60)\n"
+    )
+    token = CancelToken()
+    threading.Timer(1.0, token.cancel).start()
+
+    started = time.perf_counter()
+    with pytest.raises(RunCancelled):
+        runner.run(ExecutionRequest(code="", tests=tests, working_dir=tmp_path / "runs"), cancel_token=token)
+
+    assert time.perf_counter() - started < 15
+
+
+@pytest.mark.skipif(not worker_pool.available(), reason="worker pool needs os.fork")
+def test_pooled_runner_reports_results_and_cancels_job(tmp_path):
+    runner = PytestRunner(workspace=tmp_path / "runs", timeout_seconds=60, data_dir=tmp_path / "files", workers=1)
+    try:
+        request = ExecutionRequest(
+            code="def double(x):\n    return 2 * x\n",
+            tests=(
+                "import os\nfrom task_module import double\n\n"
+                "def test_ok():\n    assert double(2) == 4\n\n"
+                "def test_env():\n    assert os.environ['USER_DATA_DIR']\n\n"
+                "def test_bad():\n    assert double(2) == 5\n"
+            ),
+            working_dir=tmp_path / "runs",
+        )
+        for _ in range(2):  # the second run reuses the warm worker
+            result = runner.run(request)
+            assert result.exit_code == 1
+            assert {case.outcome for case in result.test_report.values()} == {"PASSED", "FAILED"}
+            assert result.test_report["tests/test_task_module.py::test_bad"].outcome == "FAILED"
+
+        token = CancelToken()
+        threading.Timer(1.0, token.cancel).start()
+        started = time.perf_counter()
+        with pytest.raises(RunCancelled):
+            runner.run(
+                ExecutionRequest(code="", tests="import time\n\ndef test_hangs():\n    time.sleep(60)\n", working_dir=tmp_path / "runs"),
+                cancel_token=token,
+            )
+        assert time.perf_counter() - started < 15
+        # the worker survives a killed job
+        assert runner.run(request).exit_code == 1
+    finally:
+        runner.close()
+
+
+def test_run_writes_chrome_trace_with_nested_stage_spans(tmp_path):
+    cfg = make_config(tmp_path, user_files_dir=tmp_path / "files")
+    orch = Orchestrator(cfg, llm_client=FixingLLM())
+
+    orch.run("Trace-Task")
+
+    trace = json.loads((orch.current_run_dir / "trace.json").read_text(encoding="utf-8"))
+    spans = {e["args"]["span_id"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+    by_name = {}
+    for event in spans.values():
+        by_name.setdefault(event["name"], []).append(event)
+    for stage in ("plan", "decompose", "research", "prompt", "execute", "run_code", "review", "fix_loop", "summarize"):
+        assert stage in by_name, stage
+    run = by_name["run"][0]
+    assert run["args"]["task_id"] == orch.current_task_id
+    assert spans[by_name["plan"][0]["args"]["parent_id"]]["name"] == "run"
+    assert spans[by_name["llm PlannerAgent"][0]["args"]["parent_id"]]["name"] == "plan"
+    assert spans[by_name["pytest"][0]["args"]["parent_id"]]["name"] == "run_code"
+    assert {"snapshot", "context_log"} <= by_name.keys()
+    assert all(run["ts"] <= e["ts"] and e["ts"] + e["dur"] <= run["ts"] + run["dur"] + 1 for e in spans.values())
+
+
+class RecordingLLM(FixingLLM):
+    def __init__(self):
+        self.prompts = []
+
+    def generate_json(self, model: str, prompt: str, **kwargs):
+        self.prompts.append(str(prompt))
+        return super().generate_json(model, prompt, **kwargs)
+
+
+def test_context_log_holds_exactly_the_prompts_sent(tmp_path):
+    cfg = make_config(tmp_path, user_files_dir=tmp_path / "files")
+    llm = RecordingLLM()
+    orch = Orchestrator(cfg, llm_client=llm)
+
+    orch.run("Log-Task")
+
+    files = sorted(orch.current_run_dir.glob("context_*.txt"))
+    logged = [f.read_text(encoding="utf-8").split("\n", 1) for f in files]
+    prompts = [body for header, body in logged if header.startswith("prompt für Modell")]
+    assert prompts == llm.prompts
+    exchanges = [json.loads(line) for line in (orch.current_run_dir / "exchanges.jsonl").read_text().splitlines()]
+    assert [e["prompt"] for e in exchanges] == llm.prompts
+    assert exchanges[0]["caller"] == "planner"
+    assert exchanges[0]["options"]["schema"] == "PlannerResponse"
+    assert "fix_manager" in {e["caller"] for e in exchanges}
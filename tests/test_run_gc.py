@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import time
+from uuid import uuid4
+
+from context.models import ExecutionRequest
+from runner.pytest_runner import PytestRunner
+from runner.report import REPORT_FILE
+from runner.run_gc import RetentionPolicy, RunDirCollector
+
+_REPORT = '<testsuites><testsuite failures="{failures}" errors="0" tests="1"/></testsuites>'
+
+
+def _run_dir(root, age, failures=0, size=10, name=None):
+    run = root / (name or f"run_{uuid4()}")
+    (run / "__pycache__").mkdir(parents=True)
+    (run / "__pycache__" / "task_module.pyc").write_bytes(b"x" * 100)
+    (run / "task_module.py").write_bytes(b"x" * size)
+    (run / REPORT_FILE).write_text(_REPORT.format(failures=failures))
+    stamp = time.time() - age
+    os.utime(run, (stamp, stamp))
+    return run
+
+
+def test_collector_keeps_newest_and_failing_runs_within_size_cap(tmp_path):
+    newest = _run_dir(tmp_path, age=100)
+    active = _run_dir(tmp_path, age=500)
+    failing = _run_dir(tmp_path, age=200, failures=1)
+    old_failing = _run_dir(tmp_path, age=900, failures=1, size=2000)
+    passing = _run_dir(tmp_path, age=300)
+    young = _run_dir(tmp_path, age=1)
+    (tmp_path / "not_a_run").mkdir()
+    # looks like a run, but the runner never creates such a name
+    foreign = _run_dir(tmp_path, age=1000, name="run_archive")
+
+    collector = RunDirCollector(
+        lambda: [tmp_path],
+        RetentionPolicy(keep_last=2, keep_failing=True, max_bytes=1500, min_age_seconds=30),
+        in_use=lambda path: path == active,
+    )
+    stats = collector.collect()
+
+    assert young.exists() and newest.exists() and active.exists() and failing.exists()
+    assert not passing.exists()
+    # over the size cap the oldest unprotected run goes, failing or not
+    assert not old_failing.exists()
+    assert (tmp_path / "not_a_run").exists() and foreign.exists()
+    assert stats["removed"] == 2
+    # kept runs lose their caches, except the one pytest is still using
+    assert not (newest / "__pycache__").exists()
+    assert (active / "__pycache__").exists()
+
+
+def test_runner_stages_runs_and_prunes_them(tmp_path):
+    staging = tmp_path / "shm"
+    runner = PytestRunner(
+        workspace=tmp_path / "tools",
+        data_dir=tmp_path / "files",
+        staging_dir=staging,
+        retention=RetentionPolicy(keep_last=1, keep_failing=False, min_age_seconds=0),
+        gc_interval_seconds=0,
+    )
+    request = ExecutionRequest(code="", tests="def test_ok():\n    pass\n", working_dir=tmp_path / "tools")
+
+    first = runner.run(request)
+    second = runner.run(request)
+
+    assert first.run_dir.parent == staging and second.run_dir.parent == staging
+    assert not any(p.name.startswith("run_") for p in (tmp_path / "tools").iterdir())
+    os.utime(first.run_dir, (time.time() - 60, time.time() - 60))
+    runner.collector.collect()
+    assert [p.name for p in staging.iterdir()] == [second.run_dir.name]
+
+
+def test_runner_collects_only_its_own_directories(tmp_path):
+    elsewhere = tmp_path / "project"
+    runner = PytestRunner(
+        workspace=tmp_path / "tools",
+        data_dir=tmp_path / "files",
+        retention=RetentionPolicy(keep_last=0, keep_failing=False, min_age_seconds=0),
+        gc_interval_seconds=0,
+    )
+    request = ExecutionRequest(code="", tests="def test_ok():\n    pass\n", working_dir=elsewhere)
+
+    result = runner.run(request)
+    runner.collector.collect()
+
+    # runs in a request's working_dir are not the runner's to delete
+    assert result.run_dir.parent == elsewhere and result.run_dir.exists()
+    assert runner.collector.roots() == [tmp_path / "tools"]
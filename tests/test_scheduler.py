@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from config.config import AppConfig
+from context.models import ExecutionRequest, ExecutionResult, ExecutionStatus
+from orchestrator.scheduler import TaskScheduler
+
+
+class CountingLLM:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def generate_json(self, model: str, prompt: str, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.005)
+        with self.lock:
+            self.active -= 1
+        return {}
+
+
+class CountingRunner(CountingLLM):
+    def run(self, request: ExecutionRequest, **kwargs) -> ExecutionResult:
+        self.generate_json("", "")
+        return ExecutionResult(status=ExecutionStatus.PASSED, exit_code=0)
+
+
+def make_config(tmp_path, **overrides) -> AppConfig:
+    return AppConfig(
+        storage_dir=tmp_path / "storage",
+        context_snapshot_dir=tmp_path / "snapshots",
+        context_log_dir=tmp_path / "logs",
+        user_infos_dir=tmp_path / "infos",
+        runner_workspace=tmp_path / "runs",
+        tool_dir=tmp_path / "tools",
+        **overrides,
+    )
+
+
+def test_scheduler_orders_by_priority_then_owner(tmp_path):
+    scheduler = TaskScheduler(make_config(tmp_path), workers=1, llm_client=CountingLLM(), runner=CountingRunner())
+    order = []
+    for description, priority, owner in [
+        ("a1", 1, "alice"),
+        ("a2", 1, "alice"),
+        ("b1", 1, "bob"),
+        ("urgent", 0, "carol"),
+    ]:
+        scheduler.submit(description, priority=priority, owner=owner).add_done_callback(
+            lambda f: order.append(f.result()["task"]["description"])
+        )
+    scheduler.start()
+    scheduler.shutdown()
+
+    assert order == ["urgent", "a1", "b1", "a2"]
+
+
+def test_scheduler_caps_llm_calls_and_pytest_processes(tmp_path):
+    llm, runner = CountingLLM(), CountingRunner()
+    cfg = make_config(tmp_path, llm_calls_per_model=2, max_pytest_processes=1)
+    scheduler = TaskScheduler(cfg, workers=4, llm_client=llm, runner=runner)
+    scheduler.start()
+    futures = [scheduler.submit(f"Task {i}") for i in range(4)]
+    results = [f.result(timeout=30) for f in futures]
+    scheduler.shutdown()
+
+    assert all(r["reviews"] for r in results)
+    assert llm.peak == 2
+    assert runner.peak == 1
+
+
+class ContextLLM(CountingLLM):
+    def __init__(self):
+        super().__init__()
+        self.resets = 0
+
+    def reset_contexts(self):
+        self.resets += 1
+
+
+def test_workers_share_runner_and_keep_each_others_contexts(tmp_path, monkeypatch):
+    def no_runner(config):
+        raise AssertionError("workers must use the scheduler's runner")
+
+    monkeypatch.setattr("orchestrator.orchestrator.build_runner", no_runner)
+    llm, runner = ContextLLM(), CountingRunner()
+    scheduler = TaskScheduler(make_config(tmp_path), workers=2, llm_client=llm, runner=runner)
+    scheduler.start()
+    results = [f.result(timeout=30) for f in [scheduler.submit(f"Task {i}") for i in range(2)]]
+    scheduler.shutdown()
+
+    assert all(r["reviews"] for r in results)
+    assert llm.resets == 0
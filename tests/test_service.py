@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.request
+
+from orchestrator.scheduler import TaskScheduler
+from orchestrator.service import OrchestratorService, make_server
+from tests.test_scheduler import CountingLLM, CountingRunner, make_config
+
+
+def test_service_submit_stream_and_status(tmp_path):
+    scheduler = TaskScheduler(make_config(tmp_path), workers=1, llm_client=CountingLLM(), runner=CountingRunner())
+    service = OrchestratorService(scheduler.config, scheduler=scheduler)
+    service.start()
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        request = urllib.request.Request(
+            f"{base}/tasks",
+            data=json.dumps({"description": "Service-Task"}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        task_id = json.loads(urllib.request.urlopen(request).read())["id"]
+
+        with urllib.request.urlopen(f"{base}/tasks/{task_id}/events", timeout=30) as response:
+            stream = response.read().decode()
+        kinds = [line.split(": ", 1)[1] for line in stream.splitlines() if line.startswith("event: ")]
+        assert kinds[0] == "event" and kinds[-1] == "end"
+        assert '"RUN_COMPLETED"' in stream
+
+        status = json.loads(urllib.request.urlopen(f"{base}/tasks/{task_id}").read())
+        assert status["status"] == "done"
+        assert status["result"]["reviews"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+
+def test_service_cancels_running_task(tmp_path):
+    started = threading.Event()
+
+    class HangingLLM:
+        def generate_json(self, model: str, prompt: str, cancel_token=None, **kwargs):
+            started.set()
+            cancel_token.wait(30)
+            cancel_token.raise_if_cancelled()
+            return {}
+
+    scheduler = TaskScheduler(make_config(tmp_path), workers=1, llm_client=HangingLLM(), runner=CountingRunner())
+    service = OrchestratorService(scheduler.config, scheduler=scheduler)
+    service.start()
+    try:
+        task_id = service.submit("Endloser Task")
+        assert started.wait(10)
+        assert service.cancel(task_id)
+        service.get(task_id).future.exception(timeout=10)
+
+        assert service.get(task_id).status == "cancelled"
+        assert not service.cancel(task_id)
+    finally:
+        service.stop()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from context.models import ExecutionRequest, ExecutionStatus
+from runner.pytest_runner import PytestRunner, failing_tests
+from runner.static_gate import MODULE_FILE, TESTS_FILE, check_request, side_effects
+
+
+def test_gate_fails_broken_request_without_starting_pytest(tmp_path):
+    runner = PytestRunner(workspace=tmp_path / "runs", data_dir=tmp_path / "files")
+    request = ExecutionRequest(
+        code="def double(x:\n    return 2 * x\n",
+        tests="from task_module import double\n\ndef test_double():\n    assert double(2) == 4\n",
+        working_dir=tmp_path / "runs",
+    )
+
+    result = runner.run(request)
+
+    assert result.status == ExecutionStatus.FAILED
+    assert result.run_dir is None and not list((tmp_path / "runs").iterdir())
+    assert f"{MODULE_FILE}:1:" in result.stderr and "SyntaxError" in result.stderr
+    assert "def double(x:" in result.test_report[MODULE_FILE].message
+    assert failing_tests(result) == [MODULE_FILE]
+
+
+def test_gate_checks_imported_names_and_forbidden_calls():
+    code = (
+        "import os\n\n"
+        "try:\n    import json\nexcept ImportError:\n    json = None\n\n"
+        "def double(x):\n    return 2 * x\n\n"
+        "class Box:\n    pass\n"
+    )
+    tests = (
+        "import task_module as tm\n"
+        "from os import _exit as leave\n"
+        "from task_module import double, Box, json, triple\n\n"
+        "def test_all():\n"
+        "    assert tm.double(1) == 2 and tm.__name__\n"
+        "    tm.quadruple(1)\n"
+        "    leave(0)\n"
+    )
+
+    issues = check_request(code, tests)
+
+    assert list(issues) == [TESTS_FILE]
+    text = "\n".join(issues[TESTS_FILE])
+    assert "'triple' is not defined" in text and "'quadruple' is not defined" in text
+    assert f"{TESTS_FILE}:8: forbidden call os._exit()" in text
+    assert "'double'" not in text and "'json'" not in text
+    # star imports make the module's names unknowable: no name check then
+    assert check_request("from math import *\n", "from task_module import sqrt\n") == {}
+    assert check_request(code, "from task_module import double\n") == {}
+
+
+def test_side_effects_flag_files_processes_and_clock():
+    code = (
+        "from pathlib import Path\n"
+        "import subprocess as sp\n\n"
+        "def save(text):\n"
+        "    Path('out.txt').write_text(text)\n"
+        "    with open('log.txt', 'a') as f:\n"
+        "        f.write(text)\n"
+        "    sp.run(['true'])\n"
+    )
+    tests = "from datetime import datetime\n\ndef test_now():\n    assert datetime.now()\n"
+
+    found = side_effects(code, tests)
+
+    assert found == [
+        f"{MODULE_FILE}:5: write_text()",
+        f"{MODULE_FILE}:6: open()",
+        f"{MODULE_FILE}:8: subprocess.run()",
+        f"{TESTS_FILE}:4: datetime.datetime.now()",
+    ]
+    # reading files and pure string methods are fine
+    assert side_effects("def f():\n    return open('in.txt').read().replace('a', 'b')\n", "") == []
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from llm.json_stream import StreamingJSONValidator, StreamValidationError
+from llm.streaming import ThinkTagSplitter
+
+
+def test_think_tags_split_across_chunks():
+    emitted = []
+    splitter = ThinkTagSplitter(emitted.append)
+    for chunk in ["<thi", "nk>plan ", "it</th", "ink>{\"a\"", ": 1}<", "x"]:
+        splitter.feed(chunk)
+
+    assert splitter.finish() == '{"a": 1}<x'
+    assert "".join(emitted) == '[thinking] plan it\n{"a": 1}<x'
+
+
+def test_text_without_tags_passes_through_once():
+    emitted = []
+    splitter = ThinkTagSplitter(emitted.append)
+    splitter.feed('{"a": 1}')
+    assert splitter.finish() == '{"a": 1}'
+    assert emitted == ['{"a": 1}']
+
+
+def test_validator_collects_fields_and_stops_at_object_end():
+    fields = {}
+    validator = StreamingJSONValidator(
+        ("code", "tests"), field_callback=lambda key, value: fields.update({key: value})
+    )
+    for chunk in [' {"co', 'de": "x = \\"}\\"",', ' "tests": [1, {"a": 2}]', "} trailing prose"]:
+        validator.feed(chunk)
+
+    assert validator.complete
+    assert fields == {"code": 'x = "}"', "tests": [1, {"a": 2}]}
+    assert json.loads(validator.text) == fields
+
+
+def test_validator_rejects_prose_and_unexpected_keys():
+    with pytest.raises(StreamValidationError):
+        StreamingJSONValidator().feed("Here is the JSON: {")
+
+    validator = StreamingJSONValidator(("code",))
+    with pytest.raises(StreamValidationError):
+        validator.feed('{"answer": ')
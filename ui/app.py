@@ -12,6 +12,8 @@ from typing import List, Optional
 import threading
 import queue
 
+from context.cancellation import RunCancelled
+
 
 def run_ui(
     app_title: str,
@@ -195,6 +197,8 @@ def run_ui(
             send_button = QPushButton("Senden")
             send_button.clicked.connect(self._send_message)
             self.chat_input.returnPressed.connect(self._send_message)
+            stop_button = QPushButton("Stopp")
+            stop_button.clicked.connect(self._cancel_run)
 
             chat_layout = QVBoxLayout()
             chat_layout.addLayout(header_layout)
@@ -203,6 +207,7 @@ def run_ui(
             input_row = QHBoxLayout()
             input_row.addWidget(self.chat_input, stretch=4)
             input_row.addWidget(send_button, stretch=1)
+            input_row.addWidget(stop_button, stretch=1)
             chat_layout.addLayout(input_row)
 
             chat_widget = QWidget()
@@ -358,11 +363,23 @@ def run_ui(
             self._worker_thread.start()
             QTimer.singleShot(200, self._poll_results)
 
+        def _cancel_run(self) -> None:
+            if self._worker_thread and self._worker_thread.is_alive():
+                self.orchestrator.cancel("Abbruch durch Benutzer")
+
+        def closeEvent(self, event) -> None:  # pragma: no cover - UI path
+            # stop generation and pytest instead of leaving them to the daemon thread
+            if self.orchestrator is not None and hasattr(self.orchestrator, "cancel"):
+                self.orchestrator.cancel("Fenster geschlossen")
+            super().closeEvent(event)
+
         def _run_task(self, description: str) -> None:
             try:
                 result = self.orchestrator.run(description)
                 summary = result.get("summary", {}).get("summary", "")
                 self._run_queue.put(("ok", summary))
+            except RunCancelled as exc:  # pragma: no cover - UI path
+                self._run_queue.put(("err", f"Abgebrochen: {exc}"))
             except Exception as exc:  # pragma: no cover - UI path
                 self._run_queue.put(("err", str(exc)))
 
@@ -371,6 +388,9 @@ def run_ui(
             while True:
                 try:
                     evt, payload = self._event_queue.get_nowait()
+                    if evt == "FIELD_PARSED":
+                        self._append_chat("Event", f"{payload.get('agent')}: {payload.get('field')} fertig")
+                        continue
                     step = payload.get("step_id") or ""
                     status = payload.get("status") or ""
                     msg = f"{evt} {step} {status}".strip()